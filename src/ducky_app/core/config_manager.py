@@ -3,6 +3,15 @@ import json
 from PySide6.QtCore import QStandardPaths
 from PySide6.QtWidgets import QMessageBox
 
+
+def app_data_dir(*parts):
+    """Writable per-user directory for caches and local databases, created on demand."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
 class ConfigManager:
     def __init__(self):
         self.config_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppConfigLocation)
@@ -19,7 +28,9 @@ class ConfigManager:
             "session_folder": os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DocumentsLocation), "Ducky_Sessions"),
             "notes_folder": os.path.join(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DocumentsLocation), "Ducky_Notes"),
             "default_baudrate": 9600,
-            "app_theme": "dark"
+            "app_theme": "dark",
+            "nvd_api_key": "",
+            "notes_format": "html"
         }
 
     def _load_config(self):
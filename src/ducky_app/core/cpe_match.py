@@ -0,0 +1,159 @@
+import re
+import ssl
+import socket
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from ducky_app.core import cve_store
+
+BANNER_PORTS = (21, 22, 25, 80, 110, 143, 443, 587, 3306, 8080, 8443)
+HTTP_PORTS = (80, 8000, 8008, 8080, 8888)
+TLS_HTTP_PORTS = (443, 8443)
+BANNER_TIMEOUT = 2.0
+BANNER_BYTES = 1024
+MAX_CONCURRENCY = 64
+
+Product = namedtuple('Product', 'part vendor product version update source')
+
+# (pattern, part, [(vendor, product), ...]); NVD files some products under more than one vendor
+PRODUCT_RULES = [
+    (r'Cisco IOS XE Software.*?Version (?P<version>[\w.()]+)', 'o', [('cisco', 'ios_xe')]),
+    (r'Cisco IOS Software.*?Version (?P<version>[\w.()]+)', 'o', [('cisco', 'ios')]),
+    (r'RouterOS (?P<version>\d+(?:\.\d+)+)', 'o', [('mikrotik', 'routeros')]),
+    (r'^Linux \S+ (?P<version>\d+\.\d+(?:\.\d+)?)', 'o', [('linux', 'linux_kernel')]),
+    (r'^FreeBSD \S+ (?P<version>\d+\.\d+)', 'o', [('freebsd', 'freebsd')]),
+    (r'OpenSSH[_ ](?P<version>\d+\.\d+)(?P<update>p\d+)?', 'a', [('openbsd', 'openssh')]),
+    (r'dropbear_(?P<version>\d+(?:\.\d+)+)', 'a', [('dropbear_ssh_project', 'dropbear_ssh')]),
+    (r'Apache[- ]Tomcat/(?P<version>\d+(?:\.\d+)+)', 'a', [('apache', 'tomcat')]),
+    (r'Apache(?:/| httpd )(?P<version>\d+\.\d+\.\d+)', 'a', [('apache', 'http_server')]),
+    (r'nginx/(?P<version>\d+\.\d+\.\d+)', 'a', [('f5', 'nginx'), ('nginx', 'nginx')]),
+    (r'Microsoft-IIS/(?P<version>\d+\.\d+)', 'a', [('microsoft', 'internet_information_services')]),
+    (r'lighttpd/(?P<version>\d+(?:\.\d+)+)', 'a', [('lighttpd', 'lighttpd')]),
+    (r'Jetty\((?P<version>\d+(?:\.\d+)+)', 'a', [('eclipse', 'jetty')]),
+    (r'PHP/(?P<version>\d+\.\d+\.\d+)', 'a', [('php', 'php')]),
+    (r'OpenSSL[/ ](?P<version>\d+\.\d+\.\d+[a-z]{0,2})', 'a', [('openssl', 'openssl')]),
+    (r'vsFTPd (?P<version>\d+(?:\.\d+)+)', 'a', [('beasts', 'vsftpd')]),
+    (r'ProFTPD (?P<version>\d+(?:\.\d+)+)(?P<update>[a-z]\d*)?', 'a', [('proftpd', 'proftpd')]),
+    (r'FileZilla Server (?:version )?(?P<version>\d+(?:\.\d+)+)', 'a', [('filezilla-project', 'filezilla_server')]),
+    (r'Exim (?P<version>\d+(?:\.\d+)+)', 'a', [('exim', 'exim')]),
+    (r'Sendmail (?P<version>\d+(?:\.\d+)+)', 'a', [('sendmail', 'sendmail')]),
+    (r'Samba (?P<version>\d+\.\d+\.\d+)', 'a', [('samba', 'samba')]),
+    (r'(?P<version>\d+\.\d+\.\d+)-MariaDB', 'a', [('mariadb', 'mariadb')]),
+    (r'^.{4}\n(?P<version>[5-9]\.\d+\.\d+)(?!-\d+\.\d+\.\d+-MariaDB)', 'a', [('oracle', 'mysql')]),
+]
+_RULES = [(re.compile(pattern, re.DOTALL), part, names) for pattern, part, names in PRODUCT_RULES]
+_VERSION_PART_RE = re.compile(r'\d+|[a-z]+')
+
+
+def identify(text, source=''):
+    """Products with a recognisable version in a banner or SNMP ``sysDescr``."""
+    found = []
+    for regex, part, names in _RULES:
+        m = regex.search(text)
+        if not m:
+            continue
+        update = m.groupdict().get('update') or ''
+        for vendor, product in names:
+            found.append(Product(part, vendor, product, m.group('version'), update, source))
+    return found
+
+
+def cpe_name(product):
+    """CPE 2.3 formatted string for an identified product."""
+    return (f'cpe:2.3:{product.part}:{product.vendor}:{product.product}:{product.version}:'
+            f'{product.update or "*"}:*:*:*:*:*:*')
+
+
+def version_key(version):
+    """Sort key for dotted versions with letter suffixes: ``1.0.2k`` < ``1.0.2za`` < ``1.1.0``."""
+    return [(0, int(p)) if p.isdigit() else (1, p) for p in _VERSION_PART_RE.findall(version.lower())]
+
+
+def _affected(criteria, version, update):
+    """Whether one CPE criteria row covers ``version``/``update``."""
+    if criteria['version'] not in ('*', '-', ''):
+        if version_key(criteria['version']) != version_key(version):
+            return False
+        # An update-specific criteria (8.2 p1) only applies when the banner told us the update
+        return criteria['update'] in ('*', '-', '') or not update or criteria['update'] == update
+    key = version_key(version)
+    bounds = (('start_incl', lambda b: key >= b), ('start_excl', lambda b: key > b),
+              ('end_incl', lambda b: key <= b), ('end_excl', lambda b: key < b))
+    return all(check(version_key(criteria[name])) for name, check in bounds if criteria[name])
+
+
+def match(products, store=None):
+    """Map every product to the CVEs whose vulnerable CPE criteria cover its version.
+
+    Criteria are fetched once per distinct (vendor, product) pair from the
+    mirror's CPE index, so matching thousands of hosts costs a handful of
+    indexed queries. Each criteria row is matched on its own: configurations
+    that only apply alongside another product ("running on") are reported
+    as well, which errs on the side of listing a CVE.
+    """
+    store = store or cve_store.get_store()
+    criteria = store.cpe_criteria((p.vendor, p.product) for p in products)
+    results = {}
+    for product in set(products):
+        seen = {}
+        for row in criteria.get((product.vendor, product.product), []):
+            if row['cve'] not in seen and _affected(row, product.version, product.update):
+                seen[row['cve']] = {'cve': row['cve'], 'severity': row['severity'], 'score': row['score']}
+        results[product] = sorted(seen.values(), key=lambda m: (-(m['score'] or 0), m['cve']))
+    return results
+
+
+def grab_banner(host, port, timeout=BANNER_TIMEOUT):
+    """Service identification text from ``host:port``: greeting bytes, or HTTP ``Server`` headers."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            if port in HTTP_PORTS or port in TLS_HTTP_PORTS:
+                if port in TLS_HTTP_PORTS:
+                    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+                    ctx.check_hostname = False
+                    ctx.verify_mode = ssl.CERT_NONE
+                    sock = ctx.wrap_socket(sock, server_hostname=None)
+                sock.sendall(f'HEAD / HTTP/1.0\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+            data = b''
+            while len(data) < BANNER_BYTES:
+                chunk = sock.recv(BANNER_BYTES - len(data))
+                if not chunk:
+                    break
+                data += chunk
+                if port not in HTTP_PORTS and port not in TLS_HTTP_PORTS:
+                    break
+    except (OSError, ssl.SSLError):
+        return ''
+    text = data.decode('latin-1')
+    if text.startswith('HTTP/'):
+        headers = [line for line in text.split('\r\n')[1:]
+                   if line.lower().startswith(('server:', 'x-powered-by:'))]
+        return ' '.join(h.split(':', 1)[1].strip() for h in headers)
+    return text
+
+
+def inventory(hosts, ports=BANNER_PORTS, progress=None, cancelled=lambda: False):
+    """Identify products on each host from its SNMP description and service banners.
+
+    ``hosts`` is a list of dicts with ``ip`` and optional ``description``.
+    Returns ``{ip: [Product, ...]}``.
+    """
+    products = {h['ip']: identify(h['description'], 'SNMP sysDescr') if h.get('description') else []
+                for h in hosts}
+    jobs = [(h['ip'], port) for h in hosts for port in ports]
+    if not jobs:
+        return products
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(jobs))) as pool:
+        def grab(job):
+            return job, ('' if cancelled() else grab_banner(*job))
+
+        for done, ((ip, port), banner) in enumerate(pool.map(grab, jobs), 1):
+            if banner:
+                products[ip].extend(identify(banner, f'port {port}'))
+            if progress and done % 100 == 0:
+                progress(f'Collected banners from {done} of {len(jobs)} services…')
+    for ip, found in products.items():
+        unique = {}
+        for product in found:
+            unique.setdefault(product[:5], product)
+        products[ip] = list(unique.values())
+    return products
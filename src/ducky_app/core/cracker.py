@@ -0,0 +1,462 @@
+import os
+import hmac
+import mmap
+import math
+import time
+import string
+import hashlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+ALGORITHMS = ('md5', 'sha1', 'sha224', 'sha256', 'sha384', 'sha512')
+# Hash formats; ``salt`` comes from ``hash:salt`` target lines
+FORMATS = {
+    'plain': 'hash(password)',
+    'pass_salt': 'hash(password + salt)',
+    'salt_pass': 'hash(salt + password)',
+    'hmac_pass': 'HMAC(key = password, message = salt)',
+    'hmac_salt': 'HMAC(key = salt, message = password)',
+}
+CHUNK_SIZE = 4 * 1024 * 1024    # bytes of wordlist per task and rule: ~0.1-0.5 s of hashing
+MIN_CHUNK_SIZE = 4096
+MASK_CHUNK = 1 << 18            # candidates per mask task
+BATCH = 1 << 16                 # candidates generated per hashing pass
+IN_FLIGHT_PER_WORKER = 2
+
+MASK_CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': ' ' + string.punctuation,
+    'a': string.ascii_lowercase + string.ascii_uppercase + string.digits + ' ' + string.punctuation,
+    'h': '0123456789abcdef',
+    'H': '0123456789ABCDEF',
+}
+
+_DIGIT_RULES = [f'${d}' for d in string.digits] + [f'${a}${b}' for a in string.digits for b in string.digits]
+_YEAR_RULES = [''.join(f'${ch}' for ch in str(year)) for year in range(1950, 2031)]
+_LEET_RULES = ['sa@', 'sa4', 'se3', 'si1', 'si!', 'so0', 'ss$', 'ss5', 'st7', 'sl1',
+               'sa@se3', 'se3so0', 'sa@se3si1so0', 'sa4se3si1so0ss5', 'sa@se3si1so0ss$st7']
+RULE_PRESETS = {
+    'Case toggles': [':', 'l', 'u', 'c', 'C', 't', 'r'],
+    'Append digits': [':'] + _DIGIT_RULES + _YEAR_RULES + ['c' + r for r in _DIGIT_RULES[:10] + _YEAR_RULES],
+    'Leetspeak': [':'] + _LEET_RULES + ['c' + r for r in _LEET_RULES],
+}
+RULE_PRESETS['All built-in'] = list(dict.fromkeys(r for rules in RULE_PRESETS.values() for r in rules))
+
+# Per-process state set up once by _init_worker
+_wordlist = None
+_rules = None
+_mask = None
+_check = None
+
+
+# ── Targets ─────────────────────────────────────────────────────────────
+def digest_length(algorithm):
+    return hashlib.new(algorithm).digest_size * 2
+
+
+def _decode_salt(text):
+    if text.startswith('$HEX[') and text.endswith(']'):
+        return bytes.fromhex(text[5:-1])
+    return text.encode('utf-8')
+
+
+def parse_targets(text, algorithm, fmt='plain'):
+    """``(hex_digest, salt)`` pairs, one per line; raises ValueError on a bad line.
+
+    Unsalted lines are ``hash`` or ``user:hash``; salted formats take
+    ``hash:salt``, with ``$HEX[...]`` for binary salts.
+    """
+    length = digest_length(algorithm)
+    targets = []
+    for n, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if fmt == 'plain':
+            value, salt = line.rsplit(':', 1)[-1].strip(), b''
+        else:
+            value, sep, salt_text = line.partition(':')
+            if not sep:
+                raise ValueError(f'Line {n} has no salt; expected hash:salt for {FORMATS[fmt]}')
+            try:
+                salt = _decode_salt(salt_text)
+            except ValueError:
+                raise ValueError(f'Line {n} has an invalid $HEX[] salt') from None
+        value = value.strip().lower()
+        if len(value) != length or any(c not in '0123456789abcdef' for c in value):
+            raise ValueError(f'Line {n} is not a {algorithm.upper()} digest ({length} hex characters): {line[:40]}')
+        targets.append((value, salt))
+    return list(dict.fromkeys(targets))
+
+
+def target_label(digest, salt):
+    if not salt:
+        return digest
+    try:
+        return f'{digest}:{salt.decode("utf-8")}'
+    except UnicodeDecodeError:
+        return f'{digest}:$HEX[{salt.hex()}]'
+
+
+def _make_checker(algorithm, fmt, targets):
+    """Function mapping a batch of candidates to ``[(hex_digest, salt, candidate), ...]`` hits."""
+    hasher = getattr(hashlib, algorithm)
+    by_salt = {}
+    for digest, salt in targets:
+        by_salt.setdefault(salt, set()).add(bytes.fromhex(digest))
+    groups = [(salt, frozenset(digests)) for salt, digests in by_salt.items()]
+
+    if fmt == 'plain':
+        wanted = frozenset().union(*(digests for _salt, digests in groups))
+        return lambda words: [(d.hex(), b'', w) for w in words if (d := hasher(w).digest()) in wanted]
+
+    if fmt == 'pass_salt':
+        def digest(word, salt):
+            return hasher(word + salt).digest()
+    elif fmt == 'salt_pass':
+        def digest(word, salt):
+            return hasher(salt + word).digest()
+    elif fmt == 'hmac_pass':
+        def digest(word, salt):
+            return hmac.digest(word, salt, algorithm)
+    elif fmt == 'hmac_salt':
+        def digest(word, salt):
+            return hmac.digest(salt, word, algorithm)
+    else:
+        raise ValueError(f'Unsupported format: {fmt}')
+
+    def check(words):
+        hits = []
+        for salt, wanted in groups:
+            hits.extend((d.hex(), salt, w) for w in words if (d := digest(w, salt)) in wanted)
+        return hits
+    return check
+
+
+# ── Rules ───────────────────────────────────────────────────────────────
+# Each step maps a whole batch of candidates, so simple functions run at C speed via map()
+_RULE_FUNCTIONS = {
+    'l': lambda ws: list(map(bytes.lower, ws)),
+    'u': lambda ws: list(map(bytes.upper, ws)),
+    't': lambda ws: list(map(bytes.swapcase, ws)),
+    'c': lambda ws: [w[:1].upper() + w[1:].lower() for w in ws],
+    'C': lambda ws: [w[:1].lower() + w[1:].upper() for w in ws],
+    'r': lambda ws: [w[::-1] for w in ws],
+    'd': lambda ws: [w + w for w in ws],
+    'f': lambda ws: [w + w[::-1] for w in ws],
+    '[': lambda ws: [w[1:] for w in ws],
+    ']': lambda ws: [w[:-1] for w in ws],
+    '{': lambda ws: [w[1:] + w[:1] for w in ws],
+    '}': lambda ws: [w[-1:] + w[:-1] for w in ws],
+}
+_RULE_ARITY = {'$': 1, '^': 1, '@': 1, 'T': 1, 'D': 1, 's': 2}
+
+
+def _position(ch):
+    if ch.isdigit():
+        return int(ch)
+    if 'A' <= ch <= 'Z':
+        return ord(ch) - ord('A') + 10
+    raise ValueError(f'Invalid position: {ch}')
+
+
+def _byte(ch):
+    return ch.encode('latin-1')
+
+
+def compile_rule(text):
+    """Compile a hashcat-style mangling rule into a function over a list of candidates.
+
+    Supported: ``:`` ``l`` ``u`` ``c`` ``C`` ``t`` ``r`` ``d`` ``f`` ``[`` ``]``
+    ``{`` ``}``, ``$X`` append, ``^X`` prepend, ``@X`` purge, ``sXY``
+    substitute, ``TN`` toggle at N, ``DN`` delete at N. Returns None for
+    a rule that leaves words unchanged.
+    """
+    ops, i = [], 0
+    while i < len(text):
+        op = text[i]
+        i += 1
+        if op in ' \t:':
+            continue
+        if op in _RULE_FUNCTIONS:
+            ops.append((op, ''))
+            continue
+        arity = _RULE_ARITY.get(op)
+        if arity is None:
+            raise ValueError(f'Unsupported rule function {op!r} in {text!r}')
+        if i + arity > len(text):
+            raise ValueError(f'Rule function {op!r} is missing its argument in {text!r}')
+        ops.append((op, text[i:i + arity]))
+        i += arity
+
+    steps = []
+    for n, (op, args) in enumerate(ops):
+        if op in _RULE_FUNCTIONS:
+            steps.append(_RULE_FUNCTIONS[op])
+        elif op in '$^' and n and ops[n - 1][0] == op:
+            continue    # folded into the first of the run below
+        elif op in '$^':
+            run = ''.join(a for _, a in itertools.takewhile(lambda o: o[0] == op, ops[n:]))
+            x = _byte(run if op == '$' else run[::-1])
+            steps.append((lambda ws, x=x: [w + x for w in ws]) if op == '$' else (lambda ws, x=x: [x + w for w in ws]))
+        elif op == '@':
+            steps.append(lambda ws, x=_byte(args): [w.replace(x, b'') for w in ws])
+        elif op == 's':
+            steps.append(lambda ws, x=_byte(args[0]), y=_byte(args[1]): [w.replace(x, y) for w in ws])
+        elif op == 'T':
+            steps.append(lambda ws, n=_position(args): [w[:n] + w[n:n + 1].swapcase() + w[n + 1:] for w in ws])
+        elif op == 'D':
+            steps.append(lambda ws, n=_position(args): [w[:n] + w[n + 1:] for w in ws])
+    if not steps:
+        return None
+    if len(steps) == 1:
+        return steps[0]
+
+    def apply(words):
+        for step in steps:
+            words = step(words)
+        return words
+    return apply
+
+
+def parse_rules(text):
+    """Rule lines (``#`` comments allowed), validated; raises ValueError with the line number."""
+    rules = []
+    for n, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            compile_rule(line)
+        except ValueError as e:
+            raise ValueError(f'Rule line {n}: {e}') from None
+        rules.append(line)
+    return rules
+
+
+# ── Masks ───────────────────────────────────────────────────────────────
+def parse_mask(mask):
+    """One tuple of single-byte candidates per position, e.g. ``?u?l?l?d?d``."""
+    positions, i = [], 0
+    while i < len(mask):
+        ch = mask[i]
+        if ch == '?' and i + 1 < len(mask):
+            key = mask[i + 1]
+            if key == '?':
+                chars = '?'
+            elif key in MASK_CHARSETS:
+                chars = MASK_CHARSETS[key]
+            else:
+                raise ValueError(f'Unknown mask charset ?{key}')
+            i += 2
+        else:
+            chars = ch
+            i += 1
+        positions.append(tuple(c.encode('latin-1') for c in chars))
+    if not positions:
+        raise ValueError('The mask is empty.')
+    return positions
+
+
+def mask_keyspace(mask):
+    return math.prod(len(p) for p in parse_mask(mask))
+
+
+def _mask_split(positions):
+    """Number of leading positions fixed per task so each task covers at most MASK_CHUNK candidates."""
+    split = 0
+    while split < len(positions) and math.prod(len(p) for p in positions[split:]) > MASK_CHUNK:
+        split += 1
+    return split
+
+
+# ── Worker side ─────────────────────────────────────────────────────────
+def _init_worker(config, cancel_event):
+    global _wordlist, _rules, _mask, _check, _cancel
+    _cancel = cancel_event
+    _check = _make_checker(config['algorithm'], config['format'], config['targets'])
+    if config.get('wordlist'):
+        with open(config['wordlist'], 'rb') as f:
+            _wordlist = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _rules = [compile_rule(r) for r in config.get('rules') or [':']]
+    if config.get('mask'):
+        positions = parse_mask(config['mask'])
+        split = _mask_split(positions)
+        # Every task shares the same tail, so build it once per process
+        tails = [b''.join(t) for t in itertools.product(*positions[split:])]
+        _mask = (positions[:split], tails)
+
+
+def _check_batched(candidates):
+    """``(hits, candidates_checked)``; stops between batches once the run is cancelled."""
+    hits = []
+    for i in range(0, len(candidates), BATCH):
+        if _cancel.is_set():
+            return hits, i
+        hits.extend(_check(candidates[i:i + BATCH]))
+    return hits, len(candidates)
+
+
+def _crack_words(start, end):
+    """Hash every rule variant of one wordlist chunk; returns ``(hits, candidates_tried)``."""
+    words = _wordlist[start:end].split(b'\n')
+    if words and not words[-1]:
+        words.pop()
+    words = [w[:-1] if w.endswith(b'\r') else w for w in words]
+    hits, tried = [], 0
+    for rule in _rules:
+        if _cancel.is_set():
+            break
+        rule_hits, checked = _check_batched(words if rule is None else rule(words))
+        hits.extend(rule_hits)
+        tried += checked
+    return hits, tried
+
+
+def _crack_mask(index):
+    """Hash every candidate sharing the ``index``-th combination of leading mask positions."""
+    head, tails = _mask
+    prefix = []
+    for chars in reversed(head):
+        index, digit = divmod(index, len(chars))
+        prefix.append(chars[digit])
+    prefix = b''.join(reversed(prefix))
+    hits, tried = [], 0
+    for i in range(0, len(tails), BATCH):
+        if _cancel.is_set():
+            break
+        batch = [prefix + t for t in tails[i:i + BATCH]]
+        hits.extend(_check(batch))
+        tried += len(batch)
+    return hits, tried
+
+
+def chunk_bounds(path, chunk_size=CHUNK_SIZE):
+    """``(start, end)`` byte ranges covering the file, each ending on a line boundary."""
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    bounds = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = data.find(b'\n', min(start + chunk_size, size - 1))
+            end = size if end < 0 else end + 1
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+class HashCracker:
+    """Dictionary, rule-based and mask attacks on a pool of processes.
+
+    A dictionary attack splits the wordlist into line-aligned byte
+    ranges; each worker maps the file once, applies every mangling rule
+    to a whole range at a time and hashes the results. A mask attack
+    splits the keyspace on its leading positions; each worker builds the
+    shared tail combinations once and only prepends the task's prefix.
+    Every candidate is checked against all target digests sharing a
+    salt with one set lookup. Wordlist chunks shrink with the number of
+    rules so a task stays short, and only a few tasks per worker are
+    queued at a time; running tasks also poll a shared event between
+    batches, so :meth:`cancel` takes effect within a fraction of a second.
+    """
+
+    def __init__(self, algorithm, targets, fmt='plain', wordlist=None, rules=None, mask=None, workers=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f'Unsupported algorithm: {algorithm}')
+        if fmt not in FORMATS:
+            raise ValueError(f'Unsupported format: {fmt}')
+        if bool(wordlist) == bool(mask):
+            raise ValueError('Choose either a wordlist or a mask.')
+        self.algorithm = algorithm
+        self.format = fmt
+        self.targets = [(d, s) for d, s in targets]
+        self.wordlist = wordlist
+        self.rules = list(rules) if rules else [':']
+        self.mask = mask
+        self.workers = workers or os.cpu_count() or 1
+        self._cancelled = False
+        for rule in self.rules:
+            compile_rule(rule)
+        self._positions = parse_mask(mask) if mask else None
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def keyspace(self):
+        """Candidates the attack will try in total (for a wordlist: an estimate before the run)."""
+        if self.mask:
+            return math.prod(len(p) for p in self._positions)
+        return None
+
+    def _tasks(self):
+        """``(function, args, weight)`` per task and the total weight, for progress."""
+        if self.mask:
+            split = _mask_split(self._positions)
+            count = math.prod(len(p) for p in self._positions[:split])
+            return ((_crack_mask, (i,), 1) for i in range(count)), count
+        # Each byte of wordlist costs one hash per rule; keep enough chunks to occupy every worker
+        size = os.path.getsize(self.wordlist)
+        chunk_size = min(CHUNK_SIZE // len(self.rules), size // (self.workers * IN_FLIGHT_PER_WORKER))
+        bounds = chunk_bounds(self.wordlist, max(chunk_size, MIN_CHUNK_SIZE))
+        return ((_crack_words, b, b[1] - b[0]) for b in bounds), (bounds[-1][1] if bounds else 0)
+
+    def run(self, on_found=None, on_progress=None):
+        """Crack until the candidates are exhausted, every target is found, or :meth:`cancel` is called.
+
+        ``on_found(label, word)`` is called per match; ``on_progress(done,
+        total, candidates_tried, elapsed)`` after each task, where
+        ``done``/``total`` are in task-weight units. Returns ``{label: word}``.
+        """
+        tasks, total = self._tasks()
+        remaining = set(self.targets)
+        found = {}
+        done = tried = 0
+        t0 = time.perf_counter()
+        config = {'algorithm': self.algorithm, 'format': self.format, 'targets': self.targets,
+                  'wordlist': self.wordlist, 'rules': self.rules, 'mask': self.mask}
+        # Spawned workers never inherit the GUI process's threads or Qt state
+        ctx = multiprocessing.get_context('spawn')
+        cancel_event = ctx.Event()
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx,
+                                   initializer=_init_worker, initargs=(config, cancel_event))
+        try:
+            pending = {}
+
+            def submit():
+                while not self._cancelled and len(pending) < self.workers * IN_FLIGHT_PER_WORKER:
+                    task = next(tasks, None)
+                    if task is None:
+                        return
+                    func, args, weight = task
+                    pending[pool.submit(func, *args)] = weight
+
+            submit()
+            while pending and remaining and not self._cancelled:
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    done += pending.pop(future)
+                    hits, count = future.result()
+                    tried += count
+                    for digest, salt, word in hits:
+                        if (digest, salt) in remaining:
+                            remaining.discard((digest, salt))
+                            label = target_label(digest, salt)
+                            found[label] = word.decode('utf-8', errors='backslashreplace')
+                            if on_found:
+                                on_found(label, found[label])
+                if on_progress:
+                    on_progress(done, total, tried, time.perf_counter() - t0)
+                submit()
+        finally:
+            # Running tasks see the event between batches, so shutting down does not wait out a whole chunk
+            cancel_event.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+        return found
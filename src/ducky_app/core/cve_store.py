@@ -0,0 +1,367 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import datetime
+import threading
+from collections import deque
+import requests
+from ducky_app.core import http_session
+from ducky_app.core.config_manager import app_data_dir
+
+NVD_URL = 'https://services.nvd.nist.gov/rest/json/cves/2.0'
+PAGE_SIZE = 2000            # NVD maximum for resultsPerPage
+MAX_WINDOW_DAYS = 120       # NVD maximum span for lastModStartDate/lastModEndDate
+# Rolling 30 s request windows published by NVD, without and with an API key
+RATE_LIMIT_PUBLIC = 5
+RATE_LIMIT_KEYED = 50
+RATE_WINDOW = 30.0
+MAX_ATTEMPTS = 5
+SEARCH_LIMIT = 5000
+_TOKEN_RE = re.compile(r'[\w.\-]+', re.UNICODE)
+
+
+class SyncCancelled(Exception):
+    pass
+
+
+def _nvd_time(dt):
+    return dt.astimezone(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _parse_time(text):
+    return datetime.datetime.fromisoformat(text.replace('Z', '+00:00')).replace(tzinfo=datetime.timezone.utc) \
+        if text else None
+
+
+class RateLimiter:
+    """Block until a request fits in a rolling window of ``limit`` requests per ``window`` seconds."""
+
+    def __init__(self, limit, window=RATE_WINDOW):
+        self.limit, self.window = limit, window
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel=None):
+        """Wait for a slot; raises :class:`SyncCancelled` if ``cancel`` (an Event) is set meanwhile."""
+        cancel = cancel or threading.Event()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and now - self._sent[0] >= self.window:
+                    self._sent.popleft()
+                if len(self._sent) < self.limit:
+                    self._sent.append(now)
+                    return
+                delay = self.window - (now - self._sent[0])
+            if cancel.wait(delay):
+                raise SyncCancelled()
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_limiter(keyed):
+    """The process-wide limiter for keyed or public requests.
+
+    NVD counts requests per key (or per address without one), so every
+    client in the process, e.g. a search running beside a sync, must
+    draw from the same window.
+    """
+    with _limiters_lock:
+        if keyed not in _limiters:
+            _limiters[keyed] = RateLimiter(RATE_LIMIT_KEYED if keyed else RATE_LIMIT_PUBLIC)
+        return _limiters[keyed]
+
+
+class NvdClient:
+    """Paginated NVD CVE API 2.0 client that stays inside the published rate limits."""
+
+    def __init__(self, api_key=None, timeout=60):
+        self.api_key = api_key or None
+        self.timeout = timeout
+        self.cancel_event = threading.Event()
+        self.limiter = shared_limiter(bool(self.api_key))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _get(self, params):
+        headers = {'apiKey': self.api_key} if self.api_key else {}
+        for attempt in range(MAX_ATTEMPTS):
+            self.limiter.acquire(self.cancel_event)
+            # The shared session does not retry on status, so this is the only backoff
+            resp = http_session.get(NVD_URL, params=params, headers=headers, timeout=self.timeout)
+            # NVD answers 403/429/503 when a client exceeds its window; back off a full window
+            if resp.status_code in (403, 429, 503) and attempt < MAX_ATTEMPTS - 1:
+                if self.cancel_event.wait(RATE_WINDOW / 2 * (attempt + 1)):
+                    raise SyncCancelled()
+                continue
+            resp.raise_for_status()
+            return resp.json()
+        raise requests.exceptions.RetryError('NVD kept refusing requests; try again later or add an API key.')
+
+    def pages(self, params, start_index=0):
+        """Yield ``(vulnerabilities, next_index, total)`` for every page of a query."""
+        index = start_index
+        while True:
+            if self.cancel_event.is_set():
+                raise SyncCancelled()
+            data = self._get(dict(params, startIndex=index, resultsPerPage=PAGE_SIZE))
+            vulns = data.get('vulnerabilities', [])
+            total = data.get('totalResults', 0)
+            index += len(vulns)
+            yield vulns, index, total
+            if not vulns or index >= total:
+                return
+
+
+def severity(cve):
+    """``(severity, score, vector)`` from the newest CVSS version present."""
+    metrics = cve.get('metrics', {})
+    for key in ('cvssMetricV40', 'cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2'):
+        if entries := metrics.get(key):
+            primary = next((m for m in entries if m.get('type') == 'Primary'), entries[0])
+            data = primary.get('cvssData', {})
+            return (data.get('baseSeverity') or primary.get('baseSeverity') or 'N/A',
+                    data.get('baseScore'), data.get('vectorString', ''))
+    return 'N/A', None, ''
+
+
+def _products(configurations):
+    """``vendor product`` words from every CPE criteria string, for full-text search."""
+    words = set()
+    for config in configurations:
+        for node in config.get('nodes', []):
+            for match in node.get('cpeMatch', []):
+                parts = match.get('criteria', '').split(':')
+                if len(parts) > 4:
+                    words.add(f"{parts[3]} {parts[4]}".replace('_', ' '))
+    return ' '.join(sorted(words))
+
+
+def _cpe_rows(cve_id, configurations):
+    """``cpe_matches`` rows for every vulnerable CPE criteria of a CVE."""
+    rows = []
+    for config in configurations:
+        for node in config.get('nodes', []):
+            for match in node.get('cpeMatch', []):
+                parts = match.get('criteria', '').split(':')
+                if not match.get('vulnerable') or len(parts) < 7:
+                    continue
+                rows.append((cve_id, parts[3], parts[4], parts[2], parts[5], parts[6],
+                             match.get('versionStartIncluding'), match.get('versionStartExcluding'),
+                             match.get('versionEndIncluding'), match.get('versionEndExcluding')))
+    return rows
+
+
+def _fts_available():
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE t USING fts5(x)')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class CveStore:
+    """Local SQLite mirror of NVD CVE records with full-text search.
+
+    ``sync`` pulls the whole feed once (resumable, page by page), then
+    only records modified since the previous sync, using
+    ``lastModStartDate`` windows. Keyword searches run against the mirror
+    through an FTS5 index over descriptions and affected products, falling
+    back to LIKE matching where SQLite lacks FTS5. Vulnerable CPE criteria
+    are also kept in ``cpe_matches``, indexed on (vendor, product), for
+    bulk matching of software inventories.
+    """
+
+    def __init__(self, db_path):
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self.fts = _fts_available()
+        with self._db_lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS cves (id TEXT PRIMARY KEY, published TEXT, last_modified TEXT, '
+                'status TEXT, severity TEXT, score REAL, vector TEXT, description TEXT, products TEXT, '
+                'configurations TEXT)'
+            )
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS cves_published ON cves (published)')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS cpe_matches (cve_id TEXT, vendor TEXT, product TEXT, part TEXT, '
+                'version TEXT, upd TEXT, start_incl TEXT, start_excl TEXT, end_incl TEXT, end_excl TEXT)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS cpe_matches_product ON cpe_matches (vendor, product)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS cpe_matches_cve ON cpe_matches (cve_id)')
+            if self._meta('cpe_index') != '1':
+                # Mirrors created before the CPE index existed
+                self._db.execute('DELETE FROM cpe_matches')
+                for cve_id, configurations in self._db.execute('SELECT id, configurations FROM cves').fetchall():
+                    self._db.executemany('INSERT INTO cpe_matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                         _cpe_rows(cve_id, json.loads(configurations or '[]')))
+                self._set_meta('cpe_index', '1')
+            if self.fts:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS cves_fts USING fts5(description, products, "
+                    "content='cves', content_rowid='rowid')"
+                )
+                self._db.execute(
+                    'CREATE TRIGGER IF NOT EXISTS cves_ai AFTER INSERT ON cves BEGIN '
+                    'INSERT INTO cves_fts (rowid, description, products) '
+                    'VALUES (new.rowid, new.description, new.products); END'
+                )
+                self._db.execute(
+                    'CREATE TRIGGER IF NOT EXISTS cves_ad AFTER DELETE ON cves BEGIN '
+                    "INSERT INTO cves_fts (cves_fts, rowid, description, products) "
+                    "VALUES ('delete', old.rowid, old.description, old.products); END"
+                )
+
+    def _meta(self, key, default=None):
+        row = self._db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def upsert(self, vulnerabilities):
+        """Store NVD ``vulnerabilities`` entries, replacing older copies. Returns the number stored."""
+        rows, matches = [], []
+        for item in vulnerabilities:
+            cve = item.get('cve', {})
+            if not cve.get('id'):
+                continue
+            description = next((d.get('value', '') for d in cve.get('descriptions', []) if d.get('lang') == 'en'), '')
+            configurations = cve.get('configurations', [])
+            sev, score, vector = severity(cve)
+            rows.append((cve['id'], cve.get('published', ''), cve.get('lastModified', ''), cve.get('vulnStatus', ''),
+                         sev, score, vector, description, _products(configurations), json.dumps(configurations)))
+            matches.extend(_cpe_rows(cve['id'], configurations))
+        with self._db_lock, self._db:
+            # DELETE + INSERT rather than REPLACE so the FTS triggers see both halves
+            self._db.executemany('DELETE FROM cves WHERE id = ?', [(r[0],) for r in rows])
+            self._db.executemany('INSERT INTO cves VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self._db.executemany('DELETE FROM cpe_matches WHERE cve_id = ?', [(r[0],) for r in rows])
+            self._db.executemany('INSERT INTO cpe_matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', matches)
+        return len(rows)
+
+    def stats(self):
+        """``{'count', 'last_sync', 'complete'}`` for display."""
+        with self._db_lock:
+            count = self._db.execute('SELECT COUNT(*) FROM cves').fetchone()[0]
+            last_sync = self._meta('last_sync')
+            complete = self._meta('full_sync_complete') == '1'
+        return {'count': count, 'last_sync': _parse_time(last_sync), 'complete': complete}
+
+    def search(self, keyword, limit=SEARCH_LIMIT):
+        """Mirror rows matching every word of ``keyword``, newest first."""
+        tokens = _TOKEN_RE.findall(keyword)
+        if not tokens:
+            return []
+        columns = 'c.id, c.severity, c.score, c.description, c.published, c.vector'
+        if self.fts:
+            match = ' '.join('"{}"'.format(t.replace('"', '""')) for t in tokens)
+            sql = (f'SELECT {columns} FROM cves_fts JOIN cves c ON c.rowid = cves_fts.rowid '
+                   f'WHERE cves_fts MATCH ? ORDER BY c.published DESC LIMIT ?')
+            params = (match, limit)
+        else:
+            clause = ' AND '.join(['(c.description LIKE ? OR c.products LIKE ?)'] * len(tokens))
+            sql = f'SELECT {columns} FROM cves c WHERE {clause} ORDER BY c.published DESC LIMIT ?'
+            params = tuple(p for t in tokens for p in (f'%{t}%', f'%{t}%')) + (limit,)
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [{'id': r[0], 'severity': r[1], 'score': r[2], 'description': r[3],
+                 'published': (r[4] or '').split('T')[0], 'vector': r[5]} for r in rows]
+
+    def cpe_criteria(self, products):
+        """Vulnerable CPE criteria for each ``(vendor, product)`` pair, joined with CVE severity.
+
+        Returns ``{(vendor, product): [row, ...]}``; each row is a dict with
+        ``cve``, ``version``, ``update``, the four version-range bounds,
+        ``severity`` and ``score``.
+        """
+        results = {}
+        with self._db_lock:
+            for vendor, product in set(products):
+                rows = self._db.execute(
+                    'SELECT m.cve_id, m.version, m.upd, m.start_incl, m.start_excl, m.end_incl, m.end_excl, '
+                    'c.severity, c.score FROM cpe_matches m JOIN cves c ON c.id = m.cve_id '
+                    'WHERE m.vendor = ? AND m.product = ?', (vendor, product)
+                ).fetchall()
+                results[(vendor, product)] = [
+                    {'cve': r[0], 'version': r[1], 'update': r[2], 'start_incl': r[3], 'start_excl': r[4],
+                     'end_incl': r[5], 'end_excl': r[6], 'severity': r[7], 'score': r[8]} for r in rows
+                ]
+        return results
+
+    def configurations(self, cve_id):
+        with self._db_lock:
+            row = self._db.execute('SELECT configurations FROM cves WHERE id = ?', (cve_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else []
+
+    def fetch_keyword(self, client, keyword, progress=None):
+        """Pull every NVD record matching ``keyword`` (all years) into the mirror. Returns the count."""
+        stored = 0
+        for vulns, index, total in client.pages({'keywordSearch': keyword}):
+            stored += self.upsert(vulns)
+            if progress:
+                progress(f"Fetched {index} of {total} NVD records for '{keyword}'…")
+        return stored
+
+    def sync(self, client, progress=None):
+        """Bring the mirror up to date. Returns the number of records stored.
+
+        The first sync pages through the whole feed and can be interrupted
+        and resumed; later syncs only request records modified since the
+        last one, in windows of at most MAX_WINDOW_DAYS.
+        """
+        started = datetime.datetime.now(datetime.timezone.utc)
+        with self._db_lock:
+            complete = self._meta('full_sync_complete') == '1'
+            last_sync = _parse_time(self._meta('last_sync'))
+            resume = int(self._meta('full_sync_index', '0'))
+            if not complete and not resume:
+                self._set_meta('full_sync_started', _nvd_time(started))
+                self._db.commit()
+        stored = 0
+        if not complete:
+            for vulns, index, total in client.pages({}, start_index=resume):
+                stored += self.upsert(vulns)
+                with self._db_lock, self._db:
+                    self._set_meta('full_sync_index', str(index))
+                if progress:
+                    progress(f'Mirrored {index} of {total} CVE records…')
+            with self._db_lock, self._db:
+                # Changes made while the full pass ran are picked up by the next incremental sync
+                self._set_meta('last_sync', self._meta('full_sync_started') or _nvd_time(started))
+                self._set_meta('full_sync_complete', '1')
+                self._db.execute("DELETE FROM meta WHERE key = 'full_sync_index'")
+            return stored
+
+        window_start = last_sync
+        while window_start < started:
+            window_end = min(window_start + datetime.timedelta(days=MAX_WINDOW_DAYS), started)
+            params = {'lastModStartDate': _nvd_time(window_start), 'lastModEndDate': _nvd_time(window_end)}
+            for vulns, index, total in client.pages(params):
+                stored += self.upsert(vulns)
+                if progress:
+                    progress(f'Updated {index} of {total} records modified since {window_start:%Y-%m-%d}…')
+            with self._db_lock, self._db:
+                self._set_meta('last_sync', _nvd_time(window_end))
+            window_start = window_end
+        return stored
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide :class:`CveStore` stored under the application data directory."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CveStore(os.path.join(app_data_dir('cve'), 'nvd_mirror.db'))
+        return _store
@@ -0,0 +1,198 @@
+import copy
+import time
+import socket
+import ipaddress
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from ducky_app.core import dns_client
+
+
+class DnsCache:
+    """Process-wide, thread-safe DNS answer cache.
+
+    Positive answers live for the lowest record TTL, NXDOMAIN/NODATA answers
+    for the SOA negative TTL (RFC 2308). Concurrent lookups of the same key
+    share one in-flight query instead of each hitting the network.
+    """
+
+    def __init__(self, max_entries=20000, default_negative_ttl=60, max_ttl=86400):
+        self.max_entries = max_entries
+        self.default_negative_ttl = default_negative_ttl
+        self.max_ttl = max_ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'shared_inflight': 0, 'errors': 0}
+
+    @staticmethod
+    def _key(name, rtype, server):
+        return name.strip().rstrip('.').lower(), rtype, server
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value, negative = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self._stats['negative_hits' if negative else 'hits'] += 1
+        return value, expires
+
+    def _store(self, key, value, ttl, negative):
+        ttl = max(0, min(int(ttl), self.max_ttl))
+        expires = time.monotonic() + ttl
+        if ttl > 0:
+            self._entries[key] = (expires, value, negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return expires
+
+    def _get_or_fetch(self, key, fetch, ttl_of):
+        """Return ``(value, expires, from_cache)``, fetching at most once per key at a time."""
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached[0], cached[1], True
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self._stats['misses'] += 1
+            else:
+                self._stats['shared_inflight'] += 1
+        if not owner:
+            value, expires = future.result()
+            return value, expires, True
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._stats['errors'] += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        ttl, negative = ttl_of(value)
+        with self._lock:
+            expires = self._store(key, value, ttl, negative)
+            self._inflight.pop(key, None)
+        future.set_result((value, expires))
+        return value, expires, False
+
+    def _response_ttl(self, resp):
+        if resp.rcode == 0 and resp.answers:
+            return min(r.ttl for r in resp.answers), False
+        if resp.rcode in (0, 3):
+            negative = resp.negative_ttl()
+            return (self.default_negative_ttl if negative is None else negative), True
+        return 0, True
+
+    def resolve(self, name, rtype='A', server=None, timeout=3.0, fresh=False):
+        """Cached :func:`dns_client.query`; returned TTLs count down while cached.
+
+        ``fresh`` always asks the server, for tools that watch answers change,
+        and stores the new answer for everyone else.
+        """
+        rtype = rtype.upper()
+        fetch = lambda: dns_client.query(name, rtype, server=server, timeout=timeout)
+        if fresh:
+            resp = fetch()
+            ttl, negative = self._response_ttl(resp)
+            with self._lock:
+                self._stats['misses'] += 1
+                self._store(self._key(name, rtype, server), resp, ttl, negative)
+            return resp
+        resp, expires, from_cache = self._get_or_fetch(self._key(name, rtype, server), fetch,
+                                                       self._response_ttl)
+        if not from_cache:
+            return resp
+        remaining = max(0, int(expires - time.monotonic()))
+        cached = copy.copy(resp)
+        cached.answers = [r._replace(ttl=min(r.ttl, remaining)) for r in resp.answers]
+        cached.from_cache = True
+        return cached
+
+    def resolve_addresses(self, host, timeout=3.0):
+        """Return the IPv4 then IPv6 addresses for ``host`` (literals are returned as-is).
+
+        Names the DNS servers don't know (hosts file, mDNS, NetBIOS) fall back
+        to the system resolver, whose answers are cached for the negative TTL.
+        """
+        try:
+            return [str(ipaddress.ip_address(host.strip('[]')))]
+        except ValueError:
+            pass
+        addrs = []
+        for rtype in ('A', 'AAAA'):
+            try:
+                addrs += [r.data for r in self.resolve(host, rtype, timeout=timeout).records(rtype)]
+            except dns_client.DnsError:
+                continue
+        if addrs:
+            return addrs
+
+        def system_lookup():
+            infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+            return list(dict.fromkeys(info[4][0] for info in infos))
+
+        addrs, _expires, _hit = self._get_or_fetch(
+            self._key(host, 'SYSTEM', None), system_lookup,
+            lambda value: (self.default_negative_ttl, False),
+        )
+        return list(addrs)
+
+    def reverse_lookup(self, ip, timeout=3.0):
+        """PTR name for ``ip`` without the trailing dot, or None."""
+        try:
+            ptr = self.resolve(ip, 'PTR', timeout=timeout).records('PTR')
+            if ptr:
+                return ptr[0].data.rstrip('.')
+        except dns_client.DnsError:
+            pass
+
+        def system_lookup():
+            try:
+                return socket.gethostbyaddr(ip)[0]
+            except (socket.herror, socket.gaierror, OSError):
+                return None
+
+        name, _expires, _hit = self._get_or_fetch(
+            self._key(ip, 'SYSTEM-PTR', None), system_lookup,
+            lambda value: (self.default_negative_ttl, value is None),
+        )
+        return name
+
+    def create_connection(self, host, port, timeout=10.0):
+        """Like :func:`socket.create_connection`, but resolving ``host`` through the cache."""
+        last_error = None
+        for addr in self.resolve_addresses(host, timeout=min(timeout, 3.0)):
+            family = socket.AF_INET6 if ':' in addr else socket.AF_INET
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect((addr, port))
+                return sock
+            except OSError as e:
+                sock.close()
+                last_error = e
+        raise last_error or OSError(f'Could not resolve {host}')
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['in_flight'] = len(self._inflight)
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses'] + stats['shared_inflight']
+        stats['hit_rate'] = (lookups - stats['misses']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+shared_cache = DnsCache()
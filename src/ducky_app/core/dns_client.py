@@ -0,0 +1,377 @@
+import os
+import sys
+import time
+import socket
+import struct
+import random
+import ipaddress
+from collections import namedtuple
+
+RECORD_TYPES = {
+    'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12,
+    'MX': 15, 'TXT': 16, 'AAAA': 28, 'SRV': 33,
+}
+TYPE_NAMES = {v: k for k, v in RECORD_TYPES.items()}
+TYPE_OPT = 41
+CLASS_IN = 1
+
+RCODE_NAMES = {
+    0: 'NOERROR', 1: 'FORMERR', 2: 'SERVFAIL', 3: 'NXDOMAIN',
+    4: 'NOTIMP', 5: 'REFUSED', 16: 'BADVERS',
+}
+
+EDNS_PAYLOAD_SIZE = 1232
+FALLBACK_NAMESERVERS = ['1.1.1.1', '8.8.8.8']
+
+MxData = namedtuple('MxData', 'preference exchange')
+SrvData = namedtuple('SrvData', 'priority weight port target')
+SoaData = namedtuple('SoaData', 'mname rname serial refresh retry expire minimum')
+
+
+class DnsError(Exception):
+    pass
+
+
+class DnsTimeout(DnsError):
+    pass
+
+
+class DnsRecord(namedtuple('DnsRecord', 'name rtype ttl data')):
+    """A single resource record; ``data`` is decoded according to ``rtype``."""
+    __slots__ = ()
+
+    @property
+    def type_name(self):
+        return TYPE_NAMES.get(self.rtype, f'TYPE{self.rtype}')
+
+    def to_text(self):
+        d = self.data
+        if isinstance(d, MxData):
+            return f'{d.preference} {d.exchange}'
+        if isinstance(d, SrvData):
+            return f'{d.priority} {d.weight} {d.port} {d.target}'
+        if isinstance(d, SoaData):
+            return (f'{d.mname} {d.rname} {d.serial} {d.refresh} '
+                    f'{d.retry} {d.expire} {d.minimum}')
+        if isinstance(d, tuple):
+            return ' '.join(f'"{s}"' for s in d)
+        if isinstance(d, bytes):
+            return f'\\# {len(d)} {d.hex()}'
+        return str(d)
+
+
+class DnsResponse:
+    """Decoded DNS message with the answer, authority and additional sections."""
+
+    def __init__(self, qid, flags, rcode, question, answers, authority, additional,
+                 edns_payload=None):
+        self.id = qid
+        self.flags = flags
+        self.rcode = rcode
+        self.question = question
+        self.answers = answers
+        self.authority = authority
+        self.additional = additional
+        self.edns_payload = edns_payload
+        self.server = None
+        self.protocol = 'UDP'
+        self.elapsed_ms = 0
+        self.from_cache = False
+
+    @property
+    def rcode_name(self):
+        return RCODE_NAMES.get(self.rcode, f'RCODE{self.rcode}')
+
+    @property
+    def truncated(self):
+        return bool(self.flags & 0x0200)
+
+    @property
+    def authoritative(self):
+        return bool(self.flags & 0x0400)
+
+    def records(self, rtype=None):
+        """Answer records, optionally restricted to one record type name or code."""
+        if rtype is None:
+            return list(self.answers)
+        code = RECORD_TYPES.get(rtype, rtype) if isinstance(rtype, str) else rtype
+        return [r for r in self.answers if r.rtype == code]
+
+    def negative_ttl(self):
+        """TTL for caching a negative answer, taken from the authority SOA (RFC 2308)."""
+        for rec in self.authority:
+            if isinstance(rec.data, SoaData):
+                return min(rec.ttl, rec.data.minimum)
+        return None
+
+
+def reverse_name(ip):
+    """Return the in-addr.arpa / ip6.arpa name used for PTR lookups of ``ip``."""
+    return ipaddress.ip_address(ip).reverse_pointer
+
+
+def _encode_name(name):
+    name = name.strip().rstrip('.')
+    if not name:
+        return b'\x00'
+    out = bytearray()
+    for label in name.split('.'):
+        try:
+            raw = label.encode('ascii')
+        except UnicodeEncodeError:
+            raw = label.encode('idna')
+        if not raw or len(raw) > 63:
+            raise DnsError(f'Invalid label in name: {name!r}')
+        out.append(len(raw))
+        out += raw
+    out.append(0)
+    if len(out) > 255:
+        raise DnsError(f'Name too long: {name!r}')
+    return bytes(out)
+
+
+def build_query(name, rtype='A', qid=None, recursion=True, edns_payload=EDNS_PAYLOAD_SIZE):
+    """Build a wire-format query. ``edns_payload=None`` disables the EDNS0 OPT record."""
+    code = RECORD_TYPES[rtype] if isinstance(rtype, str) else int(rtype)
+    if qid is None:
+        qid = random.getrandbits(16)
+    flags = 0x0100 if recursion else 0
+    arcount = 1 if edns_payload else 0
+    msg = struct.pack('!HHHHHH', qid, flags, 1, 0, 0, arcount)
+    msg += _encode_name(name) + struct.pack('!HH', code, CLASS_IN)
+    if edns_payload:
+        # Root name, TYPE=OPT, CLASS=payload size, TTL=ext-rcode/version/flags, RDLEN=0
+        msg += b'\x00' + struct.pack('!HHIH', TYPE_OPT, edns_payload, 0, 0)
+    return msg
+
+
+def _read_name(data, offset):
+    labels = []
+    jumped = False
+    end = offset
+    hops = 0
+    while True:
+        if offset >= len(data):
+            raise DnsError('Truncated name in response')
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise DnsError('Truncated compression pointer')
+            pointer = ((length & 0x3F) << 8) | data[offset + 1]
+            if not jumped:
+                end = offset + 2
+            jumped = True
+            offset = pointer
+            hops += 1
+            if hops > 64:
+                raise DnsError('Compression loop in response')
+            continue
+        if length == 0:
+            if not jumped:
+                end = offset + 1
+            break
+        offset += 1
+        labels.append(data[offset:offset + length].decode('ascii', errors='replace'))
+        offset += length
+    return ('.'.join(labels) + '.') if labels else '.', end
+
+
+def _parse_rdata(data, rtype, offset, rdlen):
+    rdata = data[offset:offset + rdlen]
+    if rtype == 1 and rdlen == 4:
+        return socket.inet_ntop(socket.AF_INET, rdata)
+    if rtype == 28 and rdlen == 16:
+        return socket.inet_ntop(socket.AF_INET6, rdata)
+    if rtype in (2, 5, 12):
+        return _read_name(data, offset)[0]
+    if rtype == 15:
+        pref = struct.unpack_from('!H', data, offset)[0]
+        return MxData(pref, _read_name(data, offset + 2)[0])
+    if rtype == 33:
+        prio, weight, port = struct.unpack_from('!HHH', data, offset)
+        return SrvData(prio, weight, port, _read_name(data, offset + 6)[0])
+    if rtype == 6:
+        mname, pos = _read_name(data, offset)
+        rname, pos = _read_name(data, pos)
+        return SoaData(mname, rname, *struct.unpack_from('!IIIII', data, pos))
+    if rtype == 16:
+        strings, pos = [], 0
+        while pos < rdlen:
+            n = rdata[pos]
+            strings.append(rdata[pos + 1:pos + 1 + n].decode('utf-8', errors='replace'))
+            pos += 1 + n
+        return tuple(strings)
+    return bytes(rdata)
+
+
+def parse_message(data):
+    """Decode a wire-format DNS message into a :class:`DnsResponse`."""
+    try:
+        return _parse_message(data)
+    except (struct.error, IndexError) as e:
+        raise DnsError(f'Malformed response: {e}') from e
+
+
+def _parse_message(data):
+    if len(data) < 12:
+        raise DnsError('Response shorter than DNS header')
+    qid, flags, qd, an, ns, ar = struct.unpack_from('!HHHHHH', data, 0)
+    offset = 12
+    question = None
+    for _ in range(qd):
+        qname, offset = _read_name(data, offset)
+        qtype, _qclass = struct.unpack_from('!HH', data, offset)
+        offset += 4
+        question = (qname, qtype)
+
+    sections = ([], [], [])
+    rcode = flags & 0x000F
+    edns_payload = None
+    for idx, count in enumerate((an, ns, ar)):
+        for _ in range(count):
+            rname, offset = _read_name(data, offset)
+            if offset + 10 > len(data):
+                raise DnsError('Truncated resource record')
+            rtype, rclass, ttl, rdlen = struct.unpack_from('!HHIH', data, offset)
+            offset += 10
+            if offset + rdlen > len(data):
+                raise DnsError('Truncated record data')
+            if rtype == TYPE_OPT:
+                edns_payload = rclass
+                rcode |= (ttl >> 24) << 4
+            else:
+                sections[idx].append(DnsRecord(rname, rtype, ttl, _parse_rdata(data, rtype, offset, rdlen)))
+            offset += rdlen
+    return DnsResponse(qid, flags, rcode, question, *sections, edns_payload=edns_payload)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise DnsError('Connection closed by server')
+        buf += chunk
+    return bytes(buf)
+
+
+def _family_for(server):
+    try:
+        return socket.AF_INET6 if ipaddress.ip_address(server).version == 6 else socket.AF_INET
+    except ValueError:
+        return socket.AF_INET
+
+
+def _query_udp(payload, server, port, timeout):
+    with socket.socket(_family_for(server), socket.SOCK_DGRAM) as s:
+        s.settimeout(timeout)
+        s.connect((server, port))
+        s.send(payload)
+        deadline = time.monotonic() + timeout
+        while True:
+            data = s.recv(65535)
+            # Discard stray datagrams that don't carry our transaction id
+            if data[:2] == payload[:2]:
+                return data
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout()
+            s.settimeout(remaining)
+
+
+def _query_tcp(payload, server, port, timeout):
+    with socket.create_connection((server, port), timeout=timeout) as s:
+        s.sendall(struct.pack('!H', len(payload)) + payload)
+        length = struct.unpack('!H', _recv_exact(s, 2))[0]
+        return _recv_exact(s, length)
+
+
+def query(name, rtype='A', server=None, port=53, timeout=3.0, tcp=False):
+    """Send one query and return the decoded response.
+
+    Uses UDP with an EDNS0 payload size and retries over TCP when the answer
+    comes back truncated. With no ``server`` the system nameservers are tried
+    in order until one answers.
+    """
+    if isinstance(rtype, str):
+        rtype = rtype.upper()
+        if rtype == 'PTR':
+            try:
+                name = reverse_name(name)
+            except ValueError:
+                pass
+    servers = [server] if server else system_nameservers()
+    last_error = None
+    for srv in servers:
+        payload = build_query(name, rtype)
+        t0 = time.perf_counter()
+        try:
+            if tcp:
+                raw, proto = _query_tcp(payload, srv, port, timeout), 'TCP'
+            else:
+                raw, proto = _query_udp(payload, srv, port, timeout), 'UDP'
+                if len(raw) >= 4 and raw[2] & 0x02:
+                    raw, proto = _query_tcp(payload, srv, port, timeout), 'TCP'
+            resp = parse_message(raw)
+        except socket.timeout:
+            last_error = DnsTimeout(f'No response from {srv} within {timeout:g} s')
+            continue
+        except OSError as e:
+            last_error = DnsError(f'{srv}: {e}')
+            continue
+        except DnsError as e:
+            last_error = DnsError(f'{srv}: {e}')
+            continue
+        if resp.id != payload[0] << 8 | payload[1]:
+            last_error = DnsError(f'{srv}: transaction id mismatch')
+            continue
+        resp.server = srv
+        resp.protocol = proto
+        resp.elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+        return resp
+    raise last_error or DnsError('No nameservers available')
+
+
+_system_nameservers = None
+
+
+def _windows_nameservers():
+    import winreg
+    servers = []
+    path = r'SYSTEM\CurrentControlSet\Services\Tcpip\Parameters\Interfaces'
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path) as root:
+        for i in range(winreg.QueryInfoKey(root)[0]):
+            with winreg.OpenKey(root, winreg.EnumKey(root, i)) as iface:
+                for value in ('NameServer', 'DhcpNameServer'):
+                    try:
+                        raw = winreg.QueryValueEx(iface, value)[0]
+                    except OSError:
+                        continue
+                    servers += [s for s in raw.replace(',', ' ').split() if s]
+    return servers
+
+
+def _resolv_conf_nameservers(path='/etc/resolv.conf'):
+    servers = []
+    with open(path, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0] == 'nameserver':
+                servers.append(parts[1].split('%')[0])
+    return servers
+
+
+def system_nameservers():
+    """Nameservers configured on this machine, falling back to public resolvers."""
+    global _system_nameservers
+    if _system_nameservers is None:
+        servers = []
+        try:
+            if sys.platform.startswith('win'):
+                servers = _windows_nameservers()
+            elif os.path.exists('/etc/resolv.conf'):
+                servers = _resolv_conf_nameservers()
+        except Exception:
+            servers = []
+        _system_nameservers = list(dict.fromkeys(servers)) or list(FALLBACK_NAMESERVERS)
+    return _system_nameservers
@@ -0,0 +1,138 @@
+import ipaddress
+from ducky_app.core import dns_client
+from ducky_app.core.dns_cache import shared_cache as dns_cache
+
+# Zones that have shut down answer every query as listed or time out, so they
+# stay out: SORBS (closed 2024), cbl.abuseat.org (folded into Spamhaus XBL)
+# and korea.services.net.
+DEFAULT_ZONES = [
+    'zen.spamhaus.org',
+    'sbl.spamhaus.org',
+    'xbl.spamhaus.org',
+    'pbl.spamhaus.org',
+    'bl.spamcop.net',
+    'b.barracudacentral.org',
+    'dnsbl-1.uceprotect.net',
+    'dnsbl-2.uceprotect.net',
+    'dnsbl-3.uceprotect.net',
+    'psbl.surriel.com',
+    'dnsbl.dronebl.org',
+    'all.s5h.net',
+    'bl.mailspike.net',
+    'z.mailspike.net',
+    'ix.dnsbl.manitu.net',
+    'truncate.gbudb.net',
+    'dnsbl.spfbl.net',
+    'bl.0spam.org',
+    'rbl.0spam.org',
+    'spam.spamrats.com',
+    'dyna.spamrats.com',
+    'noptr.spamrats.com',
+    'auth.spamrats.com',
+    'db.wpbl.info',
+    'bl.blocklist.de',
+    'dnsbl.inps.de',
+    'bl.nordspam.com',
+    'rbl.interserver.net',
+    'spamrbl.imp.ch',
+    'wormrbl.imp.ch',
+    'ubl.unsubscore.com',
+    'dnsbl.kempt.net',
+    'bl.konstant.no',
+    'backscatter.spameatingmonkey.net',
+    'bl.spameatingmonkey.net',
+    'rbl.schulte.org',
+    'cbl.anti-spam.org.cn',
+    'cdl.anti-spam.org.cn',
+    'dnsbl.zapbl.net',
+    'virus.rbl.jp',
+    'short.rbl.jp',
+    'hostkarma.junkemailfilter.com',
+    'black.junkemailfilter.com',
+    'rbl.megarbl.net',
+    'spamsources.fabel.dk',
+    'tor.dan.me.uk',
+    'torexit.dan.me.uk',
+    'ips.backscatterer.org',
+    'dnsrbl.swinog.ch',
+    'rbl.efnetrbl.org',
+    'dnsbl.justspam.org',
+    'access.redhawk.org',
+    'bl.score.senderscore.com',
+    'relays.nether.net',
+    'dnsbl.anticaptcha.net',
+    'singular.ttk.pte.hu',
+    'bogons.cymru.com',
+]
+
+# Return codes in 127.255.255.0/24 are Spamhaus-style error signals (e.g. the
+# query came through a public resolver), not listings.
+_ERROR_NET = ipaddress.ip_network('127.255.255.0/24')
+
+
+def reversed_label(ip):
+    """Octet-reversed IPv4 or nibble-reversed IPv6 label used as the DNSBL query prefix."""
+    addr = ipaddress.ip_address(ip)
+    suffix = '.in-addr.arpa' if addr.version == 4 else '.ip6.arpa'
+    return addr.reverse_pointer[:-len(suffix)]
+
+
+def parse_zone_list(text):
+    """One zone per line; blank lines and ``#`` comments are ignored."""
+    zones = []
+    for line in text.splitlines():
+        zone = line.split('#', 1)[0].strip().strip('.').lower()
+        if zone and zone not in zones:
+            zones.append(zone)
+    return zones
+
+
+def expand_targets(spec, limit=4096):
+    """Expand an IP, CIDR block or ``first-last`` range into a list of addresses."""
+    spec = spec.strip()
+    if '-' in spec:
+        first, last = (ipaddress.ip_address(p.strip()) for p in spec.split('-', 1))
+        if first.version != last.version or int(last) < int(first):
+            raise ValueError('Invalid address range.')
+        count = int(last) - int(first) + 1
+        if count > limit:
+            raise ValueError(f'Range holds {count} addresses; the limit is {limit}.')
+        return [str(ipaddress.ip_address(int(first) + i)) for i in range(count)]
+    if '/' in spec:
+        net = ipaddress.ip_network(spec, strict=False)
+        if net.num_addresses > limit:
+            raise ValueError(f'{net.with_prefixlen} holds {net.num_addresses} addresses; the limit is {limit}.')
+        hosts = list(net.hosts()) or [net.network_address]
+        return [str(h) for h in hosts]
+    return [str(ipaddress.ip_address(spec))]
+
+
+def check_listing(ip, zone, timeout=5.0):
+    """Query one DNSBL zone for ``ip``. Returns ``(listed, response)``.
+
+    ``listed`` is True/False, or None when the zone could not be queried.
+    """
+    name = f'{reversed_label(ip)}.{zone}'
+    try:
+        resp = dns_cache.resolve(name, 'A', timeout=timeout)
+    except dns_client.DnsTimeout:
+        return None, f'Timeout ({timeout:g} s)'
+    except dns_client.DnsError as e:
+        return None, str(e)
+    if resp.rcode == 3:
+        return False, 'Clean'
+    if resp.rcode != 0:
+        return None, resp.rcode_name
+    addrs = [r.data for r in resp.records('A')]
+    if not addrs:
+        return False, 'Clean'
+    if all(ipaddress.ip_address(a) in _ERROR_NET for a in addrs):
+        return None, f'Query refused by list ({addrs[0]})'
+    reason = ''
+    try:
+        txt = dns_cache.resolve(name, 'TXT', timeout=timeout).records('TXT')
+        if txt:
+            reason = ' '.join(txt[0].data)
+    except dns_client.DnsError:
+        pass
+    return True, f"{', '.join(addrs)}  {reason}".strip()
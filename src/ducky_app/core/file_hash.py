@@ -0,0 +1,323 @@
+import os
+import re
+import time
+import zlib
+import queue
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ducky_app.core.config_manager import app_data_dir
+
+ALGORITHMS = ('md5', 'sha1', 'sha256', 'sha512', 'sha3_256', 'sha3_512', 'blake2b', 'blake2s', 'crc32')
+LABELS = {
+    'md5': 'MD5', 'sha1': 'SHA1', 'sha256': 'SHA256', 'sha512': 'SHA512', 'sha3_256': 'SHA3-256',
+    'sha3_512': 'SHA3-512', 'blake2b': 'BLAKE2b', 'blake2s': 'BLAKE2s', 'crc32': 'CRC32',
+}
+BUFFER_SIZE = 4 * 1024 * 1024
+BUFFERS = 4                 # read-ahead: the reader fills one buffer while the hashers work on the others
+PROGRESS_INTERVAL = 0.2
+MANIFEST_ALGORITHMS = ('sha256', 'sha512', 'sha1', 'md5', 'sha3_256', 'blake2b')
+TREE_WORKERS = 8            # files hashed at once; hashing releases the GIL and the rest is I/O wait
+TREE_BUFFER_SIZE = 1024 * 1024
+
+_DIGEST_LENGTHS = {32: 'md5', 40: 'sha1', 64: 'sha256', 128: 'sha512'}
+_B2SUM_NAME_RE = re.compile(r'(?:^|[^a-z0-9])b2(?:sums?)?(?:[^a-z0-9]|$)')   # coreutils b2sum: B2SUMS, *.b2
+_GNU_LINE_RE = re.compile(r'^(\\?)([0-9a-fA-F]{8,128}) [ *](.+)$')
+_BSD_LINE_RE = re.compile(r'^(\\?)([\w-]+) \((.+)\) = ([0-9a-fA-F]{8,128})$')
+
+
+class HashCancelled(Exception):
+    pass
+
+
+class _Crc32:
+    """hashlib-style wrapper over :func:`zlib.crc32`."""
+
+    name = 'crc32'
+
+    def __init__(self, data=b''):
+        self._value = zlib.crc32(data)
+
+    def update(self, data):
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self):
+        return f'{self._value:08x}'
+
+
+def new_hasher(name):
+    if name == 'crc32':
+        return _Crc32()
+    return hashlib.new(name)
+
+
+def hash_bytes(data, algorithms=ALGORITHMS):
+    """``{algorithm: hex digest}`` of an in-memory value."""
+    results = {}
+    for name in algorithms:
+        hasher = new_hasher(name)
+        hasher.update(data)
+        results[name] = hasher.hexdigest()
+    return results
+
+
+def hash_file(path, algorithms=ALGORITHMS, progress=None, cancelled=lambda: False, buffer_size=BUFFER_SIZE):
+    """``{algorithm: hex digest}`` of a file, reading it once for every algorithm.
+
+    The file is read with ``readinto`` into a small ring of reusable
+    buffers, and each algorithm runs in its own thread over read-only
+    views of them. hashlib and zlib release the GIL on large buffers, so
+    the algorithms hash in parallel with each other and with the read;
+    a buffer is reused only after every algorithm has consumed it.
+    ``progress(done_bytes, total_bytes, elapsed)`` is called a few times
+    a second. Raises :class:`HashCancelled` once ``cancelled()`` is true.
+    """
+    algorithms = list(algorithms)
+    hashers = {name: new_hasher(name) for name in algorithms}
+    buffers = [bytearray(buffer_size) for _ in range(BUFFERS)]
+    free = queue.Queue()
+    for i in range(BUFFERS):
+        free.put(i)
+    remaining = [0] * BUFFERS
+    lock = threading.Lock()
+    inboxes = {name: queue.Queue() for name in algorithms}
+    errors = []
+
+    def consume(name):
+        hasher, inbox = hashers[name], inboxes[name]
+        while (item := inbox.get()) is not None:
+            index, view = item
+            try:
+                hasher.update(view)
+            except Exception as e:     # keep releasing buffers so the reader never blocks forever
+                errors.append(e)
+            with lock:
+                remaining[index] -= 1
+                if not remaining[index]:
+                    free.put(index)
+
+    threads = [threading.Thread(target=consume, args=(name,), daemon=True) for name in algorithms]
+    for thread in threads:
+        thread.start()
+    total = os.path.getsize(path)
+    done, t0, last = 0, time.perf_counter(), 0.0
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                if cancelled():
+                    raise HashCancelled()
+                index = free.get()
+                n = f.readinto(buffers[index])
+                if not n:
+                    free.put(index)
+                    break
+                view = memoryview(buffers[index])[:n]
+                remaining[index] = len(algorithms)
+                for inbox in inboxes.values():
+                    inbox.put((index, view))
+                done += n
+                now = time.perf_counter()
+                if progress and now - last >= PROGRESS_INTERVAL:
+                    progress(done, total, now - t0)
+                    last = now
+    finally:
+        for inbox in inboxes.values():
+            inbox.put(None)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    if progress:
+        progress(done, total, time.perf_counter() - t0)
+    return {name: hashers[name].hexdigest() for name in algorithms}
+
+
+# ── Directory trees and manifests ───────────────────────────────────────
+class DigestCache:
+    """Previously computed file digests, trusted while a file's size and mtime are unchanged."""
+
+    def __init__(self, db_path):
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS digests (path TEXT, algorithm TEXT, size INTEGER, '
+                'mtime_ns INTEGER, digest TEXT, PRIMARY KEY (path, algorithm))')
+
+    def under(self, root, algorithm):
+        """``{path: (size, mtime_ns, digest)}`` for every cached file below ``root``, in one query."""
+        prefix = os.path.join(_cache_key(root), '')
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with self._db_lock:
+            rows = self._db.execute(
+                'SELECT path, size, mtime_ns, digest FROM digests WHERE algorithm = ? AND path >= ? AND path < ?',
+                (algorithm, prefix, upper)).fetchall()
+        return {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in rows}
+
+    def put_many(self, rows):
+        """Store ``(path, algorithm, size, mtime_ns, digest)`` rows."""
+        with self._db_lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?)',
+                                 [(_cache_key(p), a, s, m, d) for p, a, s, m, d in rows])
+
+
+def _cache_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _digest_file(path, algorithm, cancelled, buffer):
+    hasher = new_hasher(algorithm)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while n := f.readinto(buffer):
+            if cancelled():
+                raise HashCancelled()
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def walk_files(root, exclude=()):
+    """Absolute paths of the regular files below ``root``, sorted; symlinked directories are not followed."""
+    exclude = {_cache_key(p) for p in exclude}
+    found, stack = [], [root]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file() and _cache_key(entry.path) not in exclude:
+                found.append(os.path.abspath(entry.path))
+    return sorted(found)
+
+
+def digest_files(paths, algorithm, root=None, cache=None, cancelled=lambda: False, workers=TREE_WORKERS):
+    """Yield ``(path, size, digest, cached, error)`` for each path, in order, hashing several files at once.
+
+    Files whose size and mtime match the ``cache`` entry below ``root``
+    are not read at all; fresh digests are written back in batches. A
+    missing or unreadable file yields its error message instead of a
+    digest. Stops early once ``cancelled()`` is true.
+    """
+    known = cache.under(root, algorithm) if cache and root else {}
+    local = threading.local()
+
+    def digest(path):
+        if cancelled():
+            return path, None, None, None, False, 'cancelled'
+        try:
+            st = os.stat(path)
+            entry = known.get(_cache_key(path))
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                return path, st.st_size, st.st_mtime_ns, entry[2], True, None
+            if not hasattr(local, 'buffer'):
+                local.buffer = bytearray(TREE_BUFFER_SIZE)
+            value = _digest_file(path, algorithm, cancelled, local.buffer)
+            return path, st.st_size, st.st_mtime_ns, value, False, None
+        except HashCancelled:
+            return path, None, None, None, False, 'cancelled'
+        except OSError as e:
+            return path, None, None, None, False, e.strerror or str(e)
+
+    fresh = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, size, mtime_ns, value, cached, error in pool.map(digest, paths):
+            if error == 'cancelled':
+                break
+            if value and not cached and cache:
+                # The stat taken before reading, so a file changed mid-hash is re-read next time
+                fresh.append((path, algorithm, size, mtime_ns, value))
+                if len(fresh) >= 500:
+                    cache.put_many(fresh)
+                    fresh = []
+            yield path, size, value, cached, error
+    if fresh and cache:
+        cache.put_many(fresh)
+
+
+def manifest_line(digest, relpath, algorithm=None):
+    """One sha256sum-style line; names with a backslash or newline use GNU coreutils escaping.
+
+    With an ``algorithm`` whose digest length would be read as another
+    one (BLAKE2b as SHA-512, SHA3-256 as SHA-256, ...), the line is BSD
+    tagged instead, ``BLAKE2b (name) = digest``, as ``b2sum --tag`` writes.
+    """
+    name = relpath.replace(os.sep, '/')
+    escaped = '\\' in name or '\n' in name
+    if escaped:
+        name = name.replace('\\', '\\\\').replace('\n', '\\n')
+    prefix = '\\' if escaped else ''
+    if algorithm and _DIGEST_LENGTHS.get(len(digest)) != algorithm:
+        return f'{prefix}{LABELS[algorithm]} ({name}) = {digest}'
+    return f'{prefix}{digest}  {name}'
+
+
+def _unescape(name):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) == 'n' else m.group(1), name)
+
+
+def write_manifest(path, entries, algorithm=None):
+    """Write ``(digest, relpath)`` entries atomically as a coreutils ``-c`` compatible manifest.
+
+    Digests of ``algorithm`` that a plain line could not identify are
+    written BSD tagged, so the manifest verifies under any file name.
+    """
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as f:
+        for digest, relpath in entries:
+            f.write(manifest_line(digest, relpath, algorithm) + '\n')
+    os.replace(tmp, path)
+
+
+def parse_manifest(text):
+    """``(algorithm or None, [(digest, relpath), ...])`` from GNU (``hash  name``) or BSD tagged lines.
+
+    Raises ValueError naming the first line that is neither.
+    """
+    algorithm, entries = None, []
+    by_label = {label.lower(): name for name, label in LABELS.items()}
+    for n, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.startswith('#'):
+            continue
+        if m := _BSD_LINE_RE.match(line):
+            escaped, tag, name, digest = m.groups()
+            algorithm = by_label.get(tag.lower(), algorithm)
+        elif m := _GNU_LINE_RE.match(line):
+            escaped, digest, name = m.groups()
+        else:
+            raise ValueError(f'Line {n} is not a checksum line: {line[:60]}')
+        entries.append((digest.lower(), _unescape(name) if escaped else name))
+    return algorithm, entries
+
+
+def manifest_algorithm(path, entries, tagged=None):
+    """Algorithm of a manifest: from BSD tags, else its file name (``SHA256SUMS``, ``B2SUMS``, ``*.md5``), else digest length."""
+    if tagged:
+        return tagged
+    name = os.path.basename(path).lower().replace('-', '_')
+    for algorithm in sorted(MANIFEST_ALGORITHMS, key=len, reverse=True):
+        if algorithm in name:
+            return algorithm
+    if _B2SUM_NAME_RE.search(name):
+        return 'blake2b'     # b2sum's default BLAKE2b-512
+    lengths = {len(digest) for digest, _ in entries}
+    if len(lengths) == 1 and (length := lengths.pop()) in _DIGEST_LENGTHS:
+        return _DIGEST_LENGTHS[length]
+    raise ValueError('Could not tell which algorithm the manifest uses.')
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide :class:`DigestCache` stored under the application data directory."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DigestCache(os.path.join(app_data_dir('hashes'), 'digest_cache.db'))
+        return _cache
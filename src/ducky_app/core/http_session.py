@@ -0,0 +1,129 @@
+import weakref
+import threading
+import urllib.parse
+import http.cookiejar
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
+from ducky_app.core.dns_cache import shared_cache as dns_cache
+
+USER_AGENT = 'Ducky/1.3.0 (https://github.com/thecmdguy/Ducky)'
+
+POOL_CONNECTIONS = 32   # distinct hosts kept in the pool
+POOL_MAXSIZE = 16       # keep-alive connections per host
+MAX_PER_HOST = 8        # concurrent in-flight requests per host
+
+_session = None
+_session_lock = threading.Lock()
+# Held only by requests in flight, so a host's entry goes away once it is idle
+_host_limits = weakref.WeakValueDictionary()
+
+
+class _CachedResolveMixin:
+    """Connect through the DNS cache's addresses, trying each in turn."""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addrs = dns_cache.resolve_addresses(host.rstrip('.'))
+        except OSError:
+            addrs = []
+        if not addrs:
+            # Let urllib3 resolve and report the failure in its usual terms
+            return super()._new_conn()
+        error = None
+        for addr in addrs:
+            self._dns_host = addr
+            try:
+                return super()._new_conn()
+            except (ConnectTimeoutError, NewConnectionError) as e:
+                error = e
+            finally:
+                # TLS takes SNI and the certificate hostname from this attribute
+                self._dns_host = host
+        raise error
+
+
+class _CachedHTTPConnection(_CachedResolveMixin, HTTPConnection):
+    pass
+
+
+class _CachedHTTPSConnection(_CachedResolveMixin, HTTPSConnection):
+    pass
+
+
+class _CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedHTTPConnection
+
+
+class _CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedHTTPSConnection
+
+
+class _CachedResolveAdapter(HTTPAdapter):
+    """HTTPAdapter whose direct connections look their host up in the shared DNS cache."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CachedHTTPConnectionPool,
+            'https': _CachedHTTPSConnectionPool,
+        }
+
+
+def _build_session():
+    # Connection retries only: the diagnostic tools report a 429/503 as they get it, and a long
+    # Retry-After must not stall a worker. Callers that need backoff on status (NVD) do their own.
+    retry = Retry(
+        total=2, connect=2, read=1, status=0,
+        backoff_factor=0.5,
+        status_forcelist=(),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = _CachedResolveAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    # Diagnostics must not leak cookies between tools or threads
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    """The process-wide session; its connection pool is shared by every HTTP tool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+
+def _host_limit(url):
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    with _session_lock:
+        limit = _host_limits.get(host)
+        if limit is None:
+            limit = _host_limits[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return limit
+
+
+def request(method, url, **kwargs):
+    """``requests.request`` over the pooled session, limited to MAX_PER_HOST per host."""
+    with _host_limit(url):
+        return get_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    kwargs.setdefault('allow_redirects', True)
+    return request('GET', url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault('allow_redirects', False)
+    return request('HEAD', url, **kwargs)
@@ -0,0 +1,148 @@
+import ssl
+import time
+import socket
+import ipaddress
+import http.client
+import urllib.parse
+from collections import namedtuple
+from ducky_app.core import dns_client
+from ducky_app.core.http_session import USER_AGENT
+
+PHASES = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'download_ms', 'total_ms')
+PHASE_LABELS = {
+    'dns_ms': 'DNS lookup',
+    'connect_ms': 'TCP connect',
+    'tls_ms': 'TLS handshake',
+    'ttfb_ms': 'Time to first byte',
+    'download_ms': 'Content transfer',
+    'total_ms': 'Total',
+}
+PERCENTILES = (50, 90, 95, 99)
+MAX_BODY = 64 * 1024 * 1024
+
+TimingSample = namedtuple('TimingSample', 'address status reason bytes ' + ' '.join(PHASES))
+
+
+def _ms(start, end):
+    return round((end - start) * 1000, 2)
+
+
+def _resolve(host, timeout):
+    """Resolve ``host`` on the wire (never from the shared cache) so the DNS phase is real."""
+    try:
+        return [str(ipaddress.ip_address(host.strip('[]')))]
+    except ValueError:
+        pass
+    try:
+        addrs = [r.data for r in dns_client.query(host, 'A', timeout=timeout).records('A')]
+        if addrs:
+            return addrs
+    except dns_client.DnsError:
+        pass
+    infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+def measure(url, timeout=15.0, method='GET'):
+    """Make one request to ``url`` on a fresh connection and time each phase.
+
+    Redirects are not followed; the sample describes exactly one request.
+    Raises ``OSError`` (including ``ssl.SSLError`` and ``socket.timeout``)
+    or ``http.client.HTTPException`` on failure.
+    """
+    parts = urllib.parse.urlsplit(url if '://' in url else 'https://' + url)
+    https = parts.scheme == 'https'
+    host = parts.hostname
+    if not host:
+        raise ValueError(f'No host in URL: {url}')
+    port = parts.port or (443 if https else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    t_start = time.perf_counter()
+    addrs = _resolve(host, timeout)
+    t_dns = time.perf_counter()
+
+    sock, last_error = None, None
+    for addr in addrs:
+        family = socket.AF_INET6 if ':' in addr else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect((addr, port))
+            break
+        except OSError as e:
+            sock.close()
+            sock, last_error = None, e
+    if sock is None:
+        raise last_error or OSError(f'Could not resolve {host}')
+    t_connect = time.perf_counter()
+    address = sock.getpeername()[0]
+
+    try:
+        if https:
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            sock = ctx.wrap_socket(sock, server_hostname=host)
+        t_tls = time.perf_counter()
+
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conn.sock = sock
+        conn.putrequest(method, path, skip_host=True, skip_accept_encoding=True)
+        conn.putheader('Host', parts.netloc.rsplit('@', 1)[-1])
+        conn.putheader('User-Agent', USER_AGENT)
+        conn.putheader('Accept', '*/*')
+        conn.putheader('Accept-Encoding', 'identity')
+        conn.putheader('Connection', 'close')
+        conn.endheaders()
+        resp = conn.getresponse()
+        t_first = time.perf_counter()
+
+        received = 0
+        if method != 'HEAD':
+            while received < MAX_BODY:
+                chunk = resp.read(65536)
+                if not chunk:
+                    break
+                received += len(chunk)
+        t_end = time.perf_counter()
+        status, reason = resp.status, resp.reason
+    finally:
+        sock.close()
+
+    return TimingSample(
+        address=address, status=status, reason=reason, bytes=received,
+        dns_ms=_ms(t_start, t_dns),
+        connect_ms=_ms(t_dns, t_connect),
+        tls_ms=_ms(t_connect, t_tls) if https else 0.0,
+        ttfb_ms=_ms(t_tls, t_first),
+        download_ms=_ms(t_first, t_end),
+        total_ms=_ms(t_start, t_end),
+    )
+
+
+def percentile(values, pct):
+    """Linearly interpolated percentile of ``values`` (0-100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 2)
+
+
+def summarize(samples):
+    """Per-phase ``{'min', 'p50', ..., 'max', 'mean'}`` statistics for a list of samples."""
+    summary = {}
+    for phase in PHASES:
+        values = [getattr(s, phase) for s in samples]
+        if not values:
+            continue
+        stats = {'min': min(values), 'max': max(values), 'mean': round(sum(values) / len(values), 2)}
+        for pct in PERCENTILES:
+            stats[f'p{pct}'] = percentile(values, pct)
+        summary[phase] = stats
+    return summary
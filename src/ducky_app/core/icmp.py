@@ -0,0 +1,252 @@
+import os
+import time
+import heapq
+import socket
+import select
+import struct
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_TARGETS = 1024
+PAYLOAD_SIZE = 56
+UPDATE_INTERVAL = 0.25
+RESOLVE_CONCURRENCY = 32
+
+ICMP_ECHO_REQUEST, ICMP_ECHO_REPLY = 8, 0
+ICMP6_ECHO_REQUEST, ICMP6_ECHO_REPLY = 128, 129
+_HEADER = struct.Struct('!BBHHH')     # type, code, checksum, identifier, sequence
+_TIMESTAMP = struct.Struct('!d')
+
+
+def checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def open_socket(family):
+    """``(socket, is_datagram)`` for ICMP echo on ``family``.
+
+    Prefers an unprivileged datagram ICMP socket (Linux with
+    ``net.ipv4.ping_group_range`` covering the user, macOS) and falls back
+    to a raw socket, which needs root or Administrator. Raises
+    PermissionError when neither is allowed.
+    """
+    proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+    try:
+        return socket.socket(family, socket.SOCK_DGRAM, proto), True
+    except OSError:
+        pass
+    try:
+        return socket.socket(family, socket.SOCK_RAW, proto), False
+    except PermissionError:
+        raise PermissionError('Sending ICMP needs a raw socket (run as root/Administrator) or, on Linux, '
+                              'an unprivileged ping group: sysctl net.ipv4.ping_group_range="0 2147483647"') from None
+
+
+def expand_targets(text):
+    """Host names and addresses from free text; CIDR blocks expand to their hosts. Raises ValueError past MAX_TARGETS."""
+    targets = []
+    for token in text.replace(',', ' ').replace(';', ' ').split():
+        if '/' in token:
+            try:
+                network = ipaddress.ip_network(token, strict=False)
+            except ValueError:
+                raise ValueError(f'Invalid network: {token}') from None
+            if network.num_addresses > MAX_TARGETS + 2:
+                raise ValueError(f'{token} has more than {MAX_TARGETS} hosts.')
+            targets.extend(str(host) for host in (network.hosts() if network.num_addresses > 1 else [network.network_address]))
+        else:
+            targets.append(token)
+    targets = list(dict.fromkeys(targets))
+    if len(targets) > MAX_TARGETS:
+        raise ValueError(f'At most {MAX_TARGETS} targets can be pinged at once.')
+    return targets
+
+
+def resolve(targets):
+    """``[(target, address or None, error or None), ...]``, resolving names concurrently."""
+    def lookup(target):
+        try:
+            return target, str(ipaddress.ip_address(target)), None
+        except ValueError:
+            pass
+        try:
+            info = socket.getaddrinfo(target, None, proto=socket.IPPROTO_TCP)
+        except socket.gaierror as e:
+            return target, None, e.strerror or str(e)
+        # Prefer IPv4, as ping does
+        info.sort(key=lambda i: i[0] != socket.AF_INET)
+        return target, info[0][4][0], None
+
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=min(RESOLVE_CONCURRENCY, len(targets))) as pool:
+        return list(pool.map(lookup, targets))
+
+
+class TargetStats:
+    """Running round-trip statistics for one target, in milliseconds."""
+
+    __slots__ = ('target', 'address', 'sent', 'received', 'outstanding', 'last', 'min', 'max', 'total', 'jitter',
+                 'status', '_prev')
+
+    def __init__(self, target, address):
+        self.target, self.address = target, address
+        self.sent = self.received = 0
+        self.outstanding = 0          # echoes neither answered nor timed out yet
+        self.last = self.min = self.max = self.jitter = self._prev = None
+        self.total = 0.0
+        self.status = 'Waiting'
+
+    def add(self, rtt):
+        self.received += 1
+        self.outstanding -= 1
+        self.last = rtt
+        self.total += rtt
+        self.min = rtt if self.min is None else min(self.min, rtt)
+        self.max = rtt if self.max is None else max(self.max, rtt)
+        if self._prev is not None:
+            # RFC 3550 interarrival jitter: smoothed mean deviation between consecutive replies
+            delta = abs(rtt - self._prev)
+            self.jitter = delta if self.jitter is None else self.jitter + (delta - self.jitter) / 16
+        self._prev = rtt
+        self.status = 'Up'
+
+    @property
+    def avg(self):
+        return self.total / self.received if self.received else None
+
+    @property
+    def answered(self):
+        """Echoes whose fate is known: replied to, timed out or failed to send."""
+        return self.sent - self.outstanding
+
+    @property
+    def loss(self):
+        # Echoes still in flight are not lost yet, as in fping
+        return (self.answered - self.received) * 100.0 / self.answered if self.answered else None
+
+
+class Pinger:
+    """Ping many targets concurrently from one thread, fping-style.
+
+    One ICMP socket per address family carries every target's echoes;
+    sends are staggered across the interval and replies are matched on
+    sequence number and source address, so hundreds of targets cost a
+    single ``select`` loop.
+    """
+
+    def __init__(self, targets, interval=1.0, timeout=2.0, count=0, size=PAYLOAD_SIZE):
+        self.stats = [TargetStats(t, a) for t, a in targets]
+        self.interval = max(interval, 0.01)
+        self.timeout = timeout
+        self.count = count            # 0 pings until cancelled
+        self.size = max(size, _TIMESTAMP.size)
+        self.identifier = os.getpid() & 0xffff
+        self._sockets = {}
+        self._seq = 0
+        self._pending = {}            # sequence -> (stats, send time)
+
+    def _socket(self, family):
+        if family not in self._sockets:
+            sock, dgram = open_socket(family)
+            sock.setblocking(False)
+            self._sockets[family] = (sock, dgram)
+        return self._sockets[family]
+
+    def _packet(self, family, seq):
+        kind = ICMP_ECHO_REQUEST if family == socket.AF_INET else ICMP6_ECHO_REQUEST
+        payload = _TIMESTAMP.pack(time.time()) + b'Q' * (self.size - _TIMESTAMP.size)
+        # The kernel fills in the ICMPv6 checksum, and the identifier on datagram sockets
+        header = _HEADER.pack(kind, 0, 0, self.identifier, seq)
+        if family == socket.AF_INET:
+            header = _HEADER.pack(kind, 0, checksum(header + payload), self.identifier, seq)
+        return header + payload
+
+    def _send(self, stats, now):
+        family = socket.AF_INET6 if ':' in stats.address else socket.AF_INET
+        sock, _dgram = self._socket(family)
+        self._seq = (self._seq + 1) & 0xffff
+        stale = self._pending.pop(self._seq, None)
+        if stale:     # the sequence space wrapped before this echo timed out
+            stale[0].outstanding -= 1
+        stats.sent += 1
+        try:
+            sock.sendto(self._packet(family, self._seq), (stats.address, 0))
+        except OSError as e:
+            stats.status = e.strerror or str(e)
+            return
+        stats.outstanding += 1
+        self._pending[self._seq] = (stats, now)
+
+    def _receive(self, sock, dgram, family):
+        while True:
+            try:
+                data, source = sock.recvfrom(65535)
+            except OSError:     # includes BlockingIOError once the queue is drained
+                return
+            now = time.perf_counter()
+            if family == socket.AF_INET and data and data[0] >> 4 == 4:
+                # Raw IPv4 sockets, and datagram ones on macOS, include the IP header; ICMP types never have 4 there
+                data = data[(data[0] & 0x0f) * 4:]
+            if len(data) < _HEADER.size:
+                continue
+            kind, _code, _sum, ident, seq = _HEADER.unpack_from(data)
+            if kind != (ICMP_ECHO_REPLY if family == socket.AF_INET else ICMP6_ECHO_REPLY):
+                continue
+            if not dgram and ident != self.identifier:
+                continue    # another process's ping on the shared raw socket
+            entry = self._pending.get(seq)
+            if entry is None or ipaddress.ip_address(source[0].split('%')[0]) != ipaddress.ip_address(entry[0].address):
+                continue
+            del self._pending[seq]
+            entry[0].add((now - entry[1]) * 1000.0)
+
+    def run(self, on_update=None, cancelled=lambda: False):
+        """Ping until every target has sent ``count`` echoes (or forever when 0) or ``cancelled()`` is true.
+
+        ``on_update(stats)`` receives every target's :class:`TargetStats`
+        a few times a second. Raises PermissionError if no ICMP socket can
+        be opened.
+        """
+        for family in {socket.AF_INET6 if ':' in s.address else socket.AF_INET for s in self.stats}:
+            self._socket(family)
+        start = time.perf_counter()
+        schedule = [(start + i * self.interval / len(self.stats), i) for i in range(len(self.stats))]
+        heapq.heapify(schedule)
+        last_update = 0.0
+        try:
+            while not cancelled() and (schedule or self._pending):
+                now = time.perf_counter()
+                while schedule and schedule[0][0] <= now:
+                    _due, i = heapq.heappop(schedule)
+                    stats = self.stats[i]
+                    self._send(stats, now)
+                    if not self.count or stats.sent < self.count:
+                        heapq.heappush(schedule, (_due + self.interval, i))
+                for seq, (stats, sent_at) in list(self._pending.items()):
+                    if now - sent_at > self.timeout:
+                        del self._pending[seq]
+                        stats.outstanding -= 1
+                        stats.status, stats.last = 'Timeout', None
+                wake = schedule[0][0] if schedule else now + UPDATE_INTERVAL
+                readable, _, _ = select.select([s for s, _ in self._sockets.values()], [], [],
+                                               max(0.0, min(wake - now, UPDATE_INTERVAL)))
+                for family, (sock, dgram) in self._sockets.items():
+                    if sock in readable:
+                        self._receive(sock, dgram, family)
+                now = time.perf_counter()
+                if on_update and now - last_update >= UPDATE_INTERVAL:
+                    on_update(self.stats)
+                    last_update = now
+            if on_update:
+                on_update(self.stats)
+        finally:
+            for sock, _dgram in self._sockets.values():
+                sock.close()
+            self._sockets.clear()
+        return self.stats
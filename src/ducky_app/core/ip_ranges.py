@@ -0,0 +1,351 @@
+import io
+import os
+import re
+import sys
+import time
+import gzip
+import mmap
+import struct
+import bisect
+import ipaddress
+import threading
+from array import array
+from ducky_app.core.config_manager import app_data_dir
+
+INDEX_NAME = 'ip_ranges.idx'
+_INDEX_RE = re.compile(r'^ip_ranges(?:\.(\d+))?\.idx$')   # ip_ranges.<generation>.idx; the bare name is generation 0
+
+_MAGIC = b'DUCKIPR2'
+_HEADER = struct.Struct('<8sIIII')  # magic, v4 ranges, v6 ranges, distinct records, names blob size
+_ASN_RE = re.compile(r'^(?:AS)?(\d{1,10})$', re.IGNORECASE)
+_CC_RE = re.compile(r'^[A-Z]{2}$')
+# A bracketed IPv6 address (``[2001:db8::1]:443``) or a bare run of address characters
+_IP_TOKEN_RE = re.compile(r'\[([0-9A-Fa-f:.]{2,45})\]|([0-9A-Fa-f:.]{2,51})')
+_V4_PORT_RE = re.compile(r'^(\d{1,3}(?:\.\d{1,3}){3}):\d{1,5}$')
+_MASK64 = (1 << 64) - 1
+
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def _split(line):
+    if '\t' in line:
+        return [p.strip() for p in line.split('\t')]
+    parts, field, quoted = [], [], False
+    for ch in line:
+        if ch == '"':
+            quoted = not quoted
+        elif ch == ',' and not quoted:
+            parts.append(''.join(field).strip())
+            field = []
+        else:
+            field.append(ch)
+    parts.append(''.join(field).strip())
+    return parts
+
+
+def parse_range_line(line):
+    """Parse one dataset row into ``(version, first, last, asn, country, name)``, or None.
+
+    Accepts ``start,end,...`` and ``cidr,...`` rows, tab or comma separated
+    (iptoasn.com TSV, DB-IP/GeoLite-style CSV exports). The remaining
+    columns are classified by shape: ``AS123``/``123`` is the ASN, a
+    two-letter code the country, anything else the organization name.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    parts = _split(line)
+    try:
+        if '/' in parts[0]:
+            net = ipaddress.ip_network(parts[0], strict=False)
+            first, last, rest = net.network_address, net.broadcast_address, parts[1:]
+        else:
+            first, last, rest = ipaddress.ip_address(parts[0]), ipaddress.ip_address(parts[1]), parts[2:]
+    except (ValueError, IndexError):
+        return None
+    if first.version != last.version or last < first:
+        return None
+    asn, country, name = 0, '', ''
+    for field in rest:
+        if not field:
+            continue
+        if not asn and (m := _ASN_RE.match(field)):
+            asn = int(m.group(1))
+        elif not country and _CC_RE.match(field):
+            country = field
+        elif not name and field.lower() not in ('none', 'not routed', '-'):
+            name = field
+    return first.version, int(first), int(last), asn, country, name
+
+
+def flatten_ranges(ranges):
+    """Split ``(first, last, rid)`` ranges into sorted, disjoint segments owned by the innermost range.
+
+    Returns ``(first, last, rid, range_first, range_last)`` tuples, the
+    last two being the bounds of the dataset range the segment came from.
+    A sweep keeps the ranges open at the current address on a stack,
+    innermost on top: a nested block splits its parent into the part
+    before it, itself and the part after it, so a bisect over segment
+    starts always lands on the most specific match.
+    """
+    segments, stack, pos = [], [], 0     # stack: (last, rid, first) of the open ranges
+
+    def emit(first, last, rid, origin):
+        if first > last:
+            return
+        prev = segments[-1] if segments else None
+        if prev and prev[1] + 1 == first and prev[2] == rid and prev[3:] == origin:
+            segments[-1] = (prev[0], last, rid) + origin
+        else:
+            segments.append((first, last, rid) + origin)
+
+    def close_until(limit):
+        nonlocal pos
+        while stack and stack[-1][0] < limit:
+            last, rid, first = stack.pop()
+            emit(pos, last, rid, (first, last))
+            pos = last + 1
+            while stack and stack[-1][0] < pos:     # already covered by what was just emitted
+                stack.pop()
+
+    # Outer ranges first when two start together, so the inner one ends up on top
+    for first, last, rid in sorted(ranges, key=lambda r: (r[0], -r[1])):
+        close_until(first)
+        if stack:
+            emit(pos, first - 1, stack[-1][1], (stack[-1][2], stack[-1][0]))
+        stack.append((last, rid, first))
+        pos = first
+    close_until(float('inf'))
+    return segments
+
+
+def compile_index(paths, path, progress=None):
+    """Build the range index at ``path`` from dataset files (optionally gzipped). Returns segment counts.
+
+    Overlapping ranges are flattened with :func:`flatten_ranges` first.
+    Layout (little-endian, 8-byte aligned): header; IPv6 segment
+    start/end and source range start/end as hi/lo uint64 arrays; the same
+    four for IPv4 as uint32 arrays; per-segment record ids; per-record
+    ASN, name offset and country code; names blob.
+    """
+    v4, v6, records, record_ids = [], [], [], {}
+    for source in paths:
+        with _open_text(source) as f:
+            for n, line in enumerate(f):
+                row = parse_range_line(line)
+                if row is None:
+                    continue
+                version, first, last, asn, country, name = row
+                rid = record_ids.setdefault((asn, country, name), len(records))
+                if rid == len(records):
+                    records.append((asn, country, name))
+                (v4 if version == 4 else v6).append((first, last, rid))
+                if progress and n % 200000 == 0 and n:
+                    progress(f'Read {n} rows from {os.path.basename(source)}…')
+    v4, v6 = flatten_ranges(v4), flatten_ranges(v6)
+    names, name_offsets, blob = {}, array('I'), bytearray()
+    asns, countries = array('I'), bytearray()
+    for asn, country, name in records:
+        if name not in names:
+            names[name] = len(blob)
+            blob += name.encode('utf-8') + b'\n'
+        asns.append(asn)
+        name_offsets.append(names[name])
+        countries += (country or '--').encode('ascii', errors='replace')[:2]
+
+    arrays = []
+    for column in (0, 1, 3, 4):
+        arrays += [array('Q', (r[column] >> 64 for r in v6)), array('Q', (r[column] & _MASK64 for r in v6))]
+    arrays += [array('I', (r[column] for r in v4)) for column in (0, 1, 3, 4)]
+    arrays += [array('I', (r[2] for r in v4)), array('I', (r[2] for r in v6)), asns, name_offsets]
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(v4), len(v6), len(records), len(blob)))
+        for arr in arrays:
+            if sys.byteorder == 'big':
+                arr.byteswap()
+            f.write(arr.tobytes())
+        f.write(countries)
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(v4), len(v6)
+
+
+class _Wide:
+    """Read-only sequence of 128-bit integers stored as hi/lo uint64 arrays, for :mod:`bisect`."""
+
+    def __init__(self, hi, lo):
+        self.hi, self.lo = hi, lo
+
+    def __len__(self):
+        return len(self.hi)
+
+    def __getitem__(self, i):
+        return (self.hi[i] << 64) | self.lo[i]
+
+
+class IpRangeDatabase:
+    """Memory-mapped, sorted-interval IP range index with bisect lookup."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n4, n6, nrec, blob_size = _HEADER.unpack_from(self._map, 0)
+        expected = _HEADER.size + n6 * 64 + n4 * 20 + n6 * 4 + nrec * 10 + blob_size
+        if magic != _MAGIC or expected != len(self._map):
+            self._map.close()
+            raise ValueError(f'{path} is not a valid IP range index.')
+        self.v4_count, self.v6_count, self.record_count = n4, n6, nrec
+        self._view = memoryview(self._map)
+        self._views = []
+        pos = _HEADER.size
+
+        def take(fmt, count):
+            nonlocal pos
+            size = array(fmt).itemsize * count
+            raw = self._view[pos:pos + size]
+            pos += size
+            if sys.byteorder == 'little':
+                view = raw.cast(fmt)
+                self._views.append(view)
+                return view
+            arr = array(fmt, raw)
+            arr.byteswap()
+            return arr
+
+        self._v6_start = _Wide(take('Q', n6), take('Q', n6))
+        self._v6_end = _Wide(take('Q', n6), take('Q', n6))
+        self._v6_first = _Wide(take('Q', n6), take('Q', n6))
+        self._v6_last = _Wide(take('Q', n6), take('Q', n6))
+        self._v4_start = take('I', n4)
+        self._v4_end = take('I', n4)
+        self._v4_first = take('I', n4)
+        self._v4_last = take('I', n4)
+        self._v4_rec = take('I', n4)
+        self._v6_rec = take('I', n6)
+        self._asn = take('I', nrec)
+        self._name_off = take('I', nrec)
+        self._cc_start = pos
+        self._blob_start = pos + nrec * 2
+        self.built = os.path.getmtime(path)
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._view.release()
+        self._map.close()
+
+    def _record(self, rid, first, last, version):
+        start = self._blob_start + self._name_off[rid]
+        name = self._map[start:self._map.find(b'\n', start)].decode('utf-8', errors='replace')
+        cc = self._map[self._cc_start + rid * 2:self._cc_start + rid * 2 + 2].decode('ascii')
+        address = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+        return {
+            'asn': self._asn[rid] or None,
+            'country': '' if cc == '--' else cc,
+            'name': name,
+            'range': f'{address(first)} - {address(last)}',
+        }
+
+    def lookup(self, ip):
+        """Record for the most specific range containing ``ip``, or None. Raises ValueError on bad input."""
+        addr = ipaddress.ip_address(ip.strip() if isinstance(ip, str) else ip)
+        if isinstance(addr, ipaddress.IPv6Address) and addr.ipv4_mapped:
+            addr = addr.ipv4_mapped
+        value = int(addr)
+        if addr.version == 4:
+            starts, ends, recs, firsts, lasts = self._v4_start, self._v4_end, self._v4_rec, self._v4_first, self._v4_last
+        else:
+            starts, ends, recs, firsts, lasts = self._v6_start, self._v6_end, self._v6_rec, self._v6_first, self._v6_last
+        # Segments are disjoint, so the one starting at or before ``value`` is the only candidate
+        i = bisect.bisect_right(starts, value) - 1
+        if i < 0 or ends[i] < value:
+            return None
+        return self._record(recs[i], firsts[i], lasts[i], addr.version)
+
+    def lookup_many(self, ips):
+        """``{ip: record or None}``; invalid addresses are skipped."""
+        results = {}
+        for ip in ips:
+            try:
+                results[ip] = self.lookup(ip)
+            except ValueError:
+                continue
+        return results
+
+
+def extract_addresses(text):
+    """Every valid IPv4/IPv6 address in ``text`` (scan output, ARP tables, logs), de-duplicated in order.
+
+    ``host:port`` forms are understood: ``10.0.0.5:51234`` and ``[2001:db8::1]:443``.
+    """
+    found = {}
+    for bracketed, bare in _IP_TOKEN_RE.findall(text):
+        # Keep a leading or trailing ``::`` if that parses (``::ffff:10.1.2.3``), else drop punctuation around the token
+        for token in ([bracketed] if bracketed else [bare.strip('.'), bare.strip('.:')]):
+            if m := _V4_PORT_RE.match(token):
+                token = m.group(1)
+            try:
+                found.setdefault(str(ipaddress.ip_address(token)), None)
+                break
+            except ValueError:
+                continue
+    return list(found)
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def _index_files():
+    """``[(generation, path)]`` of the installed indexes, oldest first."""
+    folder = app_data_dir('ipdb')
+    found = [(int(m.group(1) or 0), os.path.join(folder, name))
+             for name in os.listdir(folder) if (m := _INDEX_RE.match(name))]
+    return sorted(found)
+
+
+def index_path():
+    """The newest installed index (which may not exist yet)."""
+    files = _index_files()
+    return files[-1][1] if files else os.path.join(app_data_dir('ipdb'), INDEX_NAME)
+
+
+def get_database():
+    """The installed :class:`IpRangeDatabase`, or None if no dataset has been loaded yet."""
+    global _database
+    with _database_lock:
+        if _database is None:
+            try:
+                _database = IpRangeDatabase(index_path())
+            except (OSError, ValueError):
+                return None
+        return _database
+
+
+def install(paths, progress=None):
+    """Compile dataset files into a new index and switch lookups to it. Returns ``(v4, v6)`` counts.
+
+    As with the OUI index, each install is a new generation, so lookups
+    still running on the previous :class:`IpRangeDatabase` keep a valid
+    map until they drop it; superseded files are removed once unmapped.
+    """
+    global _database
+    path = os.path.join(app_data_dir('ipdb'), f'ip_ranges.{time.time_ns()}.idx')
+    counts = compile_index(paths, path, progress)
+    database = IpRangeDatabase(path)
+    with _database_lock:
+        _database = database
+    for _generation, old in _index_files():
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return counts
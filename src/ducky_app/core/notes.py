@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+# format: (scratchpad file name, label); Markdown and plain text keep the note as source text
+NOTE_FORMATS = {
+    'html': ('scratchpad.html', 'Rich text (HTML)'),
+    'markdown': ('scratchpad.md', 'Markdown'),
+    'text': ('scratchpad.txt', 'Plain text'),
+}
+DEFAULT_FORMAT = 'html'
+
+
+def note_path(folder, fmt):
+    return os.path.join(folder, NOTE_FORMATS.get(fmt, NOTE_FORMATS[DEFAULT_FORMAT])[0])
+
+
+def format_for_path(path):
+    """Storage format implied by a file name's extension (``.md``, ``.txt``, otherwise HTML)."""
+    ext = os.path.splitext(path)[1].lower()
+    return {'.md': 'markdown', '.markdown': 'markdown', '.txt': 'text'}.get(ext, 'html')
+
+
+def write_note(path, text):
+    """Write ``text`` to ``path`` atomically: a crash mid-save leaves the previous version intact."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=folder)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,229 @@
+import io
+import os
+import re
+import csv
+import sys
+import mmap
+import time
+import struct
+import bisect
+import threading
+from array import array
+from ducky_app.core import http_session
+from ducky_app.core.config_manager import app_data_dir
+
+# IEEE registries: MA-L (/24), MA-M (/28) and MA-S (/36) assignments
+REGISTRY_URLS = (
+    'https://standards-oui.ieee.org/oui/oui.csv',
+    'https://standards-oui.ieee.org/oui28/mam.csv',
+    'https://standards-oui.ieee.org/oui36/oui36.csv',
+)
+PREFIX_LENGTHS = (36, 28, 24)
+INDEX_NAME = 'oui.idx'
+_INDEX_RE = re.compile(r'^oui(?:\.(\d+))?\.idx$')   # oui.<generation>.idx; the bare name is generation 0
+
+_MAGIC = b'DUCKOUI1'
+_HEADER = struct.Struct('<8sII')  # magic, entry count, names blob size
+
+
+def parse_mac(text):
+    """48-bit integer for a MAC in any common notation; a bare OUI is zero-padded."""
+    digits = ''.join(ch for ch in text if ch not in ':-. \t').upper()
+    if len(digits) < 6 or len(digits) > 12 or any(ch not in '0123456789ABCDEF' for ch in digits):
+        raise ValueError(f'Invalid MAC address: {text}')
+    return int(digits.ljust(12, '0'), 16)
+
+
+def format_prefix(value, length):
+    """``00:1A:2B`` for a /24, ``00:1A:2B:C`` for a /28, ``00:1A:2B:CD:E`` for a /36."""
+    digits = f'{value:012X}'[:length // 4]
+    return ':'.join(digits[i:i + 2] for i in range(0, len(digits), 2))
+
+
+def is_locally_administered(value):
+    return bool((value >> 40) & 0x02)
+
+
+def _key(value, length):
+    masked = (value >> (48 - length)) << (48 - length)
+    return (masked << 8) | length
+
+
+def _iter_registry_rows(text):
+    """``(prefix_value, length, organization)`` rows from an IEEE registry CSV."""
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if not header or 'Assignment' not in header:
+        raise ValueError('Not an IEEE registry CSV (missing "Assignment" column).')
+    col_assignment = header.index('Assignment')
+    col_org = header.index('Organization Name')
+    for row in reader:
+        if len(row) <= max(col_assignment, col_org):
+            continue
+        assignment = row[col_assignment].strip().upper()
+        try:
+            prefix = int(assignment, 16)
+        except ValueError:
+            continue
+        length = len(assignment) * 4
+        if length not in PREFIX_LENGTHS:
+            continue
+        yield prefix << (48 - length), length, ' '.join(row[col_org].split())
+
+
+def compile_index(csv_texts, path):
+    """Build the binary index at ``path`` from IEEE registry CSV texts. Returns the entry count.
+
+    Layout (little-endian): header, ``count`` sorted uint64 keys
+    (``prefix << 8 | length``), ``count`` uint32 offsets into a blob of
+    newline-terminated, de-duplicated organization names.
+    """
+    entries = {}
+    for text in csv_texts:
+        for value, length, org in _iter_registry_rows(text):
+            entries[_key(value, length)] = org
+    keys = array('Q', sorted(entries))
+    names, offsets, blob = {}, array('I'), bytearray()
+    for key in keys:
+        org = entries[key]
+        if org not in names:
+            names[org] = len(blob)
+            blob += org.encode('utf-8') + b'\n'
+        offsets.append(names[org])
+    if sys.byteorder == 'big':
+        keys.byteswap()
+        offsets.byteswap()
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(keys), len(blob)))
+        f.write(keys.tobytes())
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(keys)
+
+
+class OuiDatabase:
+    """Memory-mapped OUI index with longest-prefix (MA-S, then MA-M, then MA-L) lookup."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, blob_size = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or _HEADER.size + count * 12 + blob_size != len(self._map):
+            self._map.close()
+            raise ValueError(f'{path} is not a valid OUI index.')
+        self.count = count
+        self._view = view = memoryview(self._map)
+        keys_end = _HEADER.size + count * 8
+        if sys.byteorder == 'little':
+            self._keys = view[_HEADER.size:keys_end].cast('Q')
+            self._offsets = view[keys_end:keys_end + count * 4].cast('I')
+        else:
+            self._keys = array('Q', view[_HEADER.size:keys_end])
+            self._offsets = array('I', view[keys_end:keys_end + count * 4])
+            self._keys.byteswap()
+            self._offsets.byteswap()
+        self._blob_start = keys_end + count * 4
+        self.built = os.path.getmtime(path)
+
+    def close(self):
+        for view in (self._keys, self._offsets, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._keys, self._offsets = array('Q'), array('I')
+        self.count = 0
+        self._map.close()
+
+    def _name(self, index):
+        start = self._blob_start + self._offsets[index]
+        end = self._map.find(b'\n', start)
+        return self._map[start:end].decode('utf-8', errors='replace')
+
+    def lookup_value(self, value):
+        """``(organization, prefix, length)`` for a 48-bit MAC value, or None."""
+        for length in PREFIX_LENGTHS:
+            key = _key(value, length)
+            i = bisect.bisect_left(self._keys, key)
+            if i < self.count and self._keys[i] == key:
+                return self._name(i), format_prefix(value, length), length
+        return None
+
+    def lookup(self, mac):
+        return self.lookup_value(parse_mac(mac))
+
+    def vendor(self, mac, default=''):
+        """Short vendor label for display; never raises."""
+        try:
+            value = parse_mac(mac)
+        except ValueError:
+            return default
+        match = self.lookup_value(value)
+        if match:
+            return match[0]
+        return 'Locally administered' if is_locally_administered(value) else default
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def _index_files():
+    """``[(generation, path)]`` of the installed indexes, oldest first."""
+    folder = app_data_dir('oui')
+    found = [(int(m.group(1) or 0), os.path.join(folder, name))
+             for name in os.listdir(folder) if (m := _INDEX_RE.match(name))]
+    return sorted(found)
+
+
+def index_path():
+    """The newest installed index (which may not exist yet)."""
+    files = _index_files()
+    return files[-1][1] if files else os.path.join(app_data_dir('oui'), INDEX_NAME)
+
+
+def get_database():
+    """The installed :class:`OuiDatabase`, or None if no registry has been imported yet."""
+    global _database
+    with _database_lock:
+        if _database is None:
+            try:
+                _database = OuiDatabase(index_path())
+            except (OSError, ValueError):
+                return None
+        return _database
+
+
+def install(csv_texts):
+    """Compile registry CSVs into a new index and switch lookups to it. Returns the entry count.
+
+    Every install writes a new generation rather than rewriting the
+    mapped file, so threads still looking up in the previous
+    :class:`OuiDatabase` keep a valid map; it is unmapped once the last
+    of them drops it. Older generations are removed when no longer
+    mapped (on Windows, by a later install).
+    """
+    global _database
+    path = os.path.join(app_data_dir('oui'), f'oui.{time.time_ns()}.idx')
+    count = compile_index(csv_texts, path)
+    database = OuiDatabase(path)
+    with _database_lock:
+        _database = database
+    for _generation, old in _index_files():
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return count
+
+
+def download(timeout=60):
+    """Fetch the current IEEE MA-L/MA-M/MA-S registries and install them."""
+    texts = []
+    for url in REGISTRY_URLS:
+        resp = http_session.get(url, timeout=timeout)
+        resp.raise_for_status()
+        texts.append(resp.content.decode('utf-8', errors='replace'))
+    return install(texts)
@@ -0,0 +1,109 @@
+import os
+import statistics
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from zxcvbn import zxcvbn
+
+# zxcvbn's matching is super-linear in length; anything past this is strong regardless
+MAX_ANALYZED_LENGTH = 100
+BATCH_SIZE = 500
+IN_FLIGHT_PER_WORKER = 2
+SCORE_LABELS = ("Very Weak", "Weak", "Fair", "Strong", "Very Strong")
+LENGTH_BUCKETS = ((0, 7, "1-7"), (8, 11, "8-11"), (12, 15, "12-15"), (16, None, "16+"))
+# Offline slow hashing (1e4 guesses/s), as in the single-password report
+CRACK_TIME_BUCKETS = ((1e4 * 60, "under a minute"), (1e4 * 3600, "under an hour"), (1e4 * 86400, "under a day"),
+                      (1e4 * 86400 * 365, "under a year"), (1e4 * 86400 * 365 * 100, "under a century"),
+                      (float('inf'), "centuries"))
+
+
+def analyze(password):
+    """zxcvbn strength report for one password, reduced to plain values."""
+    results = zxcvbn(password[:MAX_ANALYZED_LENGTH])
+    return {
+        'score': results['score'],
+        'guesses_log10': results['guesses_log10'],
+        'crack_time': results['crack_times_display']['offline_slow_hashing_1e4_per_second'],
+        'warning': results['feedback']['warning'],
+        'suggestions': list(results['feedback']['suggestions']),
+        'truncated': len(password) > MAX_ANALYZED_LENGTH,
+    }
+
+
+def _score_batch(passwords):
+    # Only the fields the summary needs cross the process boundary
+    results = []
+    for password in passwords:
+        r = zxcvbn(password[:MAX_ANALYZED_LENGTH])
+        results.append((password, r['score'], r['guesses_log10'], r['feedback']['warning']))
+    return results
+
+
+def _crack_time_bucket(guesses_log10):
+    guesses = 10 ** min(guesses_log10, 300)
+    return next(label for limit, label in CRACK_TIME_BUCKETS if guesses < limit)
+
+
+def read_passwords(path):
+    """One password per line; blank lines are skipped, surrounding whitespace is kept except the newline."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return [line.rstrip('\r\n') for line in f if line.strip()]
+
+
+def audit(passwords, progress=None, cancelled=lambda: False, workers=None):
+    """Score every distinct password on a process pool and summarise the distribution.
+
+    Returns a dict with totals, ``scores`` (count per zxcvbn score),
+    ``lengths`` and ``crack_times`` buckets, the median ``guesses_log10``,
+    the most common ``warnings`` and the most ``reused`` passwords, or
+    None if cancelled. ``progress(done, total)`` counts distinct passwords.
+    """
+    counts = Counter(passwords)
+    unique = list(counts)
+    workers = workers or os.cpu_count() or 1
+    batches = iter([unique[i:i + BATCH_SIZE] for i in range(0, len(unique), BATCH_SIZE)])
+    scores, lengths, crack_times, warnings, guesses = Counter(), Counter(), Counter(), Counter(), []
+    done = 0
+    # Spawned workers never inherit the GUI process's threads or Qt state
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        pending = set()
+
+        def submit():
+            while not cancelled() and len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                batch = next(batches, None)
+                if batch is None:
+                    return
+                pending.add(pool.submit(_score_batch, batch))
+
+        submit()
+        while pending and not cancelled():
+            completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                for password, score, guesses_log10, warning in future.result():
+                    n = counts[password]
+                    scores[score] += n
+                    crack_times[_crack_time_bucket(guesses_log10)] += n
+                    lengths[next(label for low, high, label in LENGTH_BUCKETS
+                                 if len(password) >= low and (high is None or len(password) <= high))] += n
+                    if warning:
+                        warnings[warning] += n
+                    guesses.extend([guesses_log10] * n)
+                    done += 1
+            if progress:
+                progress(done, len(unique))
+            submit()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    if cancelled():
+        return None
+    return {
+        'total': len(passwords),
+        'unique': len(unique),
+        'scores': [scores[s] for s in range(len(SCORE_LABELS))],
+        'lengths': [(label, lengths[label]) for _low, _high, label in LENGTH_BUCKETS],
+        'crack_times': [(label, crack_times[label]) for _limit, label in CRACK_TIME_BUCKETS],
+        'median_guesses_log10': statistics.median(guesses) if guesses else 0.0,
+        'warnings': warnings.most_common(10),
+        'reused': [(p, n) for p, n in counts.most_common(10) if n > 1],
+    }
@@ -0,0 +1,172 @@
+import ssl
+import ipaddress
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ducky_app.core import tls_inventory, x509
+from ducky_app.core.dns_cache import shared_cache as dns_cache
+
+PROTOCOLS = (
+    ('TLSv1', ssl.TLSVersion.TLSv1),
+    ('TLSv1.1', ssl.TLSVersion.TLSv1_1),
+    ('TLSv1.2', ssl.TLSVersion.TLSv1_2),
+    ('TLSv1.3', ssl.TLSVersion.TLSv1_3),
+)
+DEPRECATED_PROTOCOLS = ('TLSv1', 'TLSv1.1')
+# Minimum protocol OpenSSL reports for a suite -> rank, to know which suites a version may offer
+_PROTOCOL_RANK = {'SSLv3': 0, 'TLSv1': 1, 'TLSv1.0': 1, 'TLSv1.1': 2, 'TLSv1.2': 3, 'TLSv1.3': 4}
+MAX_PARALLEL = 16
+TIMEOUT = 5.0
+
+
+class HandshakeFailed(Exception):
+    """The server refused the offered protocol/cipher (as opposed to being unreachable)."""
+
+
+def _context(version, cipher=None):
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    ctx.set_ciphers(f'{cipher or "ALL:COMPLEMENTOFALL"}:@SECLEVEL=0')
+    ctx.minimum_version = version
+    ctx.maximum_version = version
+    return ctx
+
+
+def _handshake(host, port, ctx, timeout=TIMEOUT):
+    """Return ``(protocol, cipher_name, leaf_der)``; raise :class:`HandshakeFailed` on a refusal."""
+    try:
+        server_name = None if ipaddress.ip_address(host) else host
+    except ValueError:
+        server_name = host
+    with dns_cache.create_connection(host, port, timeout=timeout) as raw:
+        try:
+            with ctx.wrap_socket(raw, server_hostname=server_name) as tls:
+                return tls.version(), tls.cipher()[0], tls.getpeercert(binary_form=True)
+        except (ssl.SSLError, ConnectionResetError) as e:
+            raise HandshakeFailed(str(e)) from None
+
+
+def local_suites():
+    """Cipher suites this OpenSSL build can offer, minus PSK/SRP suites that need shared secrets."""
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.set_ciphers('ALL:COMPLEMENTOFALL:@SECLEVEL=0')
+    return [c for c in ctx.get_ciphers()
+            if c['auth'] not in ('auth-psk', 'auth-srp') and 'psk' not in c['kea'] and 'srp' not in c['kea']]
+
+
+def grade(suite):
+    """Classify an OpenSSL cipher description as insecure / weak / ok / strong."""
+    name, symmetric = suite['name'], (suite.get('symmetric') or '').lower()
+    if (suite.get('strength_bits') or 0) < 112 or suite['auth'] == 'auth-null' or not symmetric \
+            or 'rc4' in symmetric or symmetric.startswith('des-') or 'NULL' in name or 'EXP' in name:
+        return 'insecure'
+    if '3des' in symmetric or 'des-ede' in symmetric or suite['kea'] == 'kx-rsa':
+        return 'weak'
+    return 'strong' if suite.get('aead') else 'ok'
+
+
+class TlsEnumerator:
+    """Enumerate the protocol versions and cipher suites an endpoint accepts.
+
+    Each candidate is tested with its own handshake on a context pinned to
+    one protocol version (and, below TLS 1.3, one cipher suite); up to
+    ``max_parallel`` handshakes run against the endpoint at once.
+    Results are memoized in the TLS inventory database per (host, port)
+    together with the leaf certificate fingerprint, and only re-tested when
+    the certificate changes or a re-test is forced.
+
+    Python cannot restrict the TLS 1.3 suites a client offers, so for TLS
+    1.3 only the suite the server picks is reported.
+    """
+
+    def __init__(self, max_parallel=MAX_PARALLEL, timeout=TIMEOUT, inventory=None):
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self.inventory = inventory or tls_inventory.get_inventory()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _try(self, host, port, version, cipher=None):
+        """``(accepted, negotiated_cipher)``; ``accepted`` is None if the handshake couldn't be attempted."""
+        if self._cancelled.is_set():
+            return None, None
+        try:
+            ctx = _context(version, cipher)
+        except (ValueError, ssl.SSLError):
+            return None, None
+        try:
+            _protocol, negotiated, _der = _handshake(host, port, ctx, self.timeout)
+            return True, negotiated
+        except HandshakeFailed:
+            return False, None
+        except OSError:
+            return None, None
+
+    def enumerate(self, host, port, use_cache=True, progress=None):
+        """Return the enumeration for ``host:port`` as a dict; ``cached`` tells whether it was reused."""
+        probe = tls_inventory.probe(host, port, self.timeout, self.timeout)
+        if probe['error'] and not probe['chain']:
+            raise ConnectionError(probe['error'])
+        self.inventory.record([probe])
+        leaf = x509.parse_certificate(probe['chain'][0])['sha256'] if probe['chain'] else None
+
+        stored = self.inventory.enumeration(host, port) if use_cache else None
+        if stored and stored[0] == leaf:
+            result = stored[2]
+            result.update(cached=True, scanned_at=stored[1])
+            return result
+
+        suites = {s['name']: s for s in local_suites()}
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            if progress:
+                progress(f'Testing {len(PROTOCOLS)} protocol versions on {host}:{port}…')
+            proto_futures = {name: pool.submit(self._try, host, port, version) for name, version in PROTOCOLS}
+            protocols, tls13_suite = {}, None
+            for name, future in proto_futures.items():
+                accepted, negotiated = future.result()
+                protocols[name] = accepted
+                if name == 'TLSv1.3' and accepted:
+                    tls13_suite = negotiated
+
+            jobs = []
+            for name, version in PROTOCOLS:
+                if name == 'TLSv1.3' or not protocols.get(name):
+                    continue
+                rank = _PROTOCOL_RANK[name]
+                for suite in suites.values():
+                    if _PROTOCOL_RANK.get(suite['protocol'], 9) <= rank:
+                        jobs.append((name, suite['name'], pool.submit(self._try, host, port, version, suite['name'])))
+            if progress and jobs:
+                progress(f'Testing {len(jobs)} protocol/cipher combinations on {host}:{port}…')
+            accepted_suites = {}
+            for protocol, suite_name, future in jobs:
+                accepted, _negotiated = future.result()
+                if accepted:
+                    accepted_suites.setdefault(suite_name, []).append(protocol)
+
+        ciphers = []
+        for suite_name, versions in accepted_suites.items():
+            suite = suites[suite_name]
+            ciphers.append({'name': suite_name, 'protocols': versions, 'bits': suite['strength_bits'],
+                            'kex': suite['kea'].replace('kx-', ''), 'grade': grade(suite)})
+        if tls13_suite:
+            # Every TLS 1.3 suite is AEAD with forward secrecy
+            ciphers.append({'name': tls13_suite, 'protocols': ['TLSv1.3'],
+                            'bits': suites.get(tls13_suite, {}).get('strength_bits'), 'kex': 'any', 'grade': 'strong'})
+        order = {'insecure': 0, 'weak': 1, 'ok': 2, 'strong': 3}
+        ciphers.sort(key=lambda c: (order[c['grade']], c['name']))
+
+        result = {
+            'host': host, 'port': port, 'leaf_sha256': leaf,
+            'protocols': protocols,
+            'ciphers': ciphers,
+            'handshakes': len(PROTOCOLS) + len(jobs),
+            'suites_tested': len(suites),
+            'incomplete': self._cancelled.is_set(),
+        }
+        if not self._cancelled.is_set():
+            self.inventory.store_enumeration(host, port, leaf, result)
+        result['cached'] = False
+        return result
@@ -0,0 +1,280 @@
+import os
+import ssl
+import json
+import time
+import socket
+import sqlite3
+import datetime
+import ipaddress
+import threading
+from ducky_app.core import dnsbl, x509
+from ducky_app.core.config_manager import app_data_dir
+from ducky_app.core.dns_cache import shared_cache as dns_cache
+
+DEFAULT_PORTS = (443, 8443, 993, 995, 465, 636, 990, 5061, 6443, 9443)
+CONNECT_TIMEOUT = 3.0
+HANDSHAKE_TIMEOUT = 5.0
+MAX_TARGETS = 65536
+
+CERT_COLUMNS = ('sha256', 'subject_cn', 'issuer_cn', 'subject', 'issuer', 'serial', 'not_before',
+                'not_after', 'sans', 'key_type', 'key_bits', 'signature_algorithm', 'is_ca', 'der')
+ENDPOINT_COLUMNS = ('host', 'port', 'ip', 'scanned_at', 'protocol', 'cipher', 'bits', 'leaf_sha256',
+                    'chain', 'error')
+
+
+def parse_ports(text):
+    """Comma/space separated ports and ``a-b`` ranges."""
+    ports = []
+    for part in text.replace(',', ' ').split():
+        first, _, last = part.partition('-')
+        for port in range(int(first), int(last or first) + 1):
+            if not 0 < port < 65536:
+                raise ValueError(f'Invalid port: {port}')
+            if port not in ports:
+                ports.append(port)
+    return ports
+
+
+def parse_targets(text, limit=MAX_TARGETS):
+    """Expand ``host``, ``host:port``, ``[v6]:port``, CIDR and ``first-last`` lines.
+
+    Returns ``(host, port)`` pairs where ``port`` is None unless the line
+    named one explicitly.
+    """
+    targets = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].split(',')[0].strip()
+        if not line:
+            continue
+        host, port = line, None
+        if line.startswith('['):
+            host, _, rest = line[1:].partition(']')
+            port = int(rest[1:]) if rest.startswith(':') else None
+        elif line.count(':') == 1:
+            host, port = line.split(':')
+            port = int(port)
+        if '/' in host or ('-' in host and _is_address(host.split('-', 1)[0])):
+            targets += [(ip, port) for ip in dnsbl.expand_targets(host, limit)]
+        else:
+            targets.append((host, port))
+        if len(targets) > limit:
+            raise ValueError(f'More than {limit} targets.')
+    return list(dict.fromkeys(targets))
+
+
+def _is_address(text):
+    try:
+        ipaddress.ip_address(text.strip())
+        return True
+    except ValueError:
+        return False
+
+
+def _peer_chain(tls):
+    """DER certificates the peer sent, leaf first, without verifying them."""
+    get_chain = getattr(tls, 'get_unverified_chain', None) or getattr(tls._sslobj, 'get_unverified_chain', None)
+    if get_chain:
+        try:
+            chain = get_chain() or []
+            return [c if isinstance(c, bytes) else c.public_bytes(ssl._ssl.ENCODING_DER) for c in chain]
+        except (AttributeError, ValueError, ssl.SSLError):
+            pass
+    leaf = tls.getpeercert(binary_form=True)
+    return [leaf] if leaf else []
+
+
+def probe(host, port, connect_timeout=CONNECT_TIMEOUT, handshake_timeout=HANDSHAKE_TIMEOUT):
+    """Handshake with ``host:port`` and capture the certificate chain and session parameters.
+
+    Certificates are not validated: the point is to inventory whatever is
+    deployed, including self-signed and expired certificates. Network and
+    TLS failures are reported in ``error`` rather than raised.
+    """
+    result = {'host': host, 'port': port, 'ip': None, 'scanned_at': time.time(), 'protocol': None,
+              'cipher': None, 'bits': None, 'chain': [], 'error': None}
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    try:
+        ctx.minimum_version = ssl.TLSVersion.MINIMUM_SUPPORTED
+        ctx.set_ciphers('ALL:@SECLEVEL=0')
+    except (ValueError, ssl.SSLError):
+        pass
+    server_name = None if _is_address(host) else host
+    try:
+        with dns_cache.create_connection(host, port, timeout=connect_timeout) as raw:
+            result['ip'] = raw.getpeername()[0]
+            raw.settimeout(handshake_timeout)
+            with ctx.wrap_socket(raw, server_hostname=server_name) as tls:
+                result['protocol'] = tls.version()
+                name, _proto, bits = tls.cipher() or (None, None, None)
+                result['cipher'], result['bits'] = name, bits
+                result['chain'] = _peer_chain(tls)
+    except socket.timeout:
+        result['error'] = 'Timed out'
+    except ssl.SSLError as e:
+        result['error'] = f'TLS error: {e.reason or e}'
+    except OSError as e:
+        result['error'] = e.strerror or str(e)
+    return result
+
+
+def describe(result):
+    """Flatten a :func:`probe` result for display: leaf certificate fields plus chain length."""
+    row = {k: result[k] for k in ('host', 'port', 'ip', 'protocol', 'cipher', 'bits', 'error')}
+    row['chain_length'] = len(result['chain'])
+    row.update(subject_cn='', issuer_cn='', not_after=None, sans=[], sha256=None, key='')
+    if result['chain']:
+        try:
+            leaf = x509.parse_certificate(result['chain'][0])
+        except x509.CertificateError as e:
+            row['error'] = str(e)
+            return row
+        row.update(
+            subject_cn=x509.common_name(leaf['subject']),
+            issuer_cn=x509.common_name(leaf['issuer']),
+            not_after=leaf['not_after'].isoformat(sep=' ') if leaf['not_after'] else None,
+            sans=[value for _kind, value in leaf['subject_alt_names']],
+            sha256=leaf['sha256'],
+            key=f"{leaf['key_type']} {leaf['key_bits'] or ''}".strip(),
+        )
+    return row
+
+
+class TlsInventory:
+    """SQLite store of scanned endpoints and the certificates they presented.
+
+    Certificates are stored once per SHA-256 fingerprint; each endpoint row
+    points at its leaf and lists its chain, so a certificate deployed on
+    hundreds of endpoints is parsed and stored once.
+    """
+
+    def __init__(self, db_path):
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS certificates (sha256 TEXT PRIMARY KEY, subject_cn TEXT, '
+                'issuer_cn TEXT, subject TEXT, issuer TEXT, serial TEXT, not_before TEXT, not_after TEXT, '
+                'sans TEXT, key_type TEXT, key_bits INTEGER, signature_algorithm TEXT, is_ca INTEGER, der BLOB)'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS endpoints (host TEXT, port INTEGER, ip TEXT, scanned_at REAL, '
+                'protocol TEXT, cipher TEXT, bits INTEGER, leaf_sha256 TEXT, chain TEXT, error TEXT, '
+                'PRIMARY KEY (host, port))'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS enumerations (host TEXT, port INTEGER, leaf_sha256 TEXT, '
+                'scanned_at REAL, result TEXT, PRIMARY KEY (host, port))'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS certificates_expiry ON certificates (not_after)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS endpoints_leaf ON endpoints (leaf_sha256)')
+
+    @staticmethod
+    def _certificate_row(der):
+        cert = x509.parse_certificate(der)
+        return (
+            cert['sha256'], x509.common_name(cert['subject']), x509.common_name(cert['issuer']),
+            json.dumps(cert['subject']), json.dumps(cert['issuer']), cert['serial'],
+            cert['not_before'].isoformat(sep=' ') if cert['not_before'] else None,
+            cert['not_after'].isoformat(sep=' ') if cert['not_after'] else None,
+            json.dumps(cert['subject_alt_names']), cert['key_type'], cert['key_bits'],
+            cert['signature_algorithm'], int(cert['is_ca']), der,
+        )
+
+    def record(self, results):
+        """Store a batch of :func:`probe` results, replacing earlier scans of the same endpoints."""
+        certs, endpoints = {}, []
+        for result in results:
+            fingerprints = []
+            for der in result['chain']:
+                try:
+                    row = self._certificate_row(der)
+                except x509.CertificateError:
+                    continue
+                certs[row[0]] = row
+                fingerprints.append(row[0])
+            endpoints.append((
+                result['host'], result['port'], result['ip'], result['scanned_at'], result['protocol'],
+                result['cipher'], result['bits'], fingerprints[0] if fingerprints else None,
+                json.dumps(fingerprints), result['error'],
+            ))
+        with self._db_lock, self._db:
+            self._db.executemany(
+                f'INSERT OR IGNORE INTO certificates ({", ".join(CERT_COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(CERT_COLUMNS))})', list(certs.values())
+            )
+            self._db.executemany(
+                f'INSERT OR REPLACE INTO endpoints ({", ".join(ENDPOINT_COLUMNS)}) '
+                f'VALUES ({", ".join("?" * len(ENDPOINT_COLUMNS))})', endpoints
+            )
+
+    def endpoint(self, host, port):
+        with self._db_lock:
+            row = self._db.execute(
+                f'SELECT {", ".join(ENDPOINT_COLUMNS)} FROM endpoints WHERE host = ? AND port = ?', (host, port)
+            ).fetchone()
+        return dict(zip(ENDPOINT_COLUMNS, row)) if row else None
+
+    def certificate(self, sha256):
+        with self._db_lock:
+            row = self._db.execute(
+                f'SELECT {", ".join(CERT_COLUMNS)} FROM certificates WHERE sha256 = ?', (sha256,)
+            ).fetchone()
+        return dict(zip(CERT_COLUMNS, row)) if row else None
+
+    def enumeration(self, host, port):
+        """Stored protocol/cipher enumeration for an endpoint as ``(leaf_sha256, scanned_at, result)``."""
+        with self._db_lock:
+            row = self._db.execute(
+                'SELECT leaf_sha256, scanned_at, result FROM enumerations WHERE host = ? AND port = ?', (host, port)
+            ).fetchone()
+        return (row[0], row[1], json.loads(row[2])) if row else None
+
+    def store_enumeration(self, host, port, leaf_sha256, result):
+        with self._db_lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO enumerations (host, port, leaf_sha256, scanned_at, result) '
+                'VALUES (?, ?, ?, ?, ?)', (host, port, leaf_sha256, time.time(), json.dumps(result))
+            )
+
+    def expiry_report(self, within_days=None, limit=None):
+        """Endpoints with a leaf certificate, soonest expiry first."""
+        sql = ('SELECT e.host, e.port, e.ip, e.protocol, e.cipher, e.bits, e.scanned_at, e.chain, '
+               'c.sha256, c.subject_cn, c.issuer_cn, c.not_after, c.sans, c.key_type, c.key_bits '
+               'FROM endpoints e JOIN certificates c ON c.sha256 = e.leaf_sha256 WHERE c.not_after IS NOT NULL')
+        params = []
+        if within_days is not None:
+            sql += ' AND c.not_after <= ?'
+            params.append((datetime.datetime.utcnow() + datetime.timedelta(days=within_days)).isoformat(sep=' '))
+        sql += ' ORDER BY c.not_after ASC, e.host, e.port'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        report = []
+        for (host, port, ip, protocol, cipher, bits, scanned_at, chain, sha256, subject_cn, issuer_cn,
+             not_after, sans, key_type, key_bits) in rows:
+            report.append({
+                'host': host, 'port': port, 'ip': ip, 'protocol': protocol, 'cipher': cipher, 'bits': bits,
+                'scanned_at': scanned_at, 'chain_length': len(json.loads(chain or '[]')), 'sha256': sha256,
+                'subject_cn': subject_cn, 'issuer_cn': issuer_cn, 'not_after': not_after,
+                'sans': [value for _kind, value in json.loads(sans or '[]')],
+                'key': f'{key_type} {key_bits or ""}'.strip(), 'error': None,
+            })
+        return report
+
+
+_inventory = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory():
+    """Process-wide :class:`TlsInventory` stored under the application data directory."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = TlsInventory(os.path.join(app_data_dir('tls'), 'tls_inventory.db'))
+        return _inventory
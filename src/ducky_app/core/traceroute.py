@@ -0,0 +1,361 @@
+import os
+import time
+import errno
+import socket
+import select
+import struct
+import statistics
+import ipaddress
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from ducky_app.core.icmp import checksum, UPDATE_INTERVAL
+from ducky_app.core.dns_cache import shared_cache as dns_cache
+
+PROBE_TYPES = {'icmp': 'ICMP Echo', 'udp': 'UDP', 'tcp': 'TCP SYN'}
+DEFAULT_PORTS = {'udp': 33434, 'tcp': 80}
+MAX_HOPS = 30
+RING_SIZE = 100             # samples per hop the MTR statistics are computed over
+PORT_SPAN = 1024            # UDP probes walk the destination port, as traceroute does, so replies identify them
+NAME_CONCURRENCY = 8
+NAME_WAIT = 2.0             # how long a finished trace waits for outstanding PTR lookups
+
+ICMP_ECHO_REPLY, ICMP_UNREACHABLE, ICMP_ECHO_REQUEST, ICMP_TIME_EXCEEDED = 0, 3, 8, 11
+ICMP6_UNREACHABLE, ICMP6_TIME_EXCEEDED, ICMP6_ECHO_REQUEST, ICMP6_ECHO_REPLY = 1, 3, 128, 129
+# Codes of ICMP destination unreachable, in traceroute's notation
+UNREACHABLE_CODES = {0: '!N', 1: '!H', 2: '!P', 9: '!X', 10: '!X', 13: '!X'}
+UNREACHABLE6_CODES = {0: '!N', 1: '!X', 3: '!H', 4: '!P'}
+_HEADER = struct.Struct('!BBHHH')     # type, code, checksum, identifier, sequence
+_PORTS = struct.Struct('!HH')
+
+
+class HopStats:
+    """Per-hop probe results, with loss and latency computed over the last ``ring_size`` probes (ms)."""
+
+    __slots__ = ('ttl', 'addresses', 'names', 'sent', 'samples', 'status')
+
+    def __init__(self, ttl, ring_size=RING_SIZE):
+        self.ttl = ttl
+        self.addresses = Counter()
+        self.names = {}
+        self.sent = 0
+        self.samples = deque(maxlen=ring_size)     # rtt, or None for a lost probe
+        self.status = ''
+
+    def add(self, rtt, address=None):
+        self.samples.append(rtt)
+        if address:
+            self.addresses[address] += 1
+
+    @property
+    def address(self):
+        """The address seen most often at this TTL; load-balanced paths show several."""
+        return self.addresses.most_common(1)[0][0] if self.addresses else None
+
+    @property
+    def name(self):
+        return self.names.get(self.address) or None
+
+    @property
+    def _replies(self):
+        return [s for s in self.samples if s is not None]
+
+    @property
+    def received(self):
+        return len(self._replies)
+
+    @property
+    def loss(self):
+        return (len(self.samples) - self.received) * 100.0 / len(self.samples) if self.samples else None
+
+    @property
+    def last(self):
+        return self.samples[-1] if self.samples else None
+
+    @property
+    def avg(self):
+        replies = self._replies
+        return sum(replies) / len(replies) if replies else None
+
+    @property
+    def best(self):
+        return min(self._replies, default=None)
+
+    @property
+    def worst(self):
+        return max(self._replies, default=None)
+
+    @property
+    def stdev(self):
+        replies = self._replies
+        return statistics.pstdev(replies) if len(replies) > 1 else None
+
+
+def open_receive_socket(family):
+    """Raw ICMP socket that sees time-exceeded and unreachable replies; raises PermissionError without privileges."""
+    proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+    try:
+        return socket.socket(family, socket.SOCK_RAW, proto)
+    except PermissionError:
+        raise PermissionError('Traceroute needs a raw ICMP socket to see the routers\' replies; '
+                              'run as root/Administrator (or grant CAP_NET_RAW).') from None
+
+
+def _set_ttl(sock, family, ttl):
+    if family == socket.AF_INET:
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+    else:
+        sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_UNICAST_HOPS, ttl)
+
+
+class Tracer:
+    """Trace the path to one address, probing every TTL at once.
+
+    Each round sends a probe for every TTL back to back, so a whole path
+    costs one timeout rather than one per hop. All replies arrive on a
+    single raw ICMP socket and are matched to their probe through the
+    packet the router quotes back: the echo sequence for ICMP, the
+    destination port for UDP and the source port for TCP SYN (sent with a
+    non-blocking ``connect``, whose completion marks the destination).
+    ``rounds`` of 0 keeps probing until cancelled, mtr-style. Hop names
+    are looked up on a thread pool as new addresses appear.
+    """
+
+    def __init__(self, address, probe='icmp', port=None, max_hops=MAX_HOPS, timeout=2.0, interval=1.0,
+                 rounds=3, ring_size=RING_SIZE, resolve_names=True):
+        if probe not in PROBE_TYPES:
+            raise ValueError(f'Unknown probe type: {probe}')
+        self.address = str(ipaddress.ip_address(address))
+        self.family = socket.AF_INET6 if ':' in self.address else socket.AF_INET
+        self.probe = probe
+        self.port = port or DEFAULT_PORTS.get(probe, 0)
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.interval = max(interval, 0.01)
+        self.rounds = rounds
+        self.resolve_names = resolve_names
+        self.hops = [HopStats(ttl, ring_size) for ttl in range(1, max_hops + 1)]
+        self.dest_ttl = None          # first TTL that reached the destination (or an unreachable)
+        self.rounds_sent = 0
+        self.identifier = os.getpid() & 0xffff
+        self._seq = 0
+        self._pending = {}            # probe key -> (hop, send time, TCP socket or None)
+        self._recv = self._udp = None
+        self._lookups = {}
+
+    def visible_hops(self):
+        """Hops up to the destination, or up to the last one that answered while it has not been reached."""
+        if self.dest_ttl:
+            return self.hops[:self.dest_ttl]
+        answered = [h.ttl for h in self.hops if h.addresses]
+        return self.hops[:max(answered)] if answered else []
+
+    # ── sending ──────────────────────────────────────────────────────────
+    def _next_seq(self):
+        self._seq = (self._seq + 1) & 0xffff
+        return self._seq
+
+    def _send_icmp(self, hop):
+        seq = self._next_seq()
+        kind = ICMP_ECHO_REQUEST if self.family == socket.AF_INET else ICMP6_ECHO_REQUEST
+        payload = b'DUCKY-TRACE'.ljust(32, b'\0')
+        packet = _HEADER.pack(kind, 0, 0, self.identifier, seq) + payload
+        if self.family == socket.AF_INET:     # the kernel computes the ICMPv6 checksum
+            packet = _HEADER.pack(kind, 0, checksum(packet), self.identifier, seq) + payload
+        _set_ttl(self._recv, self.family, hop.ttl)
+        self._recv.sendto(packet, (self.address, 0))
+        return ('icmp', seq), None
+
+    def _send_udp(self, hop):
+        port = self.port + self._next_seq() % PORT_SPAN
+        _set_ttl(self._udp, self.family, hop.ttl)
+        self._udp.sendto(b'DUCKY-TRACE'.ljust(32, b'\0'), (self.address, port))
+        return ('udp', port), None
+
+    def _send_tcp(self, hop):
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        # Abort on close: no FIN handshake or TIME_WAIT left behind by the probes that connect
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        _set_ttl(sock, self.family, hop.ttl)
+        err = sock.connect_ex((self.address, self.port))
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', -1)):
+            sock.close()
+            raise OSError(err, os.strerror(err))
+        return ('tcp', sock.getsockname()[1]), sock
+
+    def _send_round(self, now):
+        send = {'icmp': self._send_icmp, 'udp': self._send_udp, 'tcp': self._send_tcp}[self.probe]
+        for hop in self.hops[:self.dest_ttl or self.max_hops]:
+            try:
+                key, sock = send(hop)
+            except OSError as e:
+                hop.status = e.strerror or str(e)
+                continue
+            stale = self._pending.pop(key, None)
+            if stale and stale[2]:
+                stale[2].close()
+            hop.sent += 1
+            self._pending[key] = (hop, now, sock)
+        self.rounds_sent += 1
+
+    # ── receiving ────────────────────────────────────────────────────────
+    def _quoted_key(self, inner):
+        """Probe key of the original packet an ICMP error quotes, or None if it is not one of ours."""
+        if self.family == socket.AF_INET:
+            if len(inner) < 20:
+                return None
+            ihl = (inner[0] & 0x0f) * 4
+            proto, dst, payload = inner[9], socket.inet_ntop(socket.AF_INET, inner[16:20]), inner[ihl:ihl + 8]
+        else:
+            if len(inner) < 40:
+                return None
+            proto, dst, payload = inner[6], socket.inet_ntop(socket.AF_INET6, inner[24:40]), inner[40:48]
+        if len(payload) < 8 or ipaddress.ip_address(dst) != ipaddress.ip_address(self.address):
+            return None
+        if self.probe == 'icmp' and proto in (socket.IPPROTO_ICMP, socket.IPPROTO_ICMPV6):
+            _kind, _code, _sum, ident, seq = _HEADER.unpack(payload)
+            return ('icmp', seq) if ident == self.identifier else None
+        if self.probe == 'udp' and proto == socket.IPPROTO_UDP:
+            sport, dport = _PORTS.unpack_from(payload)
+            return ('udp', dport) if sport == self._udp.getsockname()[1] else None
+        if self.probe == 'tcp' and proto == socket.IPPROTO_TCP:
+            sport, _dport = _PORTS.unpack_from(payload)
+            return ('tcp', sport)
+        return None
+
+    def _receive(self):
+        v4 = self.family == socket.AF_INET
+        while True:
+            try:
+                data, source = self._recv.recvfrom(65535)
+            except OSError:     # includes BlockingIOError once the queue is drained
+                return
+            now = time.perf_counter()
+            if v4 and data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0f) * 4:]   # raw IPv4 sockets include the IP header
+            if len(data) < 8:
+                continue
+            kind, code = data[0], data[1]
+            source = source[0].split('%')[0]
+            final = ipaddress.ip_address(source) == ipaddress.ip_address(self.address)
+            status = None
+            if kind == (ICMP_ECHO_REPLY if v4 else ICMP6_ECHO_REPLY):
+                _kind, _code, _sum, ident, seq = _HEADER.unpack_from(data)
+                key = ('icmp', seq) if self.probe == 'icmp' and ident == self.identifier and final else None
+            elif kind == (ICMP_TIME_EXCEEDED if v4 else ICMP6_TIME_EXCEEDED):
+                key = self._quoted_key(data[8:])
+            elif kind == (ICMP_UNREACHABLE if v4 else ICMP6_UNREACHABLE):
+                key = self._quoted_key(data[8:])
+                # Port unreachable from the destination is how UDP probes arrive; anything else ends the path
+                if not (final and code == (3 if v4 else 4)):
+                    status = (UNREACHABLE_CODES if v4 else UNREACHABLE6_CODES).get(code, f'!<{code}>')
+                    final = True
+            else:
+                continue
+            if key is not None:
+                self._answer(key, now, source, final, status)
+
+    def _answer(self, key, now, source, final, status=None):
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+        hop, sent_at, sock = entry
+        if sock:
+            sock.close()
+        if self.dest_ttl and hop.ttl > self.dest_ttl:
+            hop.sent -= 1
+            return
+        hop.add((now - sent_at) * 1000.0, source)
+        hop.status = status or ('Destination' if final else 'Reply')
+        if final and (self.dest_ttl is None or hop.ttl < self.dest_ttl):
+            self._reached(hop.ttl)
+        if self.resolve_names and source not in self._lookups:
+            self._lookups[source] = self._names.submit(self._lookup, source)
+
+    def _reached(self, ttl):
+        # The destination answers every TTL at or past its distance; probes beyond it are not counted
+        self.dest_ttl = ttl
+        for key, (hop, _sent_at, sock) in list(self._pending.items()):
+            if hop.ttl > ttl:
+                del self._pending[key]
+                hop.sent -= 1
+                if sock:
+                    sock.close()
+
+    def _check_connects(self, writable):
+        for key, (hop, sent_at, sock) in list(self._pending.items()):
+            # Reaching the destination drops the probes past it, so re-check what is still pending
+            if sock in writable and self._pending.get(key, (None, None, None))[2] is sock:
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                # Connected or refused, the SYN reached the destination's TCP stack
+                if err in (0, errno.ECONNREFUSED, getattr(errno, 'WSAECONNREFUSED', -1)):
+                    self._answer(key, time.perf_counter(), self.address, True)
+                else:
+                    # Failed on an ICMP error the raw socket also sees; keep waiting for that, not the socket
+                    sock.close()
+                    self._pending[key] = (hop, sent_at, None)
+
+    def _lookup(self, address):
+        name = dns_cache.reverse_lookup(address)
+        for hop in self.hops:
+            if address in hop.addresses:
+                hop.names[address] = name or ''
+
+    def _expire(self, now):
+        for key, (hop, sent_at, sock) in list(self._pending.items()):
+            if now - sent_at > self.timeout:
+                del self._pending[key]
+                if sock:
+                    sock.close()
+                hop.add(None)
+                if not hop.addresses:
+                    hop.status = 'No reply'
+
+    def run(self, on_update=None, cancelled=lambda: False):
+        """Probe for ``rounds`` rounds (forever when 0) or until ``cancelled()`` is true; returns the visible hops.
+
+        ``on_update(hops)`` receives :meth:`visible_hops` a few times a
+        second. Raises PermissionError if no raw ICMP socket can be opened.
+        """
+        self._recv = open_receive_socket(self.family)
+        self._recv.setblocking(False)
+        if self.probe == 'udp':
+            self._udp = socket.socket(self.family, socket.SOCK_DGRAM)
+            self._udp.bind(('', 0))
+        self._names = ThreadPoolExecutor(max_workers=NAME_CONCURRENCY)
+        next_round, last_update = time.perf_counter(), 0.0
+        try:
+            while not cancelled():
+                now = time.perf_counter()
+                if next_round is not None and now >= next_round:
+                    self._send_round(now)
+                    next_round = now + self.interval if not self.rounds or self.rounds_sent < self.rounds else None
+                self._expire(now)
+                if next_round is None and not self._pending:
+                    break
+                wake = next_round if next_round is not None else now + UPDATE_INTERVAL
+                connecting = [sock for _hop, _sent_at, sock in self._pending.values() if sock]
+                readable, writable, _ = select.select([self._recv], connecting, [],
+                                                      max(0.0, min(wake - now, UPDATE_INTERVAL)))
+                if readable:
+                    self._receive()
+                if writable:
+                    self._check_connects(writable)
+                now = time.perf_counter()
+                if on_update and now - last_update >= UPDATE_INTERVAL:
+                    on_update(self.visible_hops())
+                    last_update = now
+            if not cancelled():
+                wait(list(self._lookups.values()), timeout=NAME_WAIT)
+            if on_update:
+                on_update(self.visible_hops())
+        finally:
+            self._names.shutdown(wait=False, cancel_futures=True)
+            for _hop, _sent_at, sock in self._pending.values():
+                if sock:
+                    sock.close()
+            self._pending.clear()
+            for sock in (self._recv, self._udp):
+                if sock:
+                    sock.close()
+        return self.visible_hops()
@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import datetime
+import sqlite3
+import ipaddress
+import threading
+from ducky_app.core import whois_parser
+from ducky_app.core.config_manager import app_data_dir
+from ducky_app.core.dns_cache import shared_cache as dns_cache
+
+IANA_SERVER = 'whois.iana.org'
+INDEX_COLUMNS = ('domain', 'registrar', 'created', 'updated', 'expires', 'name_servers',
+                 'netblock', 'net_name', 'asn', 'org', 'country')
+DEFAULT_RESULT_TTL = 24 * 3600
+DEFAULT_MIN_INTERVAL = 1.0
+
+
+def raw_query(query, server, timeout=15):
+    with dns_cache.create_connection(server, 43, timeout=timeout) as s:
+        s.sendall((query + '\r\n').encode())
+        chunks = []
+        while True:
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b''.join(chunks).decode('utf-8', errors='replace')
+
+
+def referral_key(query):
+    """Key under which the IANA referral for ``query`` is cached, or None if uncacheable.
+
+    Domains share a referral per TLD, IPv4 addresses per /8 and IPv6 per /32,
+    matching the granularity at which IANA delegates them.
+    """
+    query = query.strip().lower().rstrip('.')
+    try:
+        addr = ipaddress.ip_address(query)
+        if addr.version == 4:
+            return f'ip4:{query.split(".")[0]}'
+        return 'ip6:' + ':'.join(addr.exploded.split(':')[:2])
+    except ValueError:
+        pass
+    if '.' in query and ' ' not in query:
+        return 'tld:' + query.rsplit('.', 1)[1]
+    return None
+
+
+def parse_referral(text):
+    for line in text.splitlines():
+        lower = line.lower()
+        if lower.startswith('whois:') or lower.startswith('refer:'):
+            server = line.split(':', 1)[1].strip()
+            if server:
+                return server
+    return None
+
+
+class WhoisClient:
+    """Whois client with a persistent referral cache, a result cache and per-server pacing.
+
+    Queries to the same server are serialized and spaced ``min_interval``
+    seconds apart; queries to different servers run independently.
+    """
+
+    def __init__(self, cache_dir, result_ttl=DEFAULT_RESULT_TTL, min_interval=DEFAULT_MIN_INTERVAL):
+        self.result_ttl = result_ttl
+        self.min_interval = min_interval
+        self.referral_path = os.path.join(cache_dir, 'whois_referrals.json')
+        self._referrals = self._load_referrals()
+        self._lock = threading.Lock()
+        self._server_locks = {}
+        self._last_query = {}
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'whois_cache.db'), check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                ' query TEXT PRIMARY KEY, server TEXT, fetched_at REAL, text TEXT)'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS parsed (query TEXT PRIMARY KEY, server TEXT, indexed_at REAL, '
+                + ', '.join(f'{col} TEXT' for col in INDEX_COLUMNS) + ')'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS parsed_expires ON parsed (expires)')
+
+    def _load_referrals(self):
+        try:
+            with open(self.referral_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_referrals(self):
+        tmp = self.referral_path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._referrals, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.referral_path)
+        except OSError:
+            pass
+
+    def _paced_query(self, query, server):
+        with self._lock:
+            server_lock = self._server_locks.setdefault(server, threading.Lock())
+        with server_lock:
+            wait = self._last_query.get(server, 0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return raw_query(query, server)
+            finally:
+                self._last_query[server] = time.monotonic()
+
+    def referral_server(self, query):
+        """Whois server responsible for ``query``; IANA is asked once per TLD / address block."""
+        key = referral_key(query)
+        with self._lock:
+            cached = self._referrals.get(key) if key else None
+        if cached:
+            return cached, None
+        text = self._paced_query(query, IANA_SERVER)
+        server = parse_referral(text) or IANA_SERVER
+        if key:
+            with self._lock:
+                self._referrals[key] = server
+                self._save_referrals()
+        return server, text
+
+    def cached_result(self, query):
+        with self._db_lock:
+            row = self._db.execute(
+                'SELECT server, fetched_at, text FROM results WHERE query = ?', (query.lower(),)
+            ).fetchone()
+        if row and time.time() - row[1] < self.result_ttl:
+            return row
+        return None
+
+    def lookup(self, query, use_cache=True):
+        """Return ``(text, server, from_cache)`` for ``query``."""
+        query = query.strip()
+        if use_cache and (row := self.cached_result(query)):
+            return row[2], row[0], True
+        server, iana_text = self.referral_server(query)
+        if server == IANA_SERVER and iana_text is not None:
+            text = iana_text
+        else:
+            try:
+                text = self._paced_query(query, server)
+            except OSError:
+                if iana_text is None:
+                    raise
+                text = iana_text
+        with self._db_lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO results (query, server, fetched_at, text) VALUES (?, ?, ?, ?)',
+                (query.lower(), server, time.time(), text)
+            )
+        self.index_result(query, server, text)
+        return text, server, False
+
+    def index_result(self, query, server, text):
+        """Parse ``text`` and store its fields in the local index; returns the fields."""
+        fields = whois_parser.parse(text)
+        values = [', '.join(v) if isinstance(v, list) else v
+                  for v in (fields.get(col) for col in INDEX_COLUMNS)]
+        with self._db_lock, self._db:
+            self._db.execute(
+                f'INSERT OR REPLACE INTO parsed (query, server, indexed_at, {", ".join(INDEX_COLUMNS)}) '
+                f'VALUES (?, ?, ?, {", ".join("?" * len(INDEX_COLUMNS))})',
+                [query.lower(), server, time.time()] + values
+            )
+        return fields
+
+    def expiry_report(self, within_days=None, limit=None):
+        """Indexed domains ordered by expiry date, soonest first, straight from the local index."""
+        sql = ('SELECT query, server, ' + ', '.join(INDEX_COLUMNS) +
+               " FROM parsed WHERE expires GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'")
+        params = []
+        if within_days is not None:
+            sql += ' AND expires <= ?'
+            params.append((datetime.date.today() + datetime.timedelta(days=within_days)).isoformat())
+        sql += ' ORDER BY expires ASC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        with self._db_lock:
+            rows = self._db.execute(sql, params).fetchall()
+        keys = ('query', 'server') + INDEX_COLUMNS
+        return [dict(zip(keys, row)) for row in rows]
+
+    def purge_expired(self):
+        """Drop raw results older than ``result_ttl``; the parsed index is kept for expiry reports."""
+        with self._db_lock, self._db:
+            self._db.execute('DELETE FROM results WHERE fetched_at < ?', (time.time() - self.result_ttl,))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide :class:`WhoisClient` stored under the application data directory."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WhoisClient(app_data_dir('whois'))
+            _client.purge_expired()
+        return _client
@@ -0,0 +1,106 @@
+import re
+import datetime
+
+# Registry (gTLD/ccTLD) and RIR (ARIN/RIPE/APNIC/LACNIC/AFRINIC) spellings of each field
+FIELD_KEYS = {
+    'domain': ('domain name', 'domain'),
+    'registrar': ('registrar', 'registrar name', 'sponsoring registrar', 'registrar organization'),
+    'created': ('creation date', 'created', 'created on', 'created date', 'registered',
+                'registered on', 'registration time', 'domain registration date', 'regdate',
+                'domain record activated'),
+    'updated': ('updated date', 'last updated', 'last-modified', 'last modified', 'changed',
+                'updated', 'updated on', 'modified'),
+    'expires': ('registry expiry date', 'registrar registration expiration date', 'expiration date',
+                'expiry date', 'expires', 'expires on', 'expire date', 'paid-till', 'renewal date',
+                'expiration time', 'domain expiration date', 'record expires on'),
+    'name_servers': ('name server', 'name servers', 'nameserver', 'nameservers', 'nserver'),
+    'status': ('domain status', 'status'),
+    'netblock': ('inetnum', 'inet6num', 'netrange', 'cidr', 'route', 'route6'),
+    'net_name': ('netname', 'net-name'),
+    'asn': ('originas', 'origin', 'aut-num', 'asnumber'),
+    'org': ('orgname', 'org-name', 'organization', 'organisation', 'registrant organization',
+            'owner', 'descr'),
+    'country': ('country', 'registrant country'),
+}
+_KEY_TO_FIELD = {key: field for field, keys in FIELD_KEYS.items() for key in keys}
+LIST_FIELDS = ('name_servers', 'status')
+
+_LINE_RE = re.compile(r'^\s*([A-Za-z][\w /.()-]{0,60}?)\s*:\s*(.*?)\s*$')
+_ISO_RE = re.compile(r'(\d{4})[-./](\d{2})[-./](\d{2})')
+_DATE_FORMATS = (
+    '%d-%b-%Y', '%d %b %Y', '%d-%B-%Y', '%d %B %Y', '%b %d %Y', '%B %d %Y',
+    '%a %b %d %Y', '%d.%m.%Y', '%d/%m/%Y', '%Y%m%d',
+)
+
+
+def normalize_date(value):
+    """Best-effort conversion of a registry date to ``YYYY-MM-DD``; None if unparseable."""
+    value = value.strip()
+    if match := _ISO_RE.search(value):
+        try:
+            return datetime.date(*map(int, match.groups())).isoformat()
+        except ValueError:
+            return None
+    candidate = re.sub(r'\s+\d{1,2}:\d{2}(:\d{2})?.*$', '', value)
+    candidate = re.sub(r'\s+', ' ', candidate.replace(',', ' ')).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(candidate, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def parse(text):
+    """Extract common registry and RIR fields from a raw whois response.
+
+    Returns a dict keyed by the names in :data:`FIELD_KEYS`; dates are
+    normalized to ISO format and list fields are de-duplicated lists.
+    Only the first value seen for a scalar field is kept, which for RIR
+    output means the most specific block.
+    """
+    fields = {}
+    pending = None
+    for raw in text.splitlines():
+        if raw.startswith(('%', '#', '>>>')):
+            pending = None
+            continue
+        # Block layout (e.g. Nominet): "Registrar:" followed by indented value lines
+        if pending and raw[:1] in (' ', '\t') and raw.strip() and ':' not in raw.strip():
+            _add(fields, pending, raw.strip())
+            if pending not in LIST_FIELDS:
+                pending = None
+            continue
+        match = _LINE_RE.match(raw)
+        if not match:
+            pending = None
+            continue
+        key, value = match.group(1).lower().strip(), match.group(2)
+        field = _KEY_TO_FIELD.get(key)
+        if field is None:
+            pending = None
+            continue
+        pending = None if value else field
+        if value:
+            _add(fields, field, value)
+
+    for field in ('created', 'updated', 'expires'):
+        if field in fields:
+            fields[field] = normalize_date(fields[field]) or fields[field]
+    if 'asn' in fields:
+        digits = re.search(r'\d+', fields['asn'])
+        fields['asn'] = f'AS{digits.group()}' if digits else fields['asn']
+    return fields
+
+
+def _add(fields, field, value):
+    if field in LIST_FIELDS:
+        if field == 'name_servers':
+            value = value.split()[0].rstrip('.').lower()
+        else:
+            value = value.split(' http', 1)[0].strip()
+        values = fields.setdefault(field, [])
+        if value not in values:
+            values.append(value)
+    elif field not in fields:
+        fields[field] = value
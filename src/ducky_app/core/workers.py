@@ -1,3 +1,4 @@
+import os
 import sys
 import time
 import subprocess
@@ -9,12 +10,20 @@ import ipaddress
 import paramiko
 import asyncio
 import psutil
-import re
 import xml.etree.ElementTree as ET
 import datetime
+import csv
+import queue
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from PySide6.QtCore import Signal, QThread
 from scapy.all import get_if_addr, conf, sr, IP, ICMP, getmacbyip
+from ducky_app.core import (
+    cpe_match, cracker, cve_store, dns_client, dnsbl, file_hash, http_session, http_timing, icmp, ip_ranges, notes,
+    oui_db, password_audit, tls_enum, tls_inventory, traceroute, whois_client, whois_parser,
+)
+from ducky_app.core.dns_cache import shared_cache as dns_cache
 
 try:
     from pysnmp.hlapi import SnmpEngine, CommunityData, UdpTransportTarget, ContextData, ObjectType, ObjectIdentity, getCmd
@@ -121,6 +130,104 @@ class NetworkToolThread(QThread):
             else: self.result_output.emit("\nNo open ports found.\n")
     def stop(self): self._running = False; self.wait(2000)
 
+def _round(value, digits=2):
+    return None if value is None else round(value, digits)
+
+class PingWorker(QThread):
+    """Ping one or many targets with the in-process ICMP engine, reporting live per-target statistics."""
+    rows_ready = Signal(list)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, targets, interval=1.0, count=0, timeout=2.0, parent=None):
+        super().__init__(parent)
+        self.targets = list(targets)
+        self.interval, self.count, self.timeout = interval, count, timeout
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        self.status.emit(f'Resolving {len(self.targets)} target(s)…')
+        resolved = icmp.resolve(self.targets)
+        unresolved = [[t, None, 0, 0, None, None, None, None, None, None, f'Unresolved: {e}']
+                      for t, a, e in resolved if not a]
+        if unresolved:
+            self.rows_ready.emit(unresolved)
+        pinger = icmp.Pinger([(t, a) for t, a, _e in resolved if a], self.interval, self.timeout, self.count)
+        if not pinger.stats:
+            self.finished.emit('No target could be resolved.')
+            return
+
+        def on_update(stats):
+            self.rows_ready.emit([
+                [s.target, s.address, s.sent, s.received]
+                + [_round(v) for v in (s.loss, s.last, s.min, s.avg, s.max, s.jitter)] + [s.status]
+                for s in stats])
+            up = sum(1 for s in stats if s.status == 'Up')
+            self.status.emit(f'Pinging {len(stats)} target(s) every {self.interval:g} s — {up} responding…')
+
+        try:
+            stats = pinger.run(on_update, cancelled=lambda: not self._running)
+        except PermissionError as e:
+            self.finished.emit(f'Error: {e}')
+            return
+        except OSError as e:
+            self.finished.emit(f'Error: could not open an ICMP socket: {e}')
+            return
+        sent = sum(s.sent for s in stats)
+        answered = sum(s.answered for s in stats)
+        received = sum(s.received for s in stats)
+        verb = 'Stopped' if not self._running else 'Finished'
+        self.finished.emit(f'{verb}: {sent} echo requests to {len(stats)} target(s), {received} replies '
+                           f'({(answered - received) * 100 / answered if answered else 0:.1f}% loss).')
+
+class TracerouteWorker(QThread):
+    """Trace the path to one target with every TTL probed in parallel; ``rounds`` of 0 runs mtr-style until stopped."""
+    rows_ready = Signal(list)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, target, probe='icmp', port=None, rounds=3, interval=1.0, timeout=2.0,
+                 max_hops=traceroute.MAX_HOPS, parent=None):
+        super().__init__(parent)
+        self.target, self.probe, self.port = target, probe, port
+        self.rounds, self.interval, self.timeout, self.max_hops = rounds, interval, timeout, max_hops
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        self.status.emit(f'Resolving {self.target}…')
+        _target, address, error = icmp.resolve([self.target])[0]
+        if not address:
+            self.finished.emit(f'Could not resolve {self.target}: {error}')
+            return
+        tracer = traceroute.Tracer(address, self.probe, self.port, self.max_hops, self.timeout, self.interval, self.rounds)
+        label = traceroute.PROBE_TYPES[self.probe] + (f' port {tracer.port}' if self.probe != 'icmp' else '')
+
+        def on_update(hops):
+            self.rows_ready.emit([
+                [h.ttl, h.address or '???', h.name, h.sent]
+                + [_round(v) for v in (h.loss, h.last, h.avg, h.best, h.worst, h.stdev)] + [h.status]
+                for h in hops])
+            where = f'{tracer.dest_ttl} hops' if tracer.dest_ttl else f'{len(hops)} hops so far'
+            self.status.emit(f'Tracing {self.target} ({address}) with {label}, round {tracer.rounds_sent} — {where}…')
+
+        try:
+            tracer.run(on_update, cancelled=lambda: not self._running)
+        except PermissionError as e:
+            self.finished.emit(f'Error: {e}')
+            return
+        except OSError as e:
+            self.finished.emit(f'Error: could not open a raw socket: {e}')
+            return
+        verb = 'Stopped' if not self._running else 'Finished'
+        reached = f'reached in {tracer.dest_ttl} hops' if tracer.dest_ttl else f'not reached within {self.max_hops} hops'
+        self.finished.emit(f'{verb}: {self.target} ({address}) {reached}, {tracer.rounds_sent} round(s) of {label} probes.')
+
 class DiscoveryWorker(QThread):
     host_found = Signal(dict)
     scan_finished = Signal(str)
@@ -235,91 +342,574 @@ class DiscoveryWorker(QThread):
         except (IOError, ValueError, socket.herror, RuntimeError, PermissionError, OSError) as e:
             self.scan_finished.emit(f"Error: {e}")
 
+class ReverseDnsWorker(QThread):
+    """Resolve PTR names for a stream of IP addresses on a small thread pool."""
+    hostname_resolved = Signal(str, str)
+
+    MAX_CONCURRENCY = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._running = True
+
+    def enqueue(self, ip):
+        self._queue.put(ip)
+
+    def close(self):
+        """Finish once every queued address has been resolved."""
+        self._queue.put(None)
+
+    def _resolve(self, ip):
+        if not self._running:
+            return
+        hostname = dns_cache.reverse_lookup(ip)
+        if self._running:
+            self.hostname_resolved.emit(ip, hostname or '')
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENCY) as pool:
+            while self._running:
+                ip = self._queue.get()
+                if ip is None:
+                    break
+                pool.submit(self._resolve, ip)
+
+    def stop(self):
+        self._running = False
+        self._queue.put(None)
+        self.wait(2000)
+
 class CveSearchWorker(QThread):
-    result_ready = Signal(dict); error_occurred = Signal(str)
-    def __init__(self, keyword, parent=None): super().__init__(parent); self.keyword = keyword
+    """Search the local NVD mirror, then refresh it from the NVD API and search again.
+
+    When the mirror holds the full feed, the refresh is an incremental
+    sync; otherwise every NVD record matching the keyword is fetched.
+    """
+    result_ready = Signal(list)
+    error_occurred = Signal(str)
+    status = Signal(str)
+
+    REFRESH_AFTER = datetime.timedelta(hours=2)
+
+    def __init__(self, keyword, online=True, api_key=None, parent=None):
+        super().__init__(parent)
+        self.keyword = keyword
+        self.online = online
+        self.client = cve_store.NvdClient(api_key)
+
+    def stop(self):
+        self.client.cancel()
+
     def run(self):
-        base_url = "https://services.nvd.nist.gov/rest/json/cves/2.0"
-        now = datetime.datetime.now(datetime.timezone.utc)
-        month_ago = now - datetime.timedelta(days=30)
-        
-        params = {
-            'keywordSearch': self.keyword,
-            'pubEndDate': now.isoformat().replace('+00:00', 'Z'),
-            'pubStartDate': month_ago.isoformat().replace('+00:00', 'Z')
-        }
-        
+        store = cve_store.get_store()
+        local = store.search(self.keyword)
+        self.result_ready.emit(local)
+        if not self.online:
+            return
+        try:
+            stats = store.stats()
+            if stats['complete']:
+                age = datetime.datetime.now(datetime.timezone.utc) - stats['last_sync']
+                if age < self.REFRESH_AFTER:
+                    return
+                self.status.emit('Updating the local CVE mirror…')
+                store.sync(self.client, progress=self.status.emit)
+            else:
+                self.status.emit(f"Fetching NVD records for '{self.keyword}'…")
+                store.fetch_keyword(self.client, self.keyword, progress=self.status.emit)
+            self.result_ready.emit(store.search(self.keyword))
+        except cve_store.SyncCancelled:
+            pass
+        except requests.exceptions.RequestException as e:
+            self.error_occurred.emit(f"Network error: Could not connect to the NVD API.\nDetails: {e}")
+        except json.JSONDecodeError:
+            self.error_occurred.emit("API Error: Could not parse the response from the NVD API.")
+
+
+class CveSyncWorker(QThread):
+    """Mirror the NVD CVE feed locally: a resumable full pass first, incremental updates afterwards."""
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, api_key=None, parent=None):
+        super().__init__(parent)
+        self.client = cve_store.NvdClient(api_key)
+
+    def stop(self):
+        self.client.cancel()
+
+    def run(self):
+        t0 = time.time()
         try:
-            response = requests.get(base_url, params=params, timeout=15); response.raise_for_status()
-            self.result_ready.emit(response.json())
-        except requests.exceptions.RequestException as e: self.error_occurred.emit(f"Network error: Could not connect to the NVD API.\nDetails: {e}")
-        except json.JSONDecodeError: self.error_occurred.emit("API Error: Could not parse the response from the NVD API.")
+            stored = cve_store.get_store().sync(self.client, progress=self.status.emit)
+            self.finished.emit(f'Mirror sync complete: {stored} records stored in {time.time() - t0:.0f} s.')
+        except cve_store.SyncCancelled:
+            self.finished.emit('Mirror sync stopped; it will resume where it left off.')
+        except requests.exceptions.RequestException as e:
+            self.finished.emit(f'Mirror sync failed: {e}')
+        except json.JSONDecodeError:
+            self.finished.emit('Mirror sync failed: could not parse the response from the NVD API.')
+
+class InventoryCveWorker(QThread):
+    """Match the software found on discovered hosts (SNMP sysDescr, service banners) against the CVE mirror."""
+    rows_ready = Signal(list)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, hosts, grab_banners=True, parent=None):
+        super().__init__(parent)
+        self.hosts = list(hosts)
+        self.ports = cpe_match.BANNER_PORTS if grab_banners else ()
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        t0 = time.time()
+        try:
+            if not cve_store.get_store().stats()['count']:
+                self.finished.emit('The local CVE mirror is empty; sync it from the Vulnerability Scanner first.')
+                return
+            self.status.emit(f'Identifying software on {len(self.hosts)} host(s)…')
+            found = cpe_match.inventory(self.hosts, self.ports, progress=self.status.emit,
+                                        cancelled=lambda: not self._running)
+            products = [p for items in found.values() for p in items]
+            self.status.emit(f'Matching {len(products)} product(s) against the CVE mirror…')
+            matches = cpe_match.match(products)
+            rows, total = [], 0
+            for ip, items in found.items():
+                for product in items:
+                    for m in matches.get(product, []):
+                        rows.append((ip, product.source, cpe_match.cpe_name(product),
+                                     m['cve'], m['severity'], m['score']))
+                    if len(rows) >= 500:
+                        self.rows_ready.emit(rows)
+                        total += len(rows)
+                        rows = []
+            if rows:
+                self.rows_ready.emit(rows)
+                total += len(rows)
+            self.finished.emit(f'{len(products)} product(s) identified, {total} CVE match(es) '
+                               f'in {time.time() - t0:.1f} s.')
+        except Exception as e:
+            self.finished.emit(f'Error: {e}')
+
+
+class CrackWorker(QThread):
+    """Run a multi-process dictionary, rule-based or mask attack against one or more hashes."""
+    found = Signal(str, str)
+    progress = Signal(int)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, algorithm, targets, fmt='plain', wordlist=None, rules=None, mask=None, parent=None):
+        super().__init__(parent)
+        self.cracker = cracker.HashCracker(algorithm, targets, fmt, wordlist=wordlist, rules=rules, mask=mask)
+
+    def stop(self):
+        self.cracker.cancel()
+
+    def run(self):
+        t0 = time.perf_counter()
+        tried = 0
+
+        def on_progress(done, total, count, elapsed):
+            nonlocal tried
+            tried = count
+            self.progress.emit(int(done * 100 / total) if total else 100)
+            self.status.emit(f'Tried {count:,} candidates — {count / max(elapsed, 1e-6) / 1e6:.2f} M hashes/s '
+                             f'on {self.cracker.workers} processes…')
+
+        try:
+            found = self.cracker.run(on_found=self.found.emit, on_progress=on_progress)
+        except Exception as e:
+            self.finished.emit(f'Error: {e}')
+            return
+        elapsed = time.perf_counter() - t0
+        verb = 'Stopped' if self.cracker.cancelled else 'Finished'
+        self.finished.emit(f'{verb}: cracked {len(found)} of {len(self.cracker.targets)} hash(es) — '
+                           f'{tried:,} candidates in {elapsed:.1f} s ({tried / max(elapsed, 1e-6) / 1e6:.2f} M/s).')
+
+
+class NoteSaveWorker(QThread):
+    """Write a serialized note to disk atomically, off the GUI thread."""
+    saved = Signal(str, int)
+    error_occurred = Signal(str)
+
+    def __init__(self, path, text, revision=-1, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.text = text
+        self.revision = revision
+
+    def run(self):
+        try:
+            notes.write_note(self.path, self.text)
+            self.saved.emit(self.path, self.revision)
+        except OSError as e:
+            self.error_occurred.emit(f'Failed to save notes: {e}')
+
+class PasswordStrengthWorker(QThread):
+    """Analyze one password with zxcvbn; the result carries the password so stale ones can be dropped."""
+    result_ready = Signal(str, dict)
+
+    def __init__(self, password, parent=None):
+        super().__init__(parent)
+        self.password = password
+
+    def run(self):
+        self.result_ready.emit(self.password, password_audit.analyze(self.password))
+
+class PasswordAuditWorker(QThread):
+    """Score every password in a file on a process pool and summarise the strength distribution."""
+    result_ready = Signal(dict)
+    progress = Signal(int)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        t0 = time.time()
+        try:
+            passwords = password_audit.read_passwords(self.path)
+        except OSError as e:
+            self.finished.emit(f'Error: could not read the password file: {e}')
+            return
+        if not passwords:
+            self.finished.emit('The file contains no passwords.')
+            return
+
+        def on_progress(done, total):
+            self.progress.emit(int(done * 100 / total))
+            self.status.emit(f'Scored {done:,} of {total:,} distinct passwords…')
+
+        summary = password_audit.audit(passwords, on_progress, cancelled=lambda: not self._running)
+        if summary is None:
+            self.finished.emit('Audit stopped.')
+            return
+        self.result_ready.emit(summary)
+        self.finished.emit(f'Audited {summary["total"]:,} passwords ({summary["unique"]:,} distinct) '
+                           f'in {time.time() - t0:.1f} s.')
+
+class FileHashWorker(QThread):
+    """Hash one file with several algorithms in a single streaming pass."""
+    result_ready = Signal(dict)
+    progress = Signal(int)
+    status = Signal(str)
+    error_occurred = Signal(str)
+
+    def __init__(self, path, algorithms=file_hash.ALGORITHMS, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.algorithms = list(algorithms)
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        def on_progress(done, total, elapsed):
+            self.progress.emit(int(done * 100 / total) if total else 100)
+            self.status.emit(f'Hashed {done / 2**20:,.0f} of {total / 2**20:,.0f} MiB — '
+                             f'{done / max(elapsed, 1e-6) / 2**20:,.0f} MiB/s…')
+
+        t0 = time.perf_counter()
+        try:
+            digests = file_hash.hash_file(self.path, self.algorithms, on_progress, lambda: not self._running)
+        except file_hash.HashCancelled:
+            self.status.emit('Hashing cancelled.')
+            return
+        except OSError as e:
+            self.error_occurred.emit(f'Could not read or hash the file:\n{e}')
+            return
+        elapsed = time.perf_counter() - t0
+        size = os.path.getsize(self.path)
+        self.status.emit(f'Hashed {os.path.basename(self.path)} ({size / 2**20:,.1f} MiB) with '
+                         f'{len(self.algorithms)} algorithms in {elapsed:.1f} s '
+                         f'({size / max(elapsed, 1e-6) / 2**20:,.0f} MiB/s).')
+        self.result_ready.emit(digests)
+
+class DirectoryHashWorker(QThread):
+    """Hash every file below a directory, optionally writing a sha256sum-compatible manifest."""
+    rows_ready = Signal(list)
+    progress = Signal(int)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, root, algorithm='sha256', manifest=None, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.algorithm = algorithm
+        self.manifest = manifest
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        t0 = time.time()
+        self.status.emit(f'Listing files below {self.root}…')
+        files = file_hash.walk_files(self.root, exclude=[self.manifest] if self.manifest else ())
+        entries, rows, cached, failed, last = [], [], 0, 0, 0.0
+        records = file_hash.digest_files(files, self.algorithm, self.root, file_hash.get_cache(),
+                                         cancelled=lambda: not self._running)
+        for done, (path, size, digest, from_cache, error) in enumerate(records, 1):
+            relpath = os.path.relpath(path, self.root)
+            if error:
+                failed += 1
+                rows.append([relpath, size, 'ERROR', error, None])
+            else:
+                cached += from_cache
+                entries.append((digest, relpath))
+                rows.append([relpath, size, 'Hashed', digest, 'yes' if from_cache else 'no'])
+            if time.time() - last > 0.1 or done == len(files):
+                self.rows_ready.emit(rows)
+                rows, last = [], time.time()
+                self.progress.emit(int(done * 100 / len(files)))
+                self.status.emit(f'Hashed {done} of {len(files)} files ({cached} from cache)…')
+        if rows:
+            self.rows_ready.emit(rows)
+        if not self._running:
+            self.finished.emit(f'Stopped after {len(entries)} of {len(files)} files; no manifest was written.')
+            return
+        summary = f'Hashed {len(entries)} files ({cached} from cache, {failed} unreadable) in {time.time() - t0:.1f} s'
+        if self.manifest:
+            try:
+                file_hash.write_manifest(self.manifest, entries, self.algorithm)
+            except OSError as e:
+                self.finished.emit(f'{summary}, but the manifest could not be written: {e}')
+                return
+            summary += f'; manifest written to {self.manifest}'
+        self.finished.emit(summary + '.')
+
+class ManifestVerifyWorker(QThread):
+    """Check every file listed in a checksum manifest, relative to the manifest's directory."""
+    rows_ready = Signal(list)
+    progress = Signal(int)
+    status = Signal(str)
+    finished = Signal(str)
+
+    def __init__(self, manifest, parent=None):
+        super().__init__(parent)
+        self.manifest = manifest
+        self._running = True
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        t0 = time.time()
+        try:
+            with open(self.manifest, 'r', encoding='utf-8') as f:
+                tagged, entries = file_hash.parse_manifest(f.read())
+            algorithm = file_hash.manifest_algorithm(self.manifest, entries, tagged)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            self.finished.emit(f'Error: could not read the manifest: {e}')
+            return
+        if not entries:
+            self.finished.emit('The manifest lists no files.')
+            return
+        base = os.path.dirname(os.path.abspath(self.manifest))
+        expected = {os.path.normpath(os.path.join(base, rel)): (rel, digest) for digest, rel in entries}
+        counts = {'OK': 0, 'FAILED': 0, 'MISSING': 0, 'ERROR': 0}
+        rows, cached, last = [], 0, 0.0
+        self.status.emit(f'Verifying {len(expected)} files with {file_hash.LABELS[algorithm]}…')
+        records = file_hash.digest_files(list(expected), algorithm, base, file_hash.get_cache(),
+                                         cancelled=lambda: not self._running)
+        for done, (path, size, digest, from_cache, error) in enumerate(records, 1):
+            relpath, wanted = expected[path]
+            if error:
+                state = 'ERROR' if os.path.exists(path) else 'MISSING'
+            else:
+                state = 'OK' if digest == wanted else 'FAILED'
+                cached += from_cache
+            counts[state] += 1
+            rows.append([relpath, size, state, digest or wanted, None if error else 'yes' if from_cache else 'no'])
+            if time.time() - last > 0.1 or done == len(expected):
+                self.rows_ready.emit(rows)
+                rows, last = [], time.time()
+                self.progress.emit(int(done * 100 / len(expected)))
+                self.status.emit(f'Verified {done} of {len(expected)} files ({cached} from cache)…')
+        if rows:
+            self.rows_ready.emit(rows)
+        verb = 'Stopped after verifying' if not self._running else 'Verified'
+        self.finished.emit(f'{verb} {sum(counts.values())} files in {time.time() - t0:.1f} s: '
+                           + ', '.join(f'{n} {state}' for state, n in counts.items() if n)
+                           + f' ({cached} from cache).')
 
 class BlacklistWorker(QThread):
-    """Check an IPv4 address against common DNSBL blacklist servers."""
+    """Check IPv4/IPv6 addresses against a catalogue of DNSBL blacklist zones."""
     result_ready = Signal(dict)
+    row_ready = Signal(dict)
     status = Signal(str)
     finished = Signal()
 
-    SERVERS = [
-        'zen.spamhaus.org',
-        'bl.spamcop.net',
-        'cbl.abuseat.org',
-        'dnsbl.sorbs.net',
-        'b.barracudacentral.org',
-        'dnsbl-1.uceprotect.net',
-        'spam.dnsbl.sorbs.net',
-        'psbl.surriel.com',
-        'dnsbl.dronebl.org',
-        'all.s5h.net',
-    ]
+    SERVERS = dnsbl.DEFAULT_ZONES
+    MAX_CONCURRENCY = 64
+    IN_FLIGHT_PER_WORKER = 2
 
-    def __init__(self, ip, parent=None):
+    def __init__(self, targets, zones=None, timeout=5.0, parent=None):
         super().__init__(parent)
-        self.ip = ip
+        self.targets = [targets] if isinstance(targets, str) else list(targets)
+        self.zones = list(zones) if zones else list(self.SERVERS)
+        self.timeout = timeout
+        self._running = True
+
+    def _check(self, ip, zone):
+        if not self._running:
+            return None
+        listed, response = dnsbl.check_listing(ip, zone, self.timeout)
+        return {'ip': ip, 'zone': zone, 'listed': listed, 'response': response}
 
     def run(self):
+        results = {}
+        total = len(self.targets) * len(self.zones)
+        done = 0
         try:
-            reversed_ip = '.'.join(reversed(self.ip.split('.')))
-            results = {}
-            for server in self.SERVERS:
-                self.status.emit(f"Checking {server}…")
-                query = f"{reversed_ip}.{server}"
-                try:
-                    addrs = socket.getaddrinfo(query, None, socket.AF_INET)
-                    addr = addrs[0][4][0] if addrs else '127.0.0.0'
-                    results[server] = (True, addr)
-                except socket.gaierror:
-                    results[server] = (False, 'Clean')
-                except Exception as e:
-                    results[server] = (None, str(e))
+            workers = max(1, min(self.MAX_CONCURRENCY, total))
+            lookups = ((ip, zone) for ip in self.targets for zone in self.zones)
+            in_flight = set()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                def submit():
+                    while self._running and len(in_flight) < workers * self.IN_FLIGHT_PER_WORKER:
+                        lookup = next(lookups, None)
+                        if lookup is None:
+                            return
+                        in_flight.add(pool.submit(self._check, *lookup))
+
+                submit()
+                while in_flight and self._running:
+                    completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        row = future.result()
+                        if row is None:
+                            continue
+                        done += 1
+                        if len(self.targets) == 1:
+                            results[row['zone']] = (row['listed'], row['response'])
+                        self.row_ready.emit(row)
+                        if done % 25 == 0 or done == total:
+                            self.status.emit(f"Checked {done}/{total} lookups…")
+                    submit()
             self.result_ready.emit(results)
         except Exception as e:
             self.result_ready.emit({'Error': (None, str(e))})
         self.finished.emit()
 
+    def stop(self):
+        self._running = False
+
 
 class IpInfoWorker(QThread):
-    """IP geolocation and ASN lookup via ip-api.com (free, no key needed)."""
+    """IP geolocation and ASN lookup via ip-api.com (free, no key needed), plus the local range database."""
     result_ready = Signal(dict)
     error_occurred = Signal(str)
 
-    def __init__(self, ip='', parent=None):
+    def __init__(self, ip='', online=True, parent=None):
         super().__init__(parent)
         self.ip = ip
+        self.online = online
 
     def run(self):
+        local = None
+        db = ip_ranges.get_database()
+        if self.ip and db is not None:
+            try:
+                local = db.lookup(self.ip)
+            except ValueError as e:
+                self.error_occurred.emit(str(e))
+                return
+            local = local or {'asn': None, 'country': '', 'name': 'Not found in local dataset', 'range': ''}
+        if not self.online:
+            if local is None:
+                self.error_occurred.emit('No local IP dataset is loaded; enable online lookups or load a dataset.'
+                                         if db is None else 'Enter an IP address for an offline lookup.')
+            else:
+                self.result_ready.emit({'query': self.ip, 'local': local})
+            return
         try:
             fields = 'status,message,continent,country,countryCode,regionName,city,zip,lat,lon,timezone,isp,org,as,asname,query,reverse'
             url = f"http://ip-api.com/json/{self.ip}?fields={fields}"
-            resp = requests.get(url, timeout=10)
+            resp = http_session.get(url, timeout=10)
             data = resp.json()
             if data.get('status') == 'fail':
                 self.error_occurred.emit(data.get('message', 'Lookup failed.'))
             else:
+                data['local'] = local
                 self.result_ready.emit(data)
         except Exception as e:
-            self.error_occurred.emit(f'IP lookup failed: {e}')
+            if local is not None:
+                self.result_ready.emit({'query': self.ip, 'local': local, 'online_error': str(e)})
+            else:
+                self.error_occurred.emit(f'IP lookup failed: {e}')
+
+
+class IpDatasetWorker(QThread):
+    """Compile IP-to-ASN/country dataset files into the local range index."""
+    result_ready = Signal(str)
+    error_occurred = Signal(str)
+    status = Signal(str)
+
+    def __init__(self, paths, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths)
+
+    def run(self):
+        try:
+            t0 = time.time()
+            v4, v6 = ip_ranges.install(self.paths, progress=self.status.emit)
+            self.result_ready.emit(f'Loaded {v4} IPv4 and {v6} IPv6 ranges in {time.time() - t0:.1f} s.')
+        except Exception as e:
+            self.error_occurred.emit(f'Could not load the dataset: {e}')
+
+
+class BulkIpEnrichWorker(QThread):
+    """Annotate many addresses with ASN, country and organization from the local range index."""
+    rows_ready = Signal(list)
+    finished = Signal(str)
+
+    BATCH = 500
+
+    def __init__(self, ips, parent=None):
+        super().__init__(parent)
+        self.ips = list(dict.fromkeys(ips))
+        self._running = True
+
+    def run(self):
+        db = ip_ranges.get_database()
+        if db is None:
+            self.finished.emit('No local IP dataset is loaded.')
+            return
+        t0, matched, batch = time.perf_counter(), 0, []
+        for ip in self.ips:
+            if not self._running:
+                break
+            try:
+                record = db.lookup(ip)
+            except ValueError:
+                continue
+            matched += record is not None
+            batch.append(dict(record or {'asn': None, 'country': '', 'name': '', 'range': ''}, ip=ip))
+            if len(batch) >= self.BATCH:
+                self.rows_ready.emit(batch)
+                batch = []
+        if batch:
+            self.rows_ready.emit(batch)
+        elapsed = time.perf_counter() - t0
+        verb = 'stopped' if not self._running else 'complete'
+        self.finished.emit(f'Enrichment {verb}: {matched}/{len(self.ips)} addresses matched in {elapsed:.2f} s.')
+
+    def stop(self):
+        self._running = False
 
 
 class SmtpTestWorker(QThread):
@@ -337,10 +927,8 @@ class SmtpTestWorker(QThread):
             '=' * 52,
         ]
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(8)
             t0 = time.time()
-            sock.connect((self.host, self.port))
+            sock = dns_cache.create_connection(self.host, self.port, timeout=8)
             ms = int((time.time() - t0) * 1000)
             banner = sock.recv(1024).decode('utf-8', errors='replace').strip()
             lines += [f'Connected in {ms} ms', f'Server banner: {banner}', '']
@@ -365,112 +953,331 @@ class DnsLookupWorker(QThread):
 
     RECORD_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME', 'SOA', 'PTR', 'SRV']
 
-    def __init__(self, host, record_type='A', parent=None):
+    def __init__(self, host, record_type='A', use_cache=True, parent=None):
         super().__init__(parent)
         self.host = host
         self.record_type = record_type
+        self.use_cache = use_cache
 
     def run(self):
         try:
-            flags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
-            cmd = ['nslookup', f'-type={self.record_type}', self.host]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10,
-                                    creationflags=flags)
-            output = (result.stdout + (result.stderr or '')).strip() or 'No results returned.'
-            self.result_ready.emit(output)
-        except FileNotFoundError:
+            resp = dns_cache.resolve(self.host, self.record_type, fresh=not self.use_cache)
+            self.result_ready.emit(self._format_response(resp))
+        except dns_client.DnsError as e:
             try:
                 addrs = socket.getaddrinfo(self.host, None)
-                seen, lines = set(), []
+                seen, lines = set(), [f'DNS query failed ({e}); system resolver results:', '']
                 for fam, _, _, _, addr in addrs:
                     ip = addr[0]
                     if ip not in seen:
                         seen.add(ip)
                         lines.append(f"{socket.AddressFamily(fam).name}: {ip}")
-                self.result_ready.emit('\n'.join(lines) or 'No addresses found.')
-            except Exception as e2:
-                self.result_ready.emit(f'Error: {e2}')
+                self.result_ready.emit('\n'.join(lines))
+            except Exception:
+                self.result_ready.emit(f'Error: {e}')
         except Exception as e:
             self.result_ready.emit(f'Error: {e}')
         self.finished.emit()
 
+    def _format_response(self, resp):
+        qname = resp.question[0] if resp.question else self.host
+        origin = 'cached answer' if resp.from_cache else f'{resp.protocol}, {resp.elapsed_ms} ms'
+        lines = [
+            f"Server  :  {resp.server}  ({origin})",
+            f"Query   :  {qname}  {self.record_type}",
+            f"Status  :  {resp.rcode_name}{'  (authoritative)' if resp.authoritative else ''}",
+        ]
+        for title, records in (('ANSWER', resp.answers), ('AUTHORITY', resp.authority),
+                               ('ADDITIONAL', resp.additional)):
+            if not records:
+                continue
+            width = max(len(r.name) for r in records)
+            lines += ['', f'{title} SECTION:']
+            lines += [f"  {r.name:<{width}}  {r.ttl:>7}  IN  {r.type_name:<5}  {r.to_text()}"
+                      for r in records]
+        if not resp.answers and resp.rcode == 0:
+            lines += ['', f'No {self.record_type} records found.']
+        stats = dns_cache.stats()
+        lines += ['', f"Cache   :  {stats['hits'] + stats['negative_hits']} hits, {stats['misses']} misses, "
+                      f"{stats['entries']} entries ({stats['hit_rate']:.0%} hit rate)"]
+        return '\n'.join(lines)
+
 
 class WhoisWorker(QThread):
     result_ready = Signal(str)
     error_occurred = Signal(str)
     finished = Signal()
 
-    def __init__(self, query, parent=None):
+    def __init__(self, query, use_cache=True, parent=None):
         super().__init__(parent)
         self.query = query
+        self.use_cache = use_cache
 
-    @staticmethod
-    def _raw_whois(query, server):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(15)
-            s.connect((server, 43))
-            s.sendall((query + '\r\n').encode())
-            chunks = []
-            while True:
-                chunk = s.recv(4096)
-                if not chunk:
-                    break
-                chunks.append(chunk)
-        return b''.join(chunks).decode('utf-8', errors='replace')
-
-    def run(self):
-        try:
-            query = self.query.strip()
-            result = self._raw_whois(query, 'whois.iana.org')
-            for line in result.splitlines():
-                lower = line.lower()
-                if lower.startswith('whois:') or lower.startswith('refer:'):
-                    server = line.split(':', 1)[1].strip()
-                    if server:
-                        try:
-                            result = self._raw_whois(query, server)
-                        except Exception:
-                            pass
-                    break
-            self.result_ready.emit(result)
+    def run(self):
+        try:
+            text, server, from_cache = whois_client.get_client().lookup(self.query, self.use_cache)
+            origin = 'cached result' if from_cache else 'live query'
+            self.result_ready.emit(
+                f'% Whois server: {server}  ({origin})\n{self._format_fields(whois_parser.parse(text))}\n{text}'
+            )
         except Exception as e:
             self.error_occurred.emit(f'Whois query failed: {e}')
         self.finished.emit()
 
+    @staticmethod
+    def _format_fields(fields):
+        labels = [('registrar', 'Registrar'), ('org', 'Organization'), ('created', 'Created'),
+                  ('updated', 'Updated'), ('expires', 'Expires'), ('name_servers', 'Name Servers'),
+                  ('netblock', 'Netblock'), ('net_name', 'Net Name'), ('asn', 'ASN'),
+                  ('country', 'Country'), ('status', 'Status')]
+        lines = [f'%   {label:<13}:  {", ".join(v) if isinstance(v, list) else v}'
+                 for key, label in labels if (v := fields.get(key))]
+        return '\n'.join(['%', '% Parsed fields:'] + lines + ['%']) if lines else ''
+
+
+class BulkWhoisWorker(QThread):
+    """Whois many queries: one paced queue per whois server, servers worked in parallel."""
+    row_ready = Signal(dict)
+    status = Signal(str)
+    finished = Signal(str)
+
+    MAX_SERVERS = 16
+
+    def __init__(self, queries, use_cache=True, parent=None):
+        super().__init__(parent)
+        self.queries = list(dict.fromkeys(q.strip() for q in queries if q.strip()))
+        self.use_cache = use_cache
+        self._running = True
+        self._done = 0
+        self._count_lock = threading.Lock()
+
+    def _emit_row(self, query, server, text=None, from_cache=False, error=None):
+        with self._count_lock:
+            self._done += 1
+        self.row_ready.emit({
+            'query': query, 'server': server, 'cached': from_cache,
+            'text': text or '', 'error': error,
+            'fields': whois_parser.parse(text) if text else {},
+        })
+        if self._done % 20 == 0:
+            self.status.emit(f'Whois: {self._done}/{len(self.queries)} done…')
+
+    def _work_server(self, client, server, queries):
+        for query in queries:
+            if not self._running:
+                return
+            try:
+                text, server_used, from_cache = client.lookup(query, self.use_cache)
+                self._emit_row(query, server_used, text, from_cache)
+            except Exception as e:
+                self._emit_row(query, server, error=str(e))
+
+    def run(self):
+        client = whois_client.get_client()
+        groups = {}
+        for query in self.queries:
+            if not self._running:
+                break
+            if self.use_cache and (row := client.cached_result(query)):
+                self._emit_row(query, row[0], row[2], True)
+                continue
+            try:
+                server, _ = client.referral_server(query)
+            except Exception as e:
+                self._emit_row(query, whois_client.IANA_SERVER, error=str(e))
+                continue
+            groups.setdefault(server, []).append(query)
+
+        if groups and self._running:
+            self.status.emit(f'Querying {sum(map(len, groups.values()))} names across {len(groups)} whois servers…')
+            with ThreadPoolExecutor(max_workers=min(self.MAX_SERVERS, len(groups))) as pool:
+                for future in [pool.submit(self._work_server, client, server, queries)
+                               for server, queries in groups.items()]:
+                    future.result()
+        # Bulk runs are what fill the result cache, so expired entries are trimmed after each one
+        client.purge_expired()
+        verb = 'stopped' if not self._running else 'complete'
+        self.finished.emit(f'Bulk whois {verb}: {self._done}/{len(self.queries)} queries processed.')
+
+    def stop(self):
+        self._running = False
+
+
+SECURITY_HEADERS = (
+    'Strict-Transport-Security',
+    'Content-Security-Policy',
+    'X-Frame-Options',
+    'X-Content-Type-Options',
+    'Referrer-Policy',
+    'Permissions-Policy',
+)
+
+
+def _http_error_message(error, timeout):
+    if isinstance(error, requests.exceptions.SSLError):
+        return f'SSL Error: {error}'
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return f'Connection Error: {error}'
+    if isinstance(error, requests.exceptions.Timeout):
+        return f'Request timed out ({timeout:g} s).'
+    return f'Error: {error}'
+
 
 class HttpHeadersWorker(QThread):
     result_ready = Signal(dict)
     error_occurred = Signal(str)
 
+    TIMEOUT = 15
+    # Servers that reject or don't implement HEAD; these are retried with GET
+    HEAD_FALLBACK_STATUS = (400, 403, 404, 405, 501)
+
     def __init__(self, url, parent=None):
         super().__init__(parent)
         self.url = url
 
+    @staticmethod
+    def normalize_url(url):
+        url = url.strip()
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        return url
+
+    @classmethod
+    def fetch(cls, url, timeout=TIMEOUT, head_first=False):
+        """Fetch ``url`` following redirects and describe the response.
+
+        With ``head_first`` a HEAD request is tried first and GET is only
+        used when the server refuses HEAD; GET bodies are not downloaded.
+        Network errors propagate as ``requests`` exceptions.
+        """
+        url = cls.normalize_url(url)
+        method, resp = 'GET', None
+        if head_first:
+            resp = http_session.head(url, timeout=timeout, allow_redirects=True)
+            method = 'HEAD'
+            if resp.status_code in cls.HEAD_FALLBACK_STATUS:
+                resp.close()
+                resp = None
+        if resp is None:
+            method = 'GET'
+            resp = http_session.get(url, timeout=timeout, allow_redirects=True, stream=head_first)
+        resp.close()
+        hops = list(resp.history) + [resp]
+        return {
+            'url': url,
+            'method': method,
+            'final_url': resp.url,
+            'status': resp.status_code,
+            'reason': resp.reason,
+            'elapsed_ms': round(sum(r.elapsed.total_seconds() for r in hops) * 1000),
+            'redirects': [r.url for r in resp.history],
+            'hops': [(r.url, r.status_code, round(r.elapsed.total_seconds() * 1000)) for r in hops],
+            'headers': dict(resp.headers),
+            'security': {name: resp.headers.get(name) for name in SECURITY_HEADERS},
+        }
+
     def run(self):
         try:
-            url = self.url.strip()
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-            resp = requests.get(
-                url, timeout=15, allow_redirects=True,
-                headers={'User-Agent': 'Ducky/1.3.0 (https://github.com/thecmdguy/Ducky)'}
-            )
-            self.result_ready.emit({
-                'final_url': resp.url,
-                'status': resp.status_code,
-                'reason': resp.reason,
-                'elapsed_ms': round(resp.elapsed.total_seconds() * 1000),
-                'redirects': [r.url for r in resp.history],
-                'headers': dict(resp.headers),
-            })
-        except requests.exceptions.SSLError as e:
-            self.error_occurred.emit(f'SSL Error: {e}')
-        except requests.exceptions.ConnectionError as e:
-            self.error_occurred.emit(f'Connection Error: {e}')
-        except requests.exceptions.Timeout:
-            self.error_occurred.emit('Request timed out (15 s).')
+            self.result_ready.emit(self.fetch(self.url, self.TIMEOUT))
         except Exception as e:
-            self.error_occurred.emit(f'Error: {e}')
+            self.error_occurred.emit(_http_error_message(e, self.TIMEOUT))
+
+
+class BulkHttpAuditWorker(QThread):
+    """Fetch many URLs through a bounded pool, HEAD first with GET fallback."""
+    row_ready = Signal(dict)
+    status = Signal(str)
+    finished = Signal(str)
+
+    MAX_CONCURRENCY = 32
+    TIMEOUT = 10
+
+    def __init__(self, urls, head_first=True, parent=None):
+        super().__init__(parent)
+        self.urls = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
+        self.head_first = head_first
+        self._running = True
+
+    def _audit(self, url):
+        if not self._running:
+            return None
+        try:
+            row = HttpHeadersWorker.fetch(url, self.TIMEOUT, self.head_first)
+            row['error'] = None
+        except Exception as e:
+            row = {'url': HttpHeadersWorker.normalize_url(url), 'error': _http_error_message(e, self.TIMEOUT)}
+        return row
+
+    def run(self):
+        done, failed = 0, 0
+        workers = max(1, min(self.MAX_CONCURRENCY, len(self.urls)))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [pool.submit(self._audit, url) for url in self.urls]
+            for future in as_completed(futures):
+                row = future.result()
+                if row is None:
+                    continue
+                done += 1
+                failed += row['error'] is not None
+                self.row_ready.emit(row)
+                if done % 25 == 0:
+                    self.status.emit(f'Audited {done}/{len(self.urls)} URLs…')
+                if not self._running:
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        verb = 'stopped' if not self._running else 'complete'
+        self.finished.emit(f'HTTP audit {verb}: {done}/{len(self.urls)} URLs processed, {failed} failed.')
+
+    def stop(self):
+        self._running = False
+
+
+class HttpTimingWorker(QThread):
+    """Time DNS, connect, TLS, first byte and transfer for one or more fresh requests."""
+    sample_ready = Signal(int, dict)
+    result_ready = Signal(dict)
+    error_occurred = Signal(str)
+
+    TIMEOUT = 15
+
+    def __init__(self, url, samples=1, interval=0.25, parent=None):
+        super().__init__(parent)
+        self.url = url
+        self.samples = max(1, int(samples))
+        self.interval = interval
+        self._running = True
+
+    def run(self):
+        url = HttpHeadersWorker.normalize_url(self.url)
+        samples, errors = [], 0
+        for i in range(self.samples):
+            if not self._running:
+                break
+            try:
+                sample = http_timing.measure(url, self.TIMEOUT)
+                samples.append(sample)
+                self.sample_ready.emit(i + 1, sample._asdict())
+            except Exception as e:
+                errors += 1
+                if self.samples == 1:
+                    self.error_occurred.emit(f'Error: {e}')
+                    return
+            if self._running and i + 1 < self.samples:
+                time.sleep(self.interval)
+        if not samples:
+            self.error_occurred.emit(f'All {errors} request(s) to {url} failed.')
+            return
+        last = samples[-1]
+        self.result_ready.emit({
+            'url': url, 'address': last.address, 'status': last.status, 'reason': last.reason,
+            'bytes': last.bytes, 'samples': len(samples), 'errors': errors,
+            'summary': http_timing.summarize(samples),
+        })
+
+    def stop(self):
+        self._running = False
 
 
 class SslCheckerWorker(QThread):
@@ -488,7 +1295,7 @@ class SslCheckerWorker(QThread):
             ctx = _ssl.create_default_context()
             ctx.check_hostname = False
             ctx.verify_mode = _ssl.CERT_OPTIONAL
-            with socket.create_connection((self.host, self.port), timeout=10) as raw:
+            with dns_cache.create_connection(self.host, self.port, timeout=10) as raw:
                 with ctx.wrap_socket(raw, server_hostname=self.host) as tls:
                     cert = tls.getpeercert()
                     cipher = tls.cipher()
@@ -512,6 +1319,101 @@ class SslCheckerWorker(QThread):
             self.error_occurred.emit(f'SSL check failed: {e}')
 
 
+class TlsInventoryWorker(QThread):
+    """Handshake with many host:port endpoints concurrently and store what they present."""
+    row_ready = Signal(dict)
+    status = Signal(str)
+    finished = Signal(str)
+
+    MAX_CONCURRENCY = 128
+    IN_FLIGHT_PER_WORKER = 2
+    BATCH = 100
+
+    def __init__(self, targets, ports, parent=None):
+        super().__init__(parent)
+        self.endpoints = list(dict.fromkeys(
+            (host, port) for host, explicit in targets for port in ([explicit] if explicit else ports)
+        ))
+        self._running = True
+
+    def _probe(self, host, port):
+        if not self._running:
+            return None
+        return tls_inventory.probe(host, port)
+
+    def run(self):
+        inventory = tls_inventory.get_inventory()
+        pending, done, with_tls = [], 0, 0
+        workers = max(1, min(self.MAX_CONCURRENCY, len(self.endpoints)))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        endpoints = iter(self.endpoints)
+        in_flight = set()
+
+        def submit():
+            # A bounded window keeps large sweeps from queueing a future per endpoint up front
+            while self._running and len(in_flight) < workers * self.IN_FLIGHT_PER_WORKER:
+                endpoint = next(endpoints, None)
+                if endpoint is None:
+                    return
+                in_flight.add(pool.submit(self._probe, *endpoint))
+
+        try:
+            submit()
+            while in_flight and self._running:
+                completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    result = future.result()
+                    if result is None:
+                        continue
+                    done += 1
+                    with_tls += bool(result['chain'])
+                    pending.append(result)
+                    if len(pending) >= self.BATCH:
+                        inventory.record(pending)
+                        pending = []
+                    self.row_ready.emit(tls_inventory.describe(result))
+                    if done % 50 == 0:
+                        self.status.emit(f'Scanned {done}/{len(self.endpoints)} endpoints, {with_tls} with certificates…')
+                submit()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if pending:
+                inventory.record(pending)
+        verb = 'stopped' if not self._running else 'complete'
+        self.finished.emit(
+            f'TLS inventory {verb}: {done}/{len(self.endpoints)} endpoints scanned, {with_tls} presented certificates.'
+        )
+
+    def stop(self):
+        self._running = False
+
+
+class TlsEnumerationWorker(QThread):
+    result_ready = Signal(dict)
+    status = Signal(str)
+    error_occurred = Signal(str)
+
+    def __init__(self, host, port=443, use_cache=True, parent=None):
+        super().__init__(parent)
+        self.host = host
+        self.port = port
+        self.use_cache = use_cache
+        self._enumerator = None
+
+    def run(self):
+        try:
+            self._enumerator = tls_enum.TlsEnumerator()
+            self.result_ready.emit(self._enumerator.enumerate(
+                self.host, self.port, self.use_cache, progress=self.status.emit
+            ))
+        except Exception as e:
+            self.error_occurred.emit(f'Enumeration failed for {self.host}:{self.port}: {e}')
+
+    def stop(self):
+        if self._enumerator:
+            self._enumerator.cancel()
+
+
 class ImportWorker(QThread):
     session_found = Signal(dict)
     finished = Signal(int)
@@ -612,20 +1514,63 @@ class MacVendorWorker(QThread):
                 self.error_occurred.emit('Invalid MAC address — too short.')
                 return
             oui = ':'.join(mac_clean[i:i+2] for i in range(0, 6, 2))
+            mac = ':'.join(mac_clean[i:i+2] for i in range(0, 12, 2)) if len(mac_clean) == 12 else self.mac.upper()
+            value = oui_db.parse_mac(mac_clean)
+            db = oui_db.get_database()
+            if db is not None:
+                match = db.lookup_value(value)
+                if match:
+                    vendor, prefix, length = match
+                else:
+                    vendor, prefix, length = 'Unknown / Not in database', oui, 24
+                self.result_ready.emit({
+                    'mac': mac, 'oui': prefix, 'block': f'/{length}', 'vendor': vendor,
+                    'local': oui_db.is_locally_administered(value),
+                    'source': f'IEEE registry (offline, {db.count} assignments)',
+                })
+                return
             url = f'https://api.macvendors.com/{urllib.parse.quote(oui)}'
-            resp = requests.get(url, timeout=10, headers={'User-Agent': 'Ducky/1.4 (network toolkit)'})
+            resp = http_session.get(url, timeout=10)
             vendor = resp.text.strip() if resp.status_code == 200 else 'Unknown / Not in database'
             self.result_ready.emit({
-                'mac': ':'.join(mac_clean[i:i+2] for i in range(0, 12, 2)) if len(mac_clean) == 12 else self.mac.upper(),
-                'oui': oui,
-                'vendor': vendor,
+                'mac': mac, 'oui': oui, 'block': '/24', 'vendor': vendor,
+                'local': oui_db.is_locally_administered(value),
+                'source': 'macvendors.com (no offline registry installed)',
             })
+        except ValueError as e:
+            self.error_occurred.emit(str(e))
         except requests.exceptions.Timeout:
             self.error_occurred.emit('Request timed out (10 s).')
         except Exception as e:
             self.error_occurred.emit(f'Vendor lookup failed: {e}')
 
 
+class OuiUpdateWorker(QThread):
+    """Install the IEEE OUI registries, downloaded or from local CSV files."""
+    result_ready = Signal(str)
+    error_occurred = Signal(str)
+
+    def __init__(self, paths=None, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths or [])
+
+    def run(self):
+        try:
+            if self.paths:
+                texts = []
+                for path in self.paths:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        texts.append(f.read())
+                count = oui_db.install(texts)
+                source = f'{len(self.paths)} file(s)'
+            else:
+                count = oui_db.download()
+                source = 'standards-oui.ieee.org'
+            self.result_ready.emit(f'Installed {count} vendor assignments from {source}.')
+        except Exception as e:
+            self.error_occurred.emit(f'Could not update the vendor database: {e}')
+
+
 class DnsPropagationWorker(QThread):
     row_ready = Signal(dict)
     finished = Signal(str)
@@ -641,56 +1586,96 @@ class DnsPropagationWorker(QThread):
         ('Level3',         '4.2.2.2'),
     ]
 
-    def __init__(self, domain, record_type='A', parent=None):
+    MAX_CONCURRENCY = 64
+    TIMEOUT = 4
+
+    def __init__(self, domain, record_type='A', servers=None, parent=None):
         super().__init__(parent)
         self.domain = domain
         self.record_type = record_type
+        self.servers = list(servers) if servers else list(self.SERVERS)
+        self._running = True
+
+    @staticmethod
+    def parse_resolver_list(text):
+        """Parse ``ip``, ``name,ip`` or ``ip name`` lines.
+
+        Returns ``(servers, rejected)``: ``(name, ip)`` pairs, and ``(line_no, line)``
+        for lines without exactly one IP address. Names may contain spaces when
+        the line is comma-separated.
+        """
+        servers, rejected, seen = [], [], set()
+        for line_no, raw in enumerate(text.splitlines(), 1):
+            line = raw.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if ',' in line:
+                fields = [f.strip() for f in next(csv.reader([line], skipinitialspace=True))]
+            else:
+                fields = line.split()
+            ips, names = [], []
+            for field in filter(None, fields):
+                try:
+                    ips.append(str(ipaddress.ip_address(field)))
+                except ValueError:
+                    names.append(field)
+            if len(ips) != 1:
+                rejected.append((line_no, raw.strip()))
+                continue
+            ip = ips[0]
+            if ip not in seen:
+                seen.add(ip)
+                servers.append((' '.join(names) or ip, ip))
+        return servers, rejected
 
     def _query(self, server_ip):
         try:
-            flags = subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win') else 0
-            result = subprocess.run(
-                ['nslookup', f'-type={self.record_type}', self.domain, server_ip],
-                capture_output=True, text=True, timeout=8, creationflags=flags
-            )
-            output = result.stdout + result.stderr
-            lower = output.lower()
-
-            if any(x in lower for x in ['nxdomain', "can't find", 'non-existent']):
-                return False, 'NXDOMAIN'
-            if not output.strip() or 'timed out' in lower:
-                return None, 'Timeout'
-
-            # Find the answer section (after server header), then extract IPs
-            answer_part = output
-            for marker in ['non-authoritative answer', 'authoritative answers']:
-                idx = lower.find(marker)
-                if idx != -1:
-                    answer_part = output[idx:]
-                    break
-
-            ips = [m.group() for m in re.finditer(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', answer_part)
-                   if m.group() != server_ip]
-            if ips:
-                return True, ', '.join(list(dict.fromkeys(ips))[:3])
-
-            # Fall back to non-IP answer lines for MX/NS/TXT/CNAME records
-            for line in answer_part.splitlines()[2:]:
-                stripped = line.strip()
-                if stripped and not stripped.lower().startswith(('server', 'address', 'non-auth')):
-                    return True, stripped
-
-            return True, 'Resolved'
-        except subprocess.TimeoutExpired:
-            return None, 'Timeout (8 s)'
+            # Always live: a cached answer would hide the change being watched for
+            resp = dns_cache.resolve(self.domain, self.record_type, server=server_ip, timeout=self.TIMEOUT, fresh=True)
+            latency = resp.elapsed_ms
+            if resp.rcode == 3:
+                return False, 'NXDOMAIN', latency
+            if resp.rcode != 0:
+                return None, resp.rcode_name, latency
+            records = resp.records(self.record_type) or resp.answers
+            if not records:
+                return True, 'No records (NODATA)', latency
+            values = list(dict.fromkeys(r.to_text() for r in records))[:3]
+            return True, f"{', '.join(values)}  (TTL {min(r.ttl for r in records)})", latency
+        except dns_client.DnsTimeout:
+            return None, f'Timeout ({self.TIMEOUT} s)', None
         except Exception as e:
-            return None, f'Error: {e}'
+            return None, f'Error: {e}', None
+
+    def _check(self, name, ip):
+        if not self._running:
+            return None
+        status, result, latency = self._query(ip)
+        return {'name': name, 'ip': ip, 'status': status, 'result': result, 'latency_ms': latency}
 
     def run(self):
-        for name, ip in self.SERVERS:
-            status, result = self._query(ip)
-            self.row_ready.emit({'name': name, 'ip': ip, 'status': status, 'result': result})
-        self.finished.emit(f'Propagation check complete for {self.domain} ({self.record_type})')
+        answered, answers = 0, set()
+        workers = max(1, min(self.MAX_CONCURRENCY, len(self.servers)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._check, name, ip) for name, ip in self.servers]
+            for future in as_completed(futures):
+                row = future.result()
+                if row is None:
+                    continue
+                if row['status'] is not None:
+                    answered += 1
+                    answers.add(row['result'].rsplit('  (TTL', 1)[0])
+                self.row_ready.emit(row)
+        if not self._running:
+            self.finished.emit(f'Propagation check stopped for {self.domain} ({self.record_type})')
+            return
+        self.finished.emit(
+            f'Propagation check complete for {self.domain} ({self.record_type}) — '
+            f'{answered}/{len(self.servers)} resolvers answered, {len(answers)} distinct answer(s)'
+        )
+
+    def stop(self):
+        self._running = False
 
 
 class ArpRouteTableWorker(QThread):
@@ -0,0 +1,204 @@
+import datetime
+import hashlib
+import ipaddress
+
+# The handful of OIDs the inventory cares about
+OID_NAMES = {
+    '2.5.4.3': 'commonName',
+    '2.5.4.6': 'countryName',
+    '2.5.4.7': 'localityName',
+    '2.5.4.8': 'stateOrProvinceName',
+    '2.5.4.10': 'organizationName',
+    '2.5.4.11': 'organizationalUnitName',
+    '1.2.840.113549.1.9.1': 'emailAddress',
+}
+SIGNATURE_NAMES = {
+    '1.2.840.113549.1.1.5': 'sha1WithRSA',
+    '1.2.840.113549.1.1.11': 'sha256WithRSA',
+    '1.2.840.113549.1.1.12': 'sha384WithRSA',
+    '1.2.840.113549.1.1.13': 'sha512WithRSA',
+    '1.2.840.113549.1.1.10': 'rsassaPss',
+    '1.2.840.10045.4.3.2': 'ecdsaWithSHA256',
+    '1.2.840.10045.4.3.3': 'ecdsaWithSHA384',
+    '1.2.840.10045.4.3.4': 'ecdsaWithSHA512',
+    '1.3.101.112': 'ed25519',
+    '1.3.101.113': 'ed448',
+}
+KEY_NAMES = {
+    '1.2.840.113549.1.1.1': 'RSA',
+    '1.2.840.10045.2.1': 'EC',
+    '1.3.101.112': 'Ed25519',
+    '1.3.101.113': 'Ed448',
+}
+_OID_SAN = '2.5.29.17'
+_OID_BASIC_CONSTRAINTS = '2.5.29.19'
+
+
+class CertificateError(ValueError):
+    pass
+
+
+def _read_tlv(data, pos):
+    """Return ``(tag, value_start, value_end)`` for the DER element at ``pos``."""
+    if pos + 2 > len(data):
+        raise CertificateError('Truncated DER element')
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        count = length & 0x7F
+        if count == 0 or count > 4 or pos + count > len(data):
+            raise CertificateError('Unsupported DER length')
+        length = int.from_bytes(data[pos:pos + count], 'big')
+        pos += count
+    if pos + length > len(data):
+        raise CertificateError('Truncated DER element')
+    return tag, pos, pos + length
+
+
+def _children(data, start, end):
+    pos = start
+    while pos < end:
+        tag, vstart, vend = _read_tlv(data, pos)
+        yield tag, vstart, vend
+        pos = vend
+
+
+def _oid(raw):
+    if not raw:
+        return ''
+    parts = [raw[0] // 40, raw[0] % 40] if raw[0] < 80 else [2, raw[0] - 80]
+    value = 0
+    for byte in raw[1:]:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            parts.append(value)
+            value = 0
+    return '.'.join(map(str, parts))
+
+
+def _string(tag, raw):
+    if tag == 0x1E:  # BMPString
+        return raw.decode('utf-16-be', errors='replace')
+    if tag == 0x1C:  # UniversalString
+        return raw.decode('utf-32-be', errors='replace')
+    return raw.decode('utf-8', errors='replace')
+
+
+def _name(data, start, end):
+    """RDN sequence as a list of ``(attribute, value)`` pairs in certificate order."""
+    attrs = []
+    for _set_tag, sstart, send in _children(data, start, end):
+        for _seq_tag, astart, aend in _children(data, sstart, send):
+            (_t, ostart, oend), (vtag, vstart, vend) = list(_children(data, astart, aend))[:2]
+            oid = _oid(data[ostart:oend])
+            attrs.append((OID_NAMES.get(oid, oid), _string(vtag, data[vstart:vend])))
+    return attrs
+
+
+def _time(tag, raw):
+    text = raw.decode('ascii', errors='replace').rstrip('Z')
+    fmt = '%y%m%d%H%M%S' if tag == 0x17 else '%Y%m%d%H%M%S'
+    try:
+        return datetime.datetime.strptime(text[:12 if tag == 0x17 else 14], fmt)
+    except ValueError:
+        return None
+
+
+def _alt_names(data, start, end):
+    names = []
+    for tag, vstart, vend in _children(data, start, end):
+        raw = data[vstart:vend]
+        if tag == 0x82:
+            names.append(('DNS', raw.decode('ascii', errors='replace')))
+        elif tag == 0x87 and len(raw) in (4, 16):
+            names.append(('IP Address', str(ipaddress.ip_address(raw))))
+        elif tag == 0x81:
+            names.append(('email', raw.decode('ascii', errors='replace')))
+        elif tag == 0x86:
+            names.append(('URI', raw.decode('ascii', errors='replace')))
+    return names
+
+
+def _key_info(data, start, end):
+    """Public key algorithm and size in bits (RSA modulus length or EC field size)."""
+    (_t, astart, aend), (_b, kstart, kend) = list(_children(data, start, end))[:2]
+    alg_parts = list(_children(data, astart, aend))
+    algorithm = _oid(data[alg_parts[0][1]:alg_parts[0][2]])
+    name = KEY_NAMES.get(algorithm, algorithm)
+    bits = None
+    if name == 'RSA':
+        # BIT STRING: one unused-bits byte, then SEQUENCE { modulus, exponent }
+        _s, sstart, send = _read_tlv(data, kstart + 1)
+        _i, mstart, mend = next(_children(data, sstart, send))
+        modulus = data[mstart:mend].lstrip(b'\x00')
+        bits = len(modulus) * 8 - (8 - modulus[0].bit_length()) if modulus else 0
+    elif name == 'EC':
+        # Uncompressed point: 0x04 || X || Y
+        bits = (kend - kstart - 2) // 2 * 8
+        bits = 521 if bits == 528 else bits
+    elif name in ('Ed25519', 'Ed448'):
+        bits = 256 if name == 'Ed25519' else 456
+    return name, bits
+
+
+def parse_certificate(der):
+    """Decode the fields of a DER certificate that an inventory needs.
+
+    Returns a dict with ``subject``/``issuer`` attribute lists, ``serial``
+    (hex), ``not_before``/``not_after`` (naive UTC datetimes),
+    ``subject_alt_names``, ``signature_algorithm``, ``key_type``,
+    ``key_bits``, ``is_ca`` and ``sha256``. Raises :class:`CertificateError`
+    on malformed input.
+    """
+    try:
+        _tag, cstart, cend = _read_tlv(der, 0)
+        _tbs_tag, tstart, tend = next(_children(der, cstart, cend))
+        fields = list(_children(der, tstart, tend))
+        if fields and fields[0][0] == 0xA0:  # [0] EXPLICIT version
+            fields = fields[1:]
+        serial, sig_alg, issuer, validity, subject, spki = fields[:6]
+        extensions = next((f for f in fields[6:] if f[0] == 0xA3), None)
+
+        (nb_tag, nb_start, nb_end), (na_tag, na_start, na_end) = list(_children(der, validity[1], validity[2]))[:2]
+        sig_oid = _oid(der[slice(*next(_children(der, sig_alg[1], sig_alg[2]))[1:])])
+        key_type, key_bits = _key_info(der, spki[1], spki[2])
+
+        sans, is_ca = [], False
+        if extensions:
+            _seq, estart, eend = _read_tlv(der, extensions[1])
+            for _t, xstart, xend in _children(der, estart, eend):
+                parts = list(_children(der, xstart, xend))
+                oid = _oid(der[parts[0][1]:parts[0][2]])
+                _oct, vstart, vend = parts[-1]
+                if oid == _OID_SAN:
+                    _s, sstart, send = _read_tlv(der, vstart)
+                    sans = _alt_names(der, sstart, send)
+                elif oid == _OID_BASIC_CONSTRAINTS:
+                    _s, bstart, bend = _read_tlv(der, vstart)
+                    first = next(_children(der, bstart, bend), None)
+                    is_ca = bool(first and first[0] == 0x01 and der[first[1]] != 0)
+        subject_name = _name(der, subject[1], subject[2])
+        issuer_name = _name(der, issuer[1], issuer[2])
+    except (StopIteration, ValueError, IndexError) as e:
+        raise CertificateError(f'Malformed certificate: {e}') from None
+
+    return {
+        'subject': subject_name,
+        'issuer': issuer_name,
+        'serial': der[serial[1]:serial[2]].hex().upper(),
+        'not_before': _time(nb_tag, der[nb_start:nb_end]),
+        'not_after': _time(na_tag, der[na_start:na_end]),
+        'subject_alt_names': sans,
+        'signature_algorithm': SIGNATURE_NAMES.get(sig_oid, sig_oid),
+        'key_type': key_type,
+        'key_bits': key_bits,
+        'is_ca': is_ca,
+        'sha256': hashlib.sha256(der).hexdigest().upper(),
+    }
+
+
+def common_name(attrs):
+    """First commonName (or, failing that, organizationName) of a parsed subject/issuer."""
+    values = dict(reversed(attrs))
+    return values.get('commonName') or values.get('organizationName') or ''
@@ -1,6 +1,7 @@
 import sys
 import os
 import ctypes
+import multiprocessing
 from PySide6.QtWidgets import QApplication, QSplashScreen
 from PySide6.QtGui import QPixmap, QFont
 from PySide6.QtCore import Qt
@@ -21,6 +22,8 @@ def run_as_admin():
     return
 
 def run():
+    # Frozen builds re-launch the executable for process-pool workers (hash cracker)
+    multiprocessing.freeze_support()
     run_as_admin()
     
     app = QApplication(sys.argv)
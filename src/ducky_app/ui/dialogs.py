@@ -110,13 +110,15 @@ class SettingsDialog(QDialog):
     settings_changed = Signal()
     def __init__(self, config_manager, parent=None):
         super().__init__(parent); self.setWindowTitle("Application Settings"); self.setGeometry(100, 100, 450, 350); self.config_manager = config_manager
-        self._temp_settings = {key: self.config_manager.get_setting(key) for key in ["terminal_bg_color", "terminal_font_color", "terminal_font_family", "terminal_font_size", "session_folder", "app_theme"]}
+        self._temp_settings = {key: self.config_manager.get_setting(key) for key in ["terminal_bg_color", "terminal_font_color", "terminal_font_family", "terminal_font_size", "session_folder", "app_theme", "nvd_api_key"]}
         layout = QVBoxLayout(self); layout.addWidget(QLabel("<h3>Terminal Appearance</h3>")); self.btn_bg_color = QPushButton("Choose Background Color"); self.btn_font_color = QPushButton("Choose Font Color")
         self.btn_font = QPushButton("Choose Font"); layout.addWidget(self.btn_bg_color); layout.addWidget(self.btn_font_color); layout.addWidget(self.btn_font)
         layout.addWidget(QLabel("<h3>Application Theme</h3>")); theme_layout = QHBoxLayout(); theme_layout.addWidget(QLabel("Theme:")); self.theme_combo = QComboBox()
         self.theme_combo.addItems(["Dark", "Light"]); self.theme_combo.setCurrentText(self._temp_settings["app_theme"].capitalize()); theme_layout.addWidget(self.theme_combo); theme_layout.addStretch(); layout.addLayout(theme_layout)
         layout.addWidget(QLabel("<h3>Session Management</h3>")); folder_layout = QHBoxLayout(); folder_layout.addWidget(QLabel("Session Folder:")); self.session_folder_edit = QLineEdit(self._temp_settings["session_folder"])
         self.session_folder_edit.setReadOnly(True); self.btn_browse_folder = QPushButton("Browse"); folder_layout.addWidget(self.session_folder_edit); folder_layout.addWidget(self.btn_browse_folder); layout.addLayout(folder_layout)
+        layout.addWidget(QLabel("<h3>Vulnerability Data</h3>")); key_layout = QHBoxLayout(); key_layout.addWidget(QLabel("NVD API Key:")); self.nvd_key_edit = QLineEdit(self._temp_settings["nvd_api_key"] or "")
+        self.nvd_key_edit.setEchoMode(QLineEdit.EchoMode.Password); self.nvd_key_edit.setPlaceholderText("Optional — raises the NVD limit from 5 to 50 requests per 30 s"); key_layout.addWidget(self.nvd_key_edit); layout.addLayout(key_layout)
         button_layout = QHBoxLayout(); self.btn_save = QPushButton("Apply"); self.btn_cancel = QPushButton("Cancel"); button_layout.addStretch(); button_layout.addWidget(self.btn_save); button_layout.addWidget(self.btn_cancel); layout.addLayout(button_layout)
         self.btn_bg_color.clicked.connect(self._choose_bg_color); self.btn_font_color.clicked.connect(self._choose_font_color); self.btn_font.clicked.connect(self._choose_font)
         self.btn_browse_folder.clicked.connect(self._browse_session_folder); self.theme_combo.currentTextChanged.connect(self._on_theme_changed); self.btn_save.clicked.connect(self._save_settings); self.btn_cancel.clicked.connect(self.reject)
@@ -140,5 +142,6 @@ class SettingsDialog(QDialog):
         if folder: self._temp_settings["session_folder"] = folder; self.session_folder_edit.setText(folder)
     @Slot()
     def _save_settings(self):
+        self._temp_settings["nvd_api_key"] = self.nvd_key_edit.text().strip()
         for key, value in self._temp_settings.items(): self.config_manager.set_setting(key, value)
         self.settings_changed.emit(); self.accept()
\ No newline at end of file
@@ -0,0 +1,277 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QTableView, QHeaderView, QAbstractItemView
+from PySide6.QtGui import QBrush, QColor
+from PySide6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Slot
+
+FLUSH_INTERVAL_MS = 50
+TOOLTIP_MIN_LENGTH = 60
+
+
+def _sort_key(value):
+    # Mixed columns (a latency that is sometimes "cached") still need a total order
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    return (2, str(value).lower())
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """Append-mostly table model for tool results, stored as one list per column.
+
+    Rows queued with :meth:`append`/:meth:`extend` are inserted in a single
+    ``beginInsertRows`` batch on the next timer tick, so a worker emitting
+    thousands of rows a second costs one view update per tick rather than
+    one per row. Values keep their Python type, and ``None`` shows the
+    column's placeholder.
+
+    Storage is append-only: :meth:`append` returns a record number that
+    stays valid for :meth:`value`/:meth:`set_value` however the table is
+    sorted. Sorting reorders a list of record numbers with precomputed
+    keys in Python, which is far cheaper than letting a proxy call back
+    into :meth:`data` for every comparison.
+    """
+
+    def __init__(self, headers, parent=None, placeholders=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._columns = [[] for _ in self._headers]
+        self._order = []
+        self._rows_of = None
+        self._sort_column, self._sort_order, self._sort_keys = -1, Qt.SortOrder.AscendingOrder, []
+        self._placeholders = placeholders or {}
+        self._colors = {}
+        self._pending = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def set_colors(self, column, mapping):
+        """Foreground colour per cell value in ``column``, e.g. ``{'LISTED': '#ef4444'}``."""
+        self._colors[column] = {value: QBrush(QColor(color)) for value, color in mapping.items()}
+
+    # ── Qt model interface ──────────────────────────────────────────────
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        value = self._columns[column][self._order[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._placeholders.get(column, '') if value is None else value
+        if role == Qt.ItemDataRole.ForegroundRole and column in self._colors:
+            return self._colors[column].get(value)
+        if role == Qt.ItemDataRole.ToolTipRole and isinstance(value, str) and len(value) > TOOLTIP_MIN_LENGTH:
+            return value
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.flush()
+        self._sort_column, self._sort_order = column, order
+        self._sort_keys = [_sort_key(v) for v in self._columns[column]] if column >= 0 else []
+        self._reorder()
+
+    def _reorder(self):
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        records = [self._order[i.row()] for i in persistent]
+        if self._sort_column >= 0:
+            self._order.sort(key=self._sort_keys.__getitem__,
+                             reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        else:
+            self._order.sort()
+        self._rows_of = None
+        rows_of = self._row_index()
+        self.changePersistentIndexList(persistent, [self.index(rows_of[r], i.column())
+                                                    for r, i in zip(records, persistent)])
+        self.layoutChanged.emit()
+
+    def _row_index(self):
+        if self._rows_of is None:
+            self._rows_of = [0] * len(self._order)
+            for row, record in enumerate(self._order):
+                self._rows_of[record] = row
+        return self._rows_of
+
+    # ── Row access ──────────────────────────────────────────────────────
+    def append(self, row):
+        """Queue one row (a sequence with one value per column); returns its record number."""
+        self._pending.append(tuple(row))
+        if not self._timer.isActive():
+            self._timer.start()
+        return len(self._columns[0]) + len(self._pending) - 1
+
+    def extend(self, rows):
+        for row in rows:
+            self._pending.append(tuple(row))
+        if self._pending and not self._timer.isActive():
+            self._timer.start()
+
+    @Slot()
+    def flush(self):
+        """Insert every queued row now, keeping the current sort order."""
+        self._timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        first = len(self._columns[0])
+        self.beginInsertRows(QModelIndex(), first, first + len(pending) - 1)
+        for column, values in zip(self._columns, zip(*pending)):
+            column.extend(values)
+        self._order.extend(range(first, first + len(pending)))
+        if self._rows_of is not None:
+            self._rows_of.extend(range(first, first + len(pending)))
+        self.endInsertRows()
+        if self._sort_column >= 0:
+            self._sort_keys.extend(_sort_key(row[self._sort_column]) for row in pending)
+            # Timsort merges the new run into the sorted prefix in near-linear time
+            self._reorder()
+
+    def clear(self):
+        self._timer.stop()
+        self._pending = []
+        self.beginResetModel()
+        self._columns = [[] for _ in self._headers]
+        self._order, self._sort_keys, self._rows_of = [], [], None
+        self.endResetModel()
+
+    def total_rows(self):
+        """Inserted plus queued rows."""
+        return len(self._columns[0]) + len(self._pending)
+
+    def record(self, row):
+        """Record number shown at view row ``row``."""
+        return self._order[row]
+
+    def value(self, record, column):
+        committed = len(self._columns[0])
+        if record >= committed:
+            return self._pending[record - committed][column]
+        return self._columns[column][record]
+
+    def set_value(self, record, column, value):
+        committed = len(self._columns[0])
+        if record >= committed:
+            pending = list(self._pending[record - committed])
+            pending[column] = value
+            self._pending[record - committed] = tuple(pending)
+            return
+        self._columns[column][record] = value
+        if column == self._sort_column:
+            self._sort_keys[record] = _sort_key(value)
+        index = self.index(self._row_index()[record], column)
+        self.dataChanged.emit(index, index)
+
+    def set_row(self, record, row):
+        """Replace every value of ``record`` at once, e.g. a live statistics row; one repaint per row."""
+        row = tuple(row)
+        committed = len(self._columns[0])
+        if record >= committed:
+            self._pending[record - committed] = row
+            return
+        for column, value in zip(self._columns, row):
+            column[record] = value
+        if self._sort_column >= 0:
+            self._sort_keys[record] = _sort_key(row[self._sort_column])
+        view_row = self._row_index()[record]
+        self.dataChanged.emit(self.index(view_row, 0), self.index(view_row, len(self._headers) - 1))
+
+    def matches(self, row, needle):
+        """Whether any cell of view row ``row`` contains ``needle`` (lower-case)."""
+        record = self._order[row]
+        return any(needle in str(column[record]).lower() for column in self._columns if column[record] is not None)
+
+    def rows(self):
+        """Every inserted row as a tuple, in insertion order."""
+        return zip(*self._columns)
+
+
+class ResultsFilterProxy(QSortFilterProxyModel):
+    """Text filter over a :class:`ResultsTableModel`; sorting is delegated to the model."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ''
+
+    def set_filter_text(self, text):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self.sourceModel().matches(source_row, self._needle)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+
+class ResultsView(QWidget):
+    """Filter box over a sortable, virtualized :class:`QTableView` of a :class:`ResultsTableModel`."""
+
+    def __init__(self, headers, parent=None, placeholders=None, stretch_column=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter results…")
+        self.filter_input.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_input)
+
+        self.model = ResultsTableModel(headers, self, placeholders)
+        self.proxy = ResultsFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setWordWrap(False)
+        self.view.verticalHeader().setVisible(False)
+        # Fixed row heights let the view skip measuring rows it never paints
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setDefaultSectionSize(140)
+        if stretch_column is not None:
+            header.setSectionResizeMode(stretch_column, QHeaderView.ResizeMode.Stretch)
+        else:
+            header.setStretchLastSection(True)
+        layout.addWidget(self.view)
+
+        self.filter_input.textChanged.connect(self.proxy.set_filter_text)
+
+    def append(self, row):
+        return self.model.append(row)
+
+    def extend(self, rows):
+        self.model.extend(rows)
+
+    def clear(self):
+        self.model.clear()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.model.flush()
+        self.view.sortByColumn(column, order)
+
+    def record(self, index):
+        """Record number behind a view index, for :meth:`ResultsTableModel.value`."""
+        return self.model.record(self.proxy.mapToSource(index).row())
+
+    def fit_columns(self, columns):
+        """Size ``columns`` to their contents once, e.g. when a scan finishes."""
+        self.model.flush()
+        for column in columns:
+            self.view.resizeColumnToContents(column)
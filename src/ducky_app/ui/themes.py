@@ -242,8 +242,8 @@ QTreeWidget::item:hover    {{ background-color: #2e333d; }}
 QTreeWidget::item:selected {{ background-color: {DUCKY_YELLOW}; color: #111111; }}
 QTreeWidget::branch        {{ background-color: #22262e; }}
 
-/* ── Table widget ─────────────────────────────────────────────────────── */
-QTableWidget {{
+/* ── Tables ───────────────────────────────────────────────────────────── */
+QTableView {{
     background-color: #22262e;
     border: 1px solid #2e333d;
     border-radius: 6px;
@@ -251,9 +251,9 @@ QTableWidget {{
     gridline-color: #2e333d;
     outline: none;
 }}
-QTableWidget::item          {{ padding: 5px 8px; }}
-QTableWidget::item:selected {{ background-color: {DUCKY_YELLOW}; color: #111111; }}
-QTableWidget::item:hover    {{ background-color: #2e333d; }}
+QTableView::item          {{ padding: 5px 8px; }}
+QTableView::item:selected {{ background-color: {DUCKY_YELLOW}; color: #111111; }}
+QTableView::item:hover    {{ background-color: #2e333d; }}
 
 /* ── Group box ────────────────────────────────────────────────────────── */
 QGroupBox {{
@@ -632,8 +632,8 @@ QTreeWidget::item:hover    {{ background-color: #f0f4f8; }}
 QTreeWidget::item:selected {{ background-color: {DUCKY_YELLOW}; color: #111111; }}
 QTreeWidget::branch        {{ background-color: #ffffff; }}
 
-/* ── Table widget ─────────────────────────────────────────────────────── */
-QTableWidget {{
+/* ── Tables ───────────────────────────────────────────────────────────── */
+QTableView {{
     background-color: #ffffff;
     border: 1px solid #e2e8f0;
     border-radius: 6px;
@@ -641,9 +641,9 @@ QTableWidget {{
     gridline-color: #e2e8f0;
     outline: none;
 }}
-QTableWidget::item          {{ padding: 5px 8px; }}
-QTableWidget::item:selected {{ background-color: {DUCKY_YELLOW}; color: #111111; }}
-QTableWidget::item:hover    {{ background-color: #f0f4f8; }}
+QTableView::item          {{ padding: 5px 8px; }}
+QTableView::item:selected {{ background-color: {DUCKY_YELLOW}; color: #111111; }}
+QTableView::item:hover    {{ background-color: #f0f4f8; }}
 
 /* ── Group box ────────────────────────────────────────────────────────── */
 QGroupBox {{
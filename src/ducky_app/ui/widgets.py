@@ -1,9 +1,9 @@
 import os
+import csv
+import json
 import ipaddress
 import psutil
-import socket
 import serial
-import hashlib
 import time
 import asyncio
 import paramiko
@@ -15,6 +15,7 @@ from PySide6.QtWidgets import (
     QColorDialog, QGraphicsView, QGraphicsScene, QGraphicsItemGroup, QGraphicsEllipseItem,
     QGraphicsTextItem, QProgressBar, QComboBox, QPlainTextEdit, QTableWidget, QHeaderView,
     QAbstractItemView, QTableWidgetItem, QApplication, QGraphicsPathItem, QTabWidget,
+    QCheckBox, QGridLayout, QDoubleSpinBox,
 )
 from PySide6.QtGui import (
     QPalette, QColor, QFont, QIcon, QAction, QTextCharFormat, QTextCursor, QBrush,
@@ -23,13 +24,20 @@ from PySide6.QtGui import (
 from PySide6.QtCore import Signal, Slot, QTimer, Qt, QRectF
 from ducky_app.core.config_manager import ConfigManager
 from ducky_app.core.workers import (
-    ConnectionReaderThread, NetworkToolThread, DiscoveryWorker, CveSearchWorker,
-    DnsLookupWorker, WhoisWorker, HttpHeadersWorker, SslCheckerWorker,
-    BlacklistWorker, IpInfoWorker, SmtpTestWorker,
-    WakeOnLanWorker, MacVendorWorker, DnsPropagationWorker, ArpRouteTableWorker,
+    ConnectionReaderThread, NetworkToolThread, PingWorker, TracerouteWorker, DiscoveryWorker, ReverseDnsWorker, CveSearchWorker,
+    CveSyncWorker, InventoryCveWorker, CrackWorker, NoteSaveWorker, PasswordStrengthWorker, PasswordAuditWorker,
+    FileHashWorker, DirectoryHashWorker, ManifestVerifyWorker,
+    DnsLookupWorker, WhoisWorker, BulkWhoisWorker, HttpHeadersWorker, BulkHttpAuditWorker,
+    HttpTimingWorker, SslCheckerWorker, TlsInventoryWorker,
+    TlsEnumerationWorker, BlacklistWorker, IpInfoWorker, IpDatasetWorker, BulkIpEnrichWorker, SmtpTestWorker,
+    WakeOnLanWorker, MacVendorWorker, OuiUpdateWorker, DnsPropagationWorker, ArpRouteTableWorker,
+)
+from ducky_app.core import (
+    cracker, cve_store, dnsbl, file_hash, http_timing, icmp, ip_ranges, notes, oui_db, password_audit, tls_enum,
+    tls_inventory, traceroute, whois_client,
 )
 from ducky_app.ui.dialogs import ConnectionDialog
-from zxcvbn import zxcvbn
+from ducky_app.ui.table_models import ResultsView
 
 class BaseNetworkingToolWidget(QWidget):
     def __init__(self, parent=None):
@@ -253,35 +261,124 @@ class SubnetCalculatorWidget(BaseNetworkingToolWidget):
         except ValueError as e: self.output_text.setPlainText(f"Error: {e}")
 
 class NetworkPerformanceMonitorWidget(BaseNetworkingToolWidget):
+    PING_COLUMNS = ["Target", "Address", "Sent", "Received", "Loss %", "Last ms", "Min ms", "Avg ms", "Max ms", "Jitter ms", "Status"]
+    TRACE_COLUMNS = ["Hop", "Address", "Name", "Sent", "Loss %", "Last ms", "Avg ms", "Best ms", "Worst ms", "StDev ms", "Status"]
     def __init__(self, parent=None):
-        super().__init__(parent); self.tool_thread = None; control_layout = QHBoxLayout()
-        self.refresh_btn = QPushButton("Refresh Local Info"); self.target_input = QLineEdit("google.com"); self.ping_btn = QPushButton("Ping")
+        super().__init__(parent); self.tool_thread = None; self.ping_worker = None; self.trace_worker = None; self._ping_records = {}; self._trace_records = {}; control_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton("Refresh Local Info"); self.target_input = QLineEdit("google.com"); self.target_input.setPlaceholderText("Hosts, addresses or CIDR blocks, separated by commas or spaces")
+        self.targets_btn = QPushButton("Load Targets..."); self.ping_btn = QPushButton("Ping")
         self.traceroute_btn = QPushButton("Traceroute"); self.stop_btn = QPushButton("Stop"); self.stop_btn.setEnabled(False)
-        control_layout.addWidget(self.refresh_btn); control_layout.addWidget(QLabel("Target:")); control_layout.addWidget(self.target_input)
+        control_layout.addWidget(self.refresh_btn); control_layout.addWidget(QLabel("Target:")); control_layout.addWidget(self.target_input); control_layout.addWidget(self.targets_btn)
         control_layout.addWidget(self.ping_btn); control_layout.addWidget(self.traceroute_btn); control_layout.addWidget(self.stop_btn)
-        self.layout().insertLayout(0, control_layout); self.refresh_btn.clicked.connect(self._refresh_local_info)
-        self.ping_btn.clicked.connect(lambda: self._start_network_tool("ping")); self.traceroute_btn.clicked.connect(lambda: self._start_network_tool("traceroute"))
+        ping_layout = QHBoxLayout(); self.interval_spin = QDoubleSpinBox(); self.interval_spin.setRange(0.1, 60.0); self.interval_spin.setSingleStep(0.5); self.interval_spin.setValue(1.0); self.interval_spin.setSuffix(" s")
+        self.count_spin = QSpinBox(); self.count_spin.setRange(0, 100000); self.count_spin.setValue(4); self.count_spin.setSpecialValueText("Continuous")
+        self.timeout_spin = QDoubleSpinBox(); self.timeout_spin.setRange(0.1, 30.0); self.timeout_spin.setValue(2.0); self.timeout_spin.setSuffix(" s")
+        ping_layout.addWidget(QLabel("Interval:")); ping_layout.addWidget(self.interval_spin); ping_layout.addWidget(QLabel("Count:")); ping_layout.addWidget(self.count_spin)
+        ping_layout.addWidget(QLabel("Timeout:")); ping_layout.addWidget(self.timeout_spin)
+        self.probe_combo = QComboBox()
+        for key, label in traceroute.PROBE_TYPES.items(): self.probe_combo.addItem(label, key)
+        self.port_spin = QSpinBox(); self.port_spin.setRange(1, 65535); self.port_spin.setToolTip("Destination port of UDP and TCP SYN probes (UDP probes count up from it)")
+        self.mtr_check = QCheckBox("Continuous (MTR)"); self.mtr_check.setToolTip("Keep tracing every interval and show loss and latency over the last %d probes per hop" % traceroute.RING_SIZE)
+        ping_layout.addWidget(QLabel("Trace probe:")); ping_layout.addWidget(self.probe_combo); ping_layout.addWidget(QLabel("Port:")); ping_layout.addWidget(self.port_spin)
+        ping_layout.addWidget(self.mtr_check); ping_layout.addStretch(); self._update_probe_port()
+        self.layout().insertLayout(0, control_layout); self.layout().insertLayout(1, ping_layout)
+        self.ping_table = ResultsView(self.PING_COLUMNS, placeholders={i: "—" for i in range(4, 10)}); self.ping_table.model.set_colors(10, {"Up": "#22c55e", "Timeout": "#ef4444"})
+        self.ping_table.setVisible(False); self.layout().addWidget(self.ping_table, 1)
+        self.trace_table = ResultsView(self.TRACE_COLUMNS, placeholders={i: "—" for i in range(2, 10)}); self.trace_table.model.set_colors(10, {"Destination": "#22c55e", "No reply": "#ef4444"})
+        self.trace_table.setVisible(False); self.layout().addWidget(self.trace_table, 1)
+        self.status_label = QLabel(""); self.status_label.setObjectName("statusLabel"); self.layout().addWidget(self.status_label)
+        self.refresh_btn.clicked.connect(self._refresh_local_info); self.targets_btn.clicked.connect(self._load_targets); self.ping_btn.clicked.connect(self._start_ping)
+        self.traceroute_btn.clicked.connect(self._start_traceroute); self.probe_combo.currentIndexChanged.connect(self._update_probe_port)
         self.stop_btn.clicked.connect(self._stop_network_tool); self._refresh_local_info()
+    def _show_table(self, table=None):
+        self.ping_table.setVisible(table is self.ping_table); self.trace_table.setVisible(table is self.trace_table); self.output_text.setVisible(table is None)
+    def _tool_running(self): return any(t and t.isRunning() for t in (self.tool_thread, self.ping_worker, self.trace_worker))
+    @Slot()
+    def _update_probe_port(self):
+        probe = self.probe_combo.currentData(); self.port_spin.setEnabled(probe != "icmp")
+        if probe in traceroute.DEFAULT_PORTS: self.port_spin.setValue(traceroute.DEFAULT_PORTS[probe])
+    @Slot()
+    def _load_targets(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Select a Target List", "", "Text Files (*.txt *.csv);;All Files (*)")
+        if not filepath: return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f: targets = icmp.expand_targets(f.read())
+        except (OSError, ValueError) as e: QMessageBox.warning(self, "Target List", f"Could not load the target list:\n{e}"); return
+        self.target_input.setText(", ".join(targets)); self.status_label.setText(f"Loaded {len(targets)} target(s) from {os.path.basename(filepath)}.")
+    @Slot()
+    def _start_ping(self):
+        if self._tool_running(): return
+        try: targets = icmp.expand_targets(self.target_input.text())
+        except ValueError as e: QMessageBox.warning(self, "Input Error", str(e)); return
+        if not targets: QMessageBox.warning(self, "Input Error", "Please enter at least one target."); return
+        self.ping_table.clear(); self._ping_records = {}; self._show_table(self.ping_table); self._set_buttons_enabled(False)
+        self.ping_worker = PingWorker(targets, self.interval_spin.value(), self.count_spin.value(), self.timeout_spin.value())
+        self.ping_worker.rows_ready.connect(self._on_ping_rows); self.ping_worker.status.connect(self.status_label.setText)
+        self.ping_worker.finished.connect(self._on_ping_finished); self.ping_worker.start()
+    @Slot(list)
+    def _on_ping_rows(self, rows):
+        for row in rows:
+            record = self._ping_records.get(row[0])
+            if record is None: self._ping_records[row[0]] = self.ping_table.append(row)
+            else: self.ping_table.model.set_row(record, row)
+    @Slot(str)
+    def _on_ping_finished(self, message):
+        self._set_buttons_enabled(True); self.status_label.setText(message); self.ping_table.fit_columns(range(len(self.PING_COLUMNS) - 1))
+        if message.startswith("Error") and len(self.ping_worker.targets) == 1:
+            # No ICMP socket without privileges (e.g. Windows as a normal user): the system ping still works
+            self.status_label.setText(f"{message} Falling back to the system ping command."); self._start_network_tool("ping")
+        elif message.startswith("Error"): QMessageBox.warning(self, "Ping", message)
+    @Slot()
+    def _start_traceroute(self):
+        if self._tool_running(): return
+        target = self.target_input.text().strip().replace(",", " ").split()
+        if len(target) != 1: QMessageBox.warning(self, "Input Error", "Traceroute takes a single target."); return
+        mtr = self.mtr_check.isChecked(); probe = self.probe_combo.currentData()
+        self.trace_table.clear(); self._trace_records = {}; self._show_table(self.trace_table); self._set_buttons_enabled(False)
+        # A classic trace sends three probes per hop, as traceroute does; MTR mode keeps going until stopped
+        self.trace_worker = TracerouteWorker(target[0], probe, self.port_spin.value() if probe != "icmp" else None, 0 if mtr else 3,
+                                             self.interval_spin.value() if mtr else min(self.interval_spin.value(), 0.5), self.timeout_spin.value())
+        self.trace_worker.rows_ready.connect(self._on_trace_rows); self.trace_worker.status.connect(self.status_label.setText)
+        self.trace_worker.finished.connect(self._on_trace_finished); self.trace_worker.start()
+    @Slot(list)
+    def _on_trace_rows(self, rows):
+        if len(rows) < len(self._trace_records):
+            # Hops past a destination found in a later reply drop out; rebuild rather than remove rows one by one
+            self.trace_table.clear(); self._trace_records = {}
+        for row in rows:
+            record = self._trace_records.get(row[0])
+            if record is None: self._trace_records[row[0]] = self.trace_table.append(row)
+            else: self.trace_table.model.set_row(record, row)
+    @Slot(str)
+    def _on_trace_finished(self, message):
+        self._set_buttons_enabled(True); self.status_label.setText(message); self.trace_table.fit_columns(range(len(self.TRACE_COLUMNS) - 1))
+        if message.startswith("Error"):
+            # Without raw sockets (no root/Administrator) the system traceroute still works
+            self.status_label.setText(f"{message} Falling back to the system traceroute command."); self._start_network_tool("traceroute")
     @Slot()
     def _refresh_local_info(self):
-        self.output_text.clear(); mem = psutil.virtual_memory(); net_io = psutil.net_io_counters()
+        self._show_table(); self.output_text.clear(); mem = psutil.virtual_memory(); net_io = psutil.net_io_counters()
         output = ["--- Local System and Network Information ---", f"CPU Usage: {psutil.cpu_percent(interval=0.1)}%",
                   f"Memory Usage: {mem.percent}% ({mem.used/1024**3:.2f}GB / {mem.total/1024**3:.2f}GB)", "\n--- Network I/O ---",
                   f"Bytes Sent: {net_io.bytes_sent/1024**2:.2f} MB", f"Bytes Recv: {net_io.bytes_recv/1024**2:.2f} MB"]
         self.output_text.setPlainText("\n".join(output))
     @Slot(str)
     def _start_network_tool(self, tool_type):
-        if self.tool_thread and self.tool_thread.isRunning(): return
-        self.output_text.clear(); self._set_buttons_enabled(False)
+        if self._tool_running(): return
+        self.output_text.clear(); self._show_table(); self._set_buttons_enabled(False)
         self.tool_thread = NetworkToolThread(tool_type, self.target_input.text().strip())
         self.tool_thread.result_output.connect(self.output_text.insertPlainText)
         self.tool_thread.scan_complete.connect(lambda: self._set_buttons_enabled(True)); self.tool_thread.start()
     @Slot()
     def _stop_network_tool(self):
         if self.tool_thread and self.tool_thread.isRunning(): self.tool_thread.stop(); self.tool_thread = None
+        running = [w for w in (self.ping_worker, self.trace_worker) if w and w.isRunning()]
+        for worker in running: worker.stop()
+        if running: return  # buttons come back when it finishes
         self._set_buttons_enabled(True)
     def _set_buttons_enabled(self, enabled):
-        self.ping_btn.setEnabled(enabled); self.traceroute_btn.setEnabled(enabled); self.stop_btn.setEnabled(not enabled)
+        self.ping_btn.setEnabled(enabled); self.traceroute_btn.setEnabled(enabled); self.targets_btn.setEnabled(enabled); self.stop_btn.setEnabled(not enabled)
+        self.probe_combo.setEnabled(enabled); self.mtr_check.setEnabled(enabled)
 
 class PortScannerWidget(BaseNetworkingToolWidget):
     def __init__(self, parent=None):
@@ -313,24 +410,29 @@ class NotepadWidget(QWidget):
     def __init__(self, config_manager: ConfigManager, parent=None):
         super().__init__(parent); self.config_manager = config_manager
         self.notes_folder = self.config_manager.get_setting("notes_folder"); os.makedirs(self.notes_folder, exist_ok=True)
-        self.notepad_file_path = os.path.join(self.notes_folder, "scratchpad.html"); self.setLayout(QVBoxLayout())
+        self.note_format = self.config_manager.get_setting("notes_format") or notes.DEFAULT_FORMAT; self.notepad_file_path = notes.note_path(self.notes_folder, self.note_format); self.setLayout(QVBoxLayout())
         self.toolbar = QToolBar(); self.notepad_text = QTextEdit(); self.layout().addWidget(self.toolbar); self.layout().addWidget(self.notepad_text)
+        self._save_worker = None; self._save_pending = False; self._saved_revision = None; self._format_actions = []
         self._setup_toolbar(); self.notepad_text.selectionChanged.connect(self._update_toolbar_state); self.notepad_text.cursorPositionChanged.connect(self._update_toolbar_state)
         self.save_timer = QTimer(self); self.save_timer.setInterval(5000); self.save_timer.setSingleShot(True)
-        self.save_timer.timeout.connect(self._auto_save_note); self.notepad_text.textChanged.connect(self.save_timer.start); self._load_note()
+        # Not restarted on every keystroke, so a note being typed into is still saved every few seconds
+        self.save_timer.timeout.connect(self._auto_save_note); self.notepad_text.textChanged.connect(self._schedule_save); self._load_note()
     def _setup_toolbar(self):
+        self.format_combo = QComboBox()
+        for key, (_name, label) in notes.NOTE_FORMATS.items(): self.format_combo.addItem(label, key)
+        self.format_combo.setToolTip("How the scratchpad is stored. Markdown and plain text save large notes much faster."); self.toolbar.addWidget(self.format_combo); self.toolbar.addSeparator()
         self._bold_action = self._create_format_action("B", "Bold", "Ctrl+B", True, self._set_text_bold)
         self._italic_action = self._create_format_action("I", "Italic", "Ctrl+I", True, self._set_text_italic)
         self._underline_action = self._create_format_action("U", "Underline", "Ctrl+U", True, self._set_text_underline)
-        self.toolbar.addSeparator(); self.font_combo = QFontComboBox(); self.font_combo.currentFontChanged.connect(self._set_font_family); self.toolbar.addWidget(self.font_combo)
-        self.font_size_spin = QSpinBox(); self.font_size_spin.setRange(6, 72); self.font_size_spin.setValue(10); self.font_size_spin.valueChanged.connect(self._set_font_size); self.toolbar.addWidget(self.font_size_spin)
+        self.toolbar.addSeparator(); self.font_combo = QFontComboBox(); self.font_combo.currentFontChanged.connect(self._set_font_family); self._format_actions.append(self.toolbar.addWidget(self.font_combo))
+        self.font_size_spin = QSpinBox(); self.font_size_spin.setRange(6, 72); self.font_size_spin.setValue(10); self.font_size_spin.valueChanged.connect(self._set_font_size); self._format_actions.append(self.toolbar.addWidget(self.font_size_spin))
         self.toolbar.addSeparator(); self._create_format_action(None, "Text Color", None, False, self._set_text_color, "color-text"); self._create_format_action(None, "Highlight Color", None, False, self._set_highlight_color, "color-fill")
         self.toolbar.addSeparator(); save_as_button = QPushButton("Save As..."); save_as_button.clicked.connect(self._save_note_as); self.toolbar.addWidget(save_as_button)
     def _create_format_action(self, text, tooltip, shortcut, checkable, triggered_func, icon_name=None):
         icon = QIcon.fromTheme(icon_name) if icon_name else QIcon(); action = QAction(icon, text, self) if text else QAction(icon, tooltip, self)
         action.setToolTip(tooltip); action.setCheckable(checkable); action.triggered.connect(triggered_func)
         if shortcut: action.setShortcut(shortcut)
-        self.toolbar.addAction(action); return action
+        self.toolbar.addAction(action); self._format_actions.append(action); return action
     def _merge_format(self, char_format: QTextCharFormat):
         cursor = self.notepad_text.textCursor();
         if not cursor.hasSelection(): cursor.select(QTextCursor.SelectionType.WordUnderCursor)
@@ -351,21 +453,72 @@ class NotepadWidget(QWidget):
         fmt = self.notepad_text.currentCharFormat(); self._bold_action.setChecked(fmt.fontWeight() == QFont.Weight.Bold); self._italic_action.setChecked(fmt.fontItalic())
         self._underline_action.setChecked(fmt.fontUnderline()); self.font_combo.setCurrentFont(fmt.font()); self.font_size_spin.setValue(int(fmt.fontPointSize()))
     def _load_note(self):
-        if os.path.exists(self.notepad_file_path):
+        # Fall back to the newest scratchpad kept in another format, e.g. the HTML one after switching to Markdown
+        others = [f for f in notes.NOTE_FORMATS if f != self.note_format and os.path.exists(notes.note_path(self.notes_folder, f))]
+        for fmt in [self.note_format] + sorted(others, key=lambda f: os.path.getmtime(notes.note_path(self.notes_folder, f)), reverse=True):
+            path = notes.note_path(self.notes_folder, fmt)
+            if not os.path.exists(path): continue
             try:
-                with open(self.notepad_file_path, 'r', encoding='utf-8') as f: self.notepad_text.setHtml(f.read())
-            except Exception: pass
+                with open(path, 'r', encoding='utf-8') as f: content = f.read()
+            except Exception: continue
+            if fmt == 'html': self.notepad_text.setHtml(content)
+            else: self.notepad_text.setPlainText(content)
+            self._apply_format(fmt, self.note_format)
+            if fmt == self.note_format: self._saved_revision = self.notepad_text.document().revision()
+            break
+        else: self._apply_format(self.note_format, self.note_format)
+        self.format_combo.setCurrentIndex(self.format_combo.findData(self.note_format)); self.format_combo.currentIndexChanged.connect(self._change_format)
+    def _apply_format(self, current, new):
+        """Convert the editor's content from ``current`` to ``new`` storage and set the editing mode to match."""
+        doc = self.notepad_text.document(); rich = new == 'html'
+        if current == 'html' and new == 'markdown': self.notepad_text.setPlainText(doc.toMarkdown())
+        elif current == 'html' and new == 'text': self.notepad_text.setPlainText(doc.toPlainText())
+        elif current == 'markdown' and rich: doc.setMarkdown(self.notepad_text.toPlainText())
+        self.notepad_text.setAcceptRichText(rich)
+        for action in self._format_actions: action.setEnabled(rich)
+    @Slot(int)
+    def _change_format(self, index):
+        new = self.format_combo.itemData(index)
+        if new == self.note_format: return
+        self._apply_format(self.note_format, new); self.note_format = new; self.config_manager.set_setting("notes_format", new)
+        self.notepad_file_path = notes.note_path(self.notes_folder, new); self._saved_revision = None; self._auto_save_note()
+    def _serialize(self, fmt):
+        # Markdown and plain-text notes are edited as source, so their snapshot is the cheap toPlainText()
+        if fmt == 'html': return self.notepad_text.toHtml() if self.note_format == 'html' else Qt.convertFromPlainText(self.notepad_text.toPlainText())
+        if fmt == 'markdown' and self.note_format == 'html': return self.notepad_text.document().toMarkdown()
+        return self.notepad_text.toPlainText()
     @Slot()
-    def _auto_save_note(self): self._save_note(self.notepad_file_path)
-    def _save_note(self, filepath):
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f: f.write(self.notepad_text.toHtml())
-        except Exception as e: QMessageBox.warning(self, "Save Error", f"Failed to save notes: {e}")
+    def _schedule_save(self):
+        if not self.save_timer.isActive(): self.save_timer.start()
+    @Slot()
+    def _auto_save_note(self):
+        revision = self.notepad_text.document().revision()
+        if revision == self._saved_revision: return
+        if self._save_worker and self._save_worker.isRunning(): self._save_pending = True; return
+        self._save_pending = False; self._start_save(self.notepad_file_path, self._serialize(self.note_format), revision)
+    def _start_save(self, filepath, text, revision=-1):
+        self._save_worker = NoteSaveWorker(filepath, text, revision); self._save_worker.saved.connect(self._on_saved); self._save_worker.error_occurred.connect(self._on_save_error)
+        self._save_worker.finished.connect(self._on_save_finished); self._save_worker.start()
+    @Slot(str, int)
+    def _on_saved(self, filepath, revision):
+        if revision >= 0 and filepath == self.notepad_file_path: self._saved_revision = revision
+    @Slot()
+    def _on_save_finished(self):
+        if self._save_pending: self._auto_save_note()
+    @Slot(str)
+    def _on_save_error(self, message): QMessageBox.warning(self, "Save Error", message)
     @Slot()
     def _save_note_as(self):
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save Notes As", self.notes_folder, "HTML Files (*.html);;Text Files (*.txt)")
-        if file_path: self._save_note(file_path)
-    def save_and_stop(self): self.save_timer.stop(); self._save_note(self.notepad_file_path)
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Notes As", self.notes_folder, "HTML Files (*.html);;Markdown Files (*.md);;Text Files (*.txt)")
+        if not file_path: return
+        if self._save_worker and self._save_worker.isRunning(): self._save_worker.wait()
+        self._start_save(file_path, self._serialize(notes.format_for_path(file_path)))
+    def save_and_stop(self):
+        self.save_timer.stop()
+        if self._save_worker and self._save_worker.isRunning(): self._save_worker.wait()
+        if self.notepad_text.document().revision() == self._saved_revision: return
+        try: notes.write_note(self.notepad_file_path, self._serialize(self.note_format))
+        except OSError as e: QMessageBox.warning(self, "Save Error", f"Failed to save notes: {e}")
 
 class DeviceNode(QGraphicsItemGroup):
     def __init__(self, ip, mac, hostname=None, description=None, parent_widget=None):
@@ -375,6 +528,8 @@ class DeviceNode(QGraphicsItemGroup):
         self.hostname = hostname
         self.description = description
         self.parent_widget = parent_widget
+        oui = oui_db.get_database()
+        self.vendor = oui.vendor(mac) if oui and mac else ""
         
         self.setFlag(QGraphicsItemGroup.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsItemGroup.GraphicsItemFlag.ItemIsSelectable)
@@ -406,6 +561,7 @@ class DeviceNode(QGraphicsItemGroup):
         self.addToGroup(label)
         
         tooltip = f"IP: {self.ip}\nMAC: {self.mac}"
+        if self.vendor: tooltip += f"\nVendor: {self.vendor}"
         if self.hostname: tooltip += f"\nHost: {self.hostname}"
         if self.description: tooltip += f"\nDesc: {self.description}"
         self.setToolTip(tooltip)
@@ -439,6 +595,8 @@ class DeviceNode(QGraphicsItemGroup):
         title = f"Device Information: {self.hostname or self.ip}"
         info_text = f"IP Address: {self.ip}\n"
         info_text += f"MAC Address: {self.mac}\n"
+        if self.vendor:
+            info_text += f"Vendor: {self.vendor}\n"
         if self.hostname:
             info_text += f"SNMP Hostname: {self.hostname}\n"
         if self.description:
@@ -543,59 +701,190 @@ class TopologyMapperWidget(QWidget):
     def apply_settings(self, settings: dict): pass
 
 class VulnerabilityScannerWidget(QWidget):
+    """CVE search over a local NVD mirror, refreshed from the NVD API when online."""
+
+    COLUMNS = ["CVE ID", "Severity", "Description", "Published"]
+
     def __init__(self, parent=None):
-        super().__init__(parent); self.worker = None; layout = QVBoxLayout(self)
-        input_layout = QHBoxLayout(); self.keyword_input = QLineEdit(); self.keyword_input.setPlaceholderText("e.g., Apache 2.4.51 or OpenSSH 8.2")
-        self.search_btn = QPushButton("Search for CVEs"); input_layout.addWidget(QLabel("Software Keyword:")); input_layout.addWidget(self.keyword_input); input_layout.addWidget(self.search_btn)
-        layout.addLayout(input_layout); self.results_table = QTableWidget(); self.results_table.setColumnCount(4)
-        self.results_table.setHorizontalHeaderLabels(["CVE ID", "Severity", "Description", "Published"]); self.results_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows); self.results_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
-        self.results_table.setWordWrap(True); self.results_table.verticalHeader().setVisible(False); layout.addWidget(self.results_table)
-        self.status_label = QLabel("Ready. Search the NIST NVD for published vulnerabilities."); layout.addWidget(self.status_label)
-        self.search_btn.clicked.connect(self.start_search); self.keyword_input.returnPressed.connect(self.start_search)
+        super().__init__(parent)
+        self.worker = None
+        self.sync_worker = None
+        self.api_key = None
+        layout = QVBoxLayout(self)
+        input_layout = QHBoxLayout()
+        self.keyword_input = QLineEdit()
+        self.keyword_input.setPlaceholderText("e.g., Apache 2.4.51 or OpenSSH 8.2")
+        self.search_btn = QPushButton("Search for CVEs")
+        self.offline_check = QCheckBox("Offline only")
+        self.offline_check.setToolTip("Search the local mirror without contacting the NVD API")
+        self.sync_btn = QPushButton("Sync Mirror")
+        self.sync_btn.setToolTip("Download the full NVD feed once, then only records modified since the last sync")
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        input_layout.addWidget(QLabel("Software Keyword:"))
+        input_layout.addWidget(self.keyword_input)
+        input_layout.addWidget(self.search_btn)
+        input_layout.addWidget(self.offline_check)
+        input_layout.addWidget(self.sync_btn)
+        input_layout.addWidget(self.stop_btn)
+        layout.addLayout(input_layout)
+        self.results = ResultsView(self.COLUMNS, stretch_column=2)
+        layout.addWidget(self.results)
+        self.status_label = QLabel()
+        self.status_label.setObjectName("statusLabel")
+        layout.addWidget(self.status_label)
+        self.mirror_label = QLabel()
+        self.mirror_label.setObjectName("statusLabel")
+        layout.addWidget(self.mirror_label)
+        self.status_label.setText("Ready. Search the NIST NVD for published vulnerabilities.")
+        self._update_mirror_label()
+        self.search_btn.clicked.connect(self.start_search)
+        self.keyword_input.returnPressed.connect(self.start_search)
+        self.sync_btn.clicked.connect(self.start_sync)
+        self.stop_btn.clicked.connect(self.stop)
+
+    def _update_mirror_label(self):
+        stats = cve_store.get_store().stats()
+        if not stats['count']:
+            self.mirror_label.setText("Local CVE mirror is empty — searches populate it, or use Sync Mirror.")
+            return
+        synced = stats['last_sync'].astimezone().strftime('%Y-%m-%d %H:%M') if stats['last_sync'] else 'never'
+        scope = 'full feed' if stats['complete'] else 'searched keywords only'
+        self.mirror_label.setText(f"Local CVE mirror: {stats['count']} records ({scope}), last synced {synced}.")
+
     def start_search(self):
         keyword = self.keyword_input.text().strip()
-        if not keyword: QMessageBox.warning(self, "Input Error", "Please enter a software product to search for."); return
-        if self.worker and self.worker.isRunning(): return
-        self.search_btn.setEnabled(False); self.status_label.setText(f"Searching for vulnerabilities related to '{keyword}'..."); self.results_table.setRowCount(0)
-        self.worker = CveSearchWorker(keyword); self.worker.result_ready.connect(self.display_results); self.worker.error_occurred.connect(self.on_error); self.worker.start()
-    @Slot(dict)
-    def display_results(self, data):
-        self.search_btn.setEnabled(True); vulnerabilities = data.get('vulnerabilities', [])
-        vulnerabilities.sort(key=lambda x: x['cve']['published'], reverse=True)
-        if not vulnerabilities: self.status_label.setText(f"No vulnerabilities found for '{self.keyword_input.text().strip()}'."); return
-        self.results_table.setRowCount(len(vulnerabilities))
-        for row, item in enumerate(vulnerabilities):
-            cve = item.get('cve', {}); cve_id = cve.get('id', 'N/A'); published_date = cve.get('published', 'N/A').split('T')[0]
-            description = next((d.get('value', 'N/A') for d in cve.get('descriptions', []) if d.get('lang') == 'en'), 'N/A')
-            severity = "N/A"
-            if cvss_metrics := cve.get('metrics', {}).get('cvssMetricV31', []):
-                base_severity = cvss_metrics[0].get('cvssData', {}).get('baseSeverity', 'N/A'); base_score = cvss_metrics[0].get('cvssData', {}).get('baseScore', 'N/A')
-                severity = f"{base_severity} ({base_score})"
-            self.results_table.setItem(row, 0, QTableWidgetItem(cve_id)); self.results_table.setItem(row, 1, QTableWidgetItem(severity))
-            self.results_table.setItem(row, 2, QTableWidgetItem(description)); self.results_table.setItem(row, 3, QTableWidgetItem(published_date))
-        self.results_table.resizeRowsToContents(); self.status_label.setText(f"Search complete. Displaying {len(vulnerabilities)} results.")
+        if not keyword:
+            QMessageBox.warning(self, "Input Error", "Please enter a software product to search for.")
+            return
+        if self.worker and self.worker.isRunning():
+            return
+        self.search_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.status_label.setText(f"Searching for vulnerabilities related to '{keyword}'...")
+        self.results.clear()
+        self.worker = CveSearchWorker(keyword, online=not self.offline_check.isChecked(), api_key=self.api_key)
+        self.worker.result_ready.connect(self.display_results)
+        self.worker.error_occurred.connect(self.on_error)
+        self.worker.status.connect(self.status_label.setText)
+        self.worker.finished.connect(self._on_search_finished)
+        self.worker.start()
+
+    @Slot()
+    def start_sync(self):
+        if self.sync_worker and self.sync_worker.isRunning():
+            return
+        self.sync_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.mirror_label.setText("Syncing the local CVE mirror…")
+        self.sync_worker = CveSyncWorker(self.api_key)
+        self.sync_worker.status.connect(self.mirror_label.setText)
+        self.sync_worker.finished.connect(self._on_sync_finished)
+        self.sync_worker.start()
+
+    @Slot()
+    def stop(self):
+        for worker in (self.worker, self.sync_worker):
+            if worker and worker.isRunning():
+                worker.stop()
+        self.stop_btn.setEnabled(False)
+
+    @Slot(list)
+    def display_results(self, rows):
+        keyword = self.keyword_input.text().strip()
+        self.results.clear()
+        self.results.extend(
+            (cve['id'], f"{cve['severity']} ({cve['score']})" if cve['score'] is not None else cve['severity'],
+             cve['description'], cve['published'])
+            for cve in rows
+        )
+        if rows:
+            self.status_label.setText(f"Displaying {len(rows)} results for '{keyword}'.")
+        else:
+            self.status_label.setText(f"No vulnerabilities found for '{keyword}'.")
+
+    @Slot()
+    def _on_search_finished(self):
+        self.search_btn.setEnabled(True)
+        self.stop_btn.setEnabled(bool(self.sync_worker and self.sync_worker.isRunning()))
+        self._update_mirror_label()
+
     @Slot(str)
-    def on_error(self, error_message): self.search_btn.setEnabled(True); self.status_label.setText(f"Error: {error_message}")
-    def apply_settings(self, settings: dict): pass
+    def _on_sync_finished(self, message):
+        self.sync_btn.setEnabled(True)
+        self.stop_btn.setEnabled(bool(self.worker and self.worker.isRunning()))
+        self._update_mirror_label()
+        self.status_label.setText(message)
+
+    @Slot(str)
+    def on_error(self, error_message):
+        self.status_label.setText(f"Error: {error_message}")
+
+    def apply_settings(self, settings: dict):
+        self.api_key = (settings.get("nvd_api_key") or "").strip() or None
+
 
 class PasswordCheckerWidget(QWidget):
+    DEBOUNCE_MS = 250
     def __init__(self, parent=None):
         super().__init__(parent); layout = QVBoxLayout(self); input_layout = QHBoxLayout(); self.password_input = QLineEdit()
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password); self.show_password_btn = QPushButton("Show"); self.show_password_btn.setCheckable(True)
         input_layout.addWidget(QLabel("Password:")); input_layout.addWidget(self.password_input); input_layout.addWidget(self.show_password_btn)
-        layout.addLayout(input_layout); self.results_text = QTextEdit(); self.results_text.setReadOnly(True); layout.addWidget(self.results_text)
+        layout.addLayout(input_layout); self.results_text = QTextEdit(); self.results_text.setReadOnly(True); self.results_text.setFont(QFont("Consolas", 10)); layout.addWidget(self.results_text)
+        audit_layout = QHBoxLayout(); self.audit_btn = QPushButton("Audit Password File..."); self.stop_audit_btn = QPushButton("Stop"); self.stop_audit_btn.setEnabled(False)
+        self.audit_progress = QProgressBar(); self.audit_progress.setVisible(False); audit_layout.addWidget(self.audit_btn); audit_layout.addWidget(self.stop_audit_btn); audit_layout.addWidget(self.audit_progress, 1)
+        layout.addLayout(audit_layout); self.status_label = QLabel("Type a password to analyze it, or audit a file with one password per line."); self.status_label.setObjectName("statusLabel"); layout.addWidget(self.status_label)
+        self._worker = None; self._audit_worker = None; self._debounce = QTimer(self); self._debounce.setSingleShot(True); self._debounce.setInterval(self.DEBOUNCE_MS); self._debounce.timeout.connect(self._analyze_pending)
         self.password_input.textChanged.connect(self.check_password); self.show_password_btn.toggled.connect(self.toggle_password_visibility); self.check_password("")
+        self.audit_btn.clicked.connect(self._start_audit); self.stop_audit_btn.clicked.connect(self._stop_audit)
     @Slot(str)
     def check_password(self, password):
-        if not password: self.results_text.setPlainText("Enter a password to analyze its strength."); return
-        results = zxcvbn(password); score = results['score']; crack_time = results['crack_times_display']['offline_slow_hashing_1e4_per_second']
-        feedback = results['feedback']['warning']; suggestions = "\n".join(f"- {s}" for s in results['feedback']['suggestions'])
-        score_text = ["Very Weak", "Weak", "Fair", "Strong", "Very Strong"]; report = (f"--- Password Strength Analysis ---\n\nScore: {score}/4 ({score_text[score]})\n"
-                  f"Estimated time to crack: {crack_time}\n\n")
-        if feedback: report += f"Warning:\n- {feedback}\n\n"
+        if not password: self._debounce.stop(); self.results_text.setPlainText("Enter a password to analyze its strength."); return
+        self._debounce.start()
+    @Slot()
+    def _analyze_pending(self):
+        password = self.password_input.text()
+        if not password or (self._worker and self._worker.isRunning()): return  # a running analysis re-checks the input when it finishes
+        self._worker = PasswordStrengthWorker(password); self._worker.result_ready.connect(self._show_analysis); self._worker.finished.connect(self._on_analysis_done); self._worker.start()
+    @Slot()
+    def _on_analysis_done(self):
+        if self._worker.password != self.password_input.text() and not self._debounce.isActive(): self._analyze_pending()
+    @Slot(str, dict)
+    def _show_analysis(self, password, results):
+        if password != self.password_input.text(): return  # typed over while it was being analyzed
+        score = results['score']; suggestions = "\n".join(f"- {s}" for s in results['suggestions'])
+        report = (f"--- Password Strength Analysis ---\n\nScore: {score}/4 ({password_audit.SCORE_LABELS[score]})\n"
+                  f"Estimated time to crack: {results['crack_time']}\n\n")
+        if results['truncated']: report += f"(Only the first {password_audit.MAX_ANALYZED_LENGTH} characters were analyzed.)\n\n"
+        if results['warning']: report += f"Warning:\n- {results['warning']}\n\n"
         if suggestions: report += f"Suggestions:\n{suggestions}"
         self.results_text.setPlainText(report)
+    @Slot()
+    def _start_audit(self):
+        if self._audit_worker and self._audit_worker.isRunning(): return
+        filepath, _ = QFileDialog.getOpenFileName(self, "Select a Password File", "", "Text Files (*.txt *.csv);;All Files (*)")
+        if not filepath: return
+        self.audit_btn.setEnabled(False); self.stop_audit_btn.setEnabled(True); self.audit_progress.setValue(0); self.audit_progress.setVisible(True)
+        self._audit_worker = PasswordAuditWorker(filepath); self._audit_worker.progress.connect(self.audit_progress.setValue); self._audit_worker.status.connect(self.status_label.setText)
+        self._audit_worker.result_ready.connect(self._show_audit); self._audit_worker.finished.connect(self._on_audit_finished); self._audit_worker.start()
+    @Slot()
+    def _stop_audit(self):
+        if self._audit_worker and self._audit_worker.isRunning(): self._audit_worker.stop()
+        self.stop_audit_btn.setEnabled(False)
+    @Slot(str)
+    def _on_audit_finished(self, message):
+        self.audit_btn.setEnabled(True); self.stop_audit_btn.setEnabled(False); self.audit_progress.setVisible(False); self.status_label.setText(message)
+        if message.startswith("Error"): QMessageBox.critical(self, "Audit Error", message)
+    @Slot(dict)
+    def _show_audit(self, summary):
+        total = summary['total']
+        def rows(pairs): return "\n".join(f"  {label:<16}{n:>9,}  {n * 100 / total:5.1f}%  {'█' * round(n * 40 / total)}" for label, n in pairs)
+        report = (f"--- Password Audit ---\n\nPasswords: {total:,} ({summary['unique']:,} distinct, {total - summary['unique']:,} reused entries)\n"
+                  f"Median guesses: 10^{summary['median_guesses_log10']:.1f}\n\nScore distribution:\n{rows(zip(password_audit.SCORE_LABELS, summary['scores']))}\n\n"
+                  f"Time to crack (offline, slow hash):\n{rows(summary['crack_times'])}\n\nLength:\n{rows(summary['lengths'])}\n")
+        if summary['warnings']: report += "\nMost common weaknesses:\n" + "\n".join(f"  {n:>9,}  {w}" for w, n in summary['warnings']) + "\n"
+        if summary['reused']: report += "\nMost reused:\n" + "\n".join(f"  {n:>9,}x  {p[:2]}{'•' * max(len(p) - 2, 0)}" for p, n in summary['reused']) + "\n"
+        self.results_text.setPlainText(report)
     @Slot(bool)
     def toggle_password_visibility(self, checked):
         self.password_input.setEchoMode(QLineEdit.EchoMode.Normal if checked else QLineEdit.EchoMode.Password)
@@ -607,55 +896,150 @@ class HashToolWidget(QWidget):
         layout.addWidget(self.input_text, 1); control_layout = QHBoxLayout(); self.hash_algo_combo = QComboBox(); self.hash_algo_combo.addItems(["MD5", "SHA1", "SHA256", "SHA512"])
         self.calculate_btn = QPushButton("Calculate Hashes"); self.load_file_btn = QPushButton("Hash a File..."); control_layout.addWidget(QLabel("Algorithm (for cracker):"))
         control_layout.addWidget(self.hash_algo_combo); control_layout.addWidget(self.calculate_btn); control_layout.addWidget(self.load_file_btn); layout.addLayout(control_layout)
-        self.output_layout = QHBoxLayout(); self.md5_output = self._create_output_field("MD5:"); self.sha1_output = self._create_output_field("SHA1:")
-        self.sha256_output = self._create_output_field("SHA256:"); self.sha512_output = self._create_output_field("SHA512:"); layout.addLayout(self.output_layout)
-        cracker_layout = QHBoxLayout(); self.hash_to_crack_input = QLineEdit(); self.hash_to_crack_input.setPlaceholderText("Paste hash here to crack...")
-        self.wordlist_btn = QPushButton("Load Wordlist..."); self.crack_btn = QPushButton("Crack Hash"); cracker_layout.addWidget(QLabel("Crack Hash:"))
-        cracker_layout.addWidget(self.hash_to_crack_input); cracker_layout.addWidget(self.wordlist_btn); cracker_layout.addWidget(self.crack_btn); layout.addLayout(cracker_layout)
-        self.cracker_status = QLabel("Ready. Load a wordlist to attempt dictionary attack."); layout.addWidget(self.cracker_status); self.wordlist_path = None
-        self.calculate_btn.clicked.connect(self._calculate_text_hashes); self.load_file_btn.clicked.connect(self._load_and_hash_file)
-        self.wordlist_btn.clicked.connect(self._load_wordlist); self.crack_btn.clicked.connect(self._start_crack)
+        self.output_layout = QGridLayout(); self.hash_outputs = {name: self._create_output_field(f"{file_hash.LABELS[name]}:") for name in file_hash.ALGORITHMS}; layout.addLayout(self.output_layout)
+        self.file_progress = QProgressBar(); self.file_progress.setVisible(False); layout.addWidget(self.file_progress)
+        tree_layout = QHBoxLayout(); self.tree_algo_combo = QComboBox()
+        for name in file_hash.MANIFEST_ALGORITHMS: self.tree_algo_combo.addItem(file_hash.LABELS[name], name)
+        self.hash_dir_btn = QPushButton("Hash Directory..."); self.verify_manifest_btn = QPushButton("Verify Manifest..."); self.stop_tree_btn = QPushButton("Stop"); self.stop_tree_btn.setEnabled(False)
+        tree_layout.addWidget(QLabel("Directory / manifest:")); tree_layout.addWidget(self.tree_algo_combo); tree_layout.addWidget(self.hash_dir_btn); tree_layout.addWidget(self.verify_manifest_btn)
+        tree_layout.addWidget(self.stop_tree_btn); tree_layout.addStretch(); layout.addLayout(tree_layout)
+        self.manifest_table = ResultsView(["File", "Size", "Status", "Digest", "Cached"], placeholders={1: "—", 4: "—"}, stretch_column=3)
+        self.manifest_table.model.set_colors(2, {"OK": "#22c55e", "FAILED": "#ef4444", "MISSING": "#f59e0b", "ERROR": "#ef4444"}); self.manifest_table.setVisible(False); layout.addWidget(self.manifest_table, 1)
+        cracker_layout = QHBoxLayout(); self.hash_to_crack_input = QLineEdit(); self.hash_to_crack_input.setPlaceholderText("Paste hash here to crack, or load a list of hashes...")
+        self.hashes_btn = QPushButton("Load Hashes..."); self.wordlist_btn = QPushButton("Load Wordlist..."); self.crack_btn = QPushButton("Crack Hash"); self.stop_crack_btn = QPushButton("Stop"); self.stop_crack_btn.setEnabled(False)
+        cracker_layout.addWidget(QLabel("Crack Hash:")); cracker_layout.addWidget(self.hash_to_crack_input); cracker_layout.addWidget(self.hashes_btn); cracker_layout.addWidget(self.wordlist_btn)
+        cracker_layout.addWidget(self.crack_btn); cracker_layout.addWidget(self.stop_crack_btn); layout.addLayout(cracker_layout)
+        attack_layout = QHBoxLayout(); self.attack_combo = QComboBox(); self.attack_combo.addItems(["Wordlist", "Wordlist + Rules", "Mask"]); self.rules_combo = QComboBox()
+        for name, rules in cracker.RULE_PRESETS.items(): self.rules_combo.addItem(name, rules)
+        self.rules_btn = QPushButton("Load Rules..."); self.mask_input = QLineEdit(); self.mask_input.setPlaceholderText("Mask, e.g. ?u?l?l?l?d?d  (?l ?u ?d ?s ?a ?h ?H, ?? for a literal ?)")
+        self.format_combo = QComboBox()
+        for key, label in cracker.FORMATS.items(): self.format_combo.addItem(label, key)
+        attack_layout.addWidget(QLabel("Attack:")); attack_layout.addWidget(self.attack_combo); attack_layout.addWidget(self.rules_combo); attack_layout.addWidget(self.rules_btn)
+        attack_layout.addWidget(self.mask_input, 1); attack_layout.addWidget(QLabel("Format:")); attack_layout.addWidget(self.format_combo); layout.addLayout(attack_layout)
+        self.crack_progress = QProgressBar(); self.crack_progress.setVisible(False); layout.addWidget(self.crack_progress)
+        self.cracker_status = QLabel("Ready. Load a wordlist or enter a mask to attempt an attack."); self.cracker_status.setObjectName("statusLabel"); layout.addWidget(self.cracker_status)
+        self.cracked = ResultsView(["Hash", "Password"], stretch_column=1); self.cracked.setVisible(False); layout.addWidget(self.cracked, 1)
+        self.wordlist_path = None; self.hash_list = None; self.crack_worker = None; self.cracked_words = []; self.file_worker = None; self.tree_worker = None
+        self.calculate_btn.clicked.connect(self._calculate_text_hashes); self.load_file_btn.clicked.connect(self._load_and_hash_file); self.hashes_btn.clicked.connect(self._load_hash_list)
+        self.wordlist_btn.clicked.connect(self._load_wordlist); self.crack_btn.clicked.connect(self._start_crack); self.stop_crack_btn.clicked.connect(self._stop_crack)
+        self.hash_dir_btn.clicked.connect(self._hash_directory); self.verify_manifest_btn.clicked.connect(self._verify_manifest); self.stop_tree_btn.clicked.connect(self._stop_tree)
+        self.rules_btn.clicked.connect(self._load_rules); self.attack_combo.currentIndexChanged.connect(self._update_attack_controls); self._update_attack_controls()
+    @Slot()
+    def _update_attack_controls(self):
+        mode = self.attack_combo.currentText(); self.wordlist_btn.setEnabled(mode != "Mask"); self.mask_input.setEnabled(mode == "Mask")
+        self.rules_combo.setEnabled(mode == "Wordlist + Rules"); self.rules_btn.setEnabled(mode == "Wordlist + Rules")
+    @Slot()
+    def _load_rules(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Select a Rules File", "", "Rule Files (*.rule *.txt);;All Files (*)")
+        if not filepath: return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f: rules = cracker.parse_rules(f.read())
+        except (OSError, ValueError) as e: QMessageBox.critical(self, "Rules Error", f"Could not load the rules file:\n{e}"); return
+        if not rules: QMessageBox.warning(self, "Rules Error", "The rules file contains no rules."); return
+        self.rules_combo.addItem(f"{os.path.basename(filepath)} ({len(rules)} rules)", rules); self.rules_combo.setCurrentIndex(self.rules_combo.count() - 1)
     def _create_output_field(self, label_text):
-        h_layout = QHBoxLayout(); h_layout.addWidget(QLabel(label_text)); line_edit = QLineEdit(); line_edit.setReadOnly(True); h_layout.addWidget(line_edit); self.output_layout.addLayout(h_layout); return line_edit
+        position = self.output_layout.count() // 2; row, column = divmod(position, 3); line_edit = QLineEdit(); line_edit.setReadOnly(True)
+        self.output_layout.addWidget(QLabel(label_text), row, column * 2); self.output_layout.addWidget(line_edit, row, column * 2 + 1); return line_edit
     @Slot()
     def _calculate_text_hashes(self):
         text = self.input_text.toPlainText().encode('utf-8')
         if not text: return
-        self.md5_output.setText(hashlib.md5(text).hexdigest()); self.sha1_output.setText(hashlib.sha1(text).hexdigest())
-        self.sha256_output.setText(hashlib.sha256(text).hexdigest()); self.sha512_output.setText(hashlib.sha512(text).hexdigest())
+        for name, digest in file_hash.hash_bytes(text).items(): self.hash_outputs[name].setText(digest)
     @Slot()
     def _load_and_hash_file(self):
+        if self.file_worker and self.file_worker.isRunning(): self.file_worker.stop(); return
+        if self.tree_worker and self.tree_worker.isRunning(): return
         filepath, _ = QFileDialog.getOpenFileName(self, "Select a file to hash")
         if not filepath: return
-        self.input_text.setPlainText(f"--- Hashing File ---\n{filepath}"); md5, sha1, sha256, sha512 = hashlib.md5(), hashlib.sha1(), hashlib.sha256(), hashlib.sha512()
-        try:
-            with open(filepath, 'rb') as f:
-                while chunk := f.read(8192): md5.update(chunk); sha1.update(chunk); sha256.update(chunk); sha512.update(chunk)
-            self.md5_output.setText(md5.hexdigest()); self.sha1_output.setText(sha1.hexdigest()); self.sha256_output.setText(sha256.hexdigest()); self.sha512_output.setText(sha512.hexdigest())
-        except Exception as e: QMessageBox.critical(self, "File Error", f"Could not read or hash the file:\n{e}")
+        self.input_text.setPlainText(f"--- Hashing File ---\n{filepath}")
+        for output in self.hash_outputs.values(): output.clear()
+        self.file_progress.setValue(0); self.file_progress.setVisible(True); self.load_file_btn.setText("Cancel Hashing")
+        self.file_worker = FileHashWorker(filepath); self.file_worker.progress.connect(self.file_progress.setValue); self.file_worker.status.connect(self.cracker_status.setText)
+        self.file_worker.result_ready.connect(self._on_file_hashed); self.file_worker.error_occurred.connect(self._on_file_hash_error); self.file_worker.finished.connect(self._on_file_hash_done); self.file_worker.start()
+    @Slot(dict)
+    def _on_file_hashed(self, digests):
+        for name, digest in digests.items(): self.hash_outputs[name].setText(digest)
+    @Slot(str)
+    def _on_file_hash_error(self, message):
+        self.cracker_status.setText("Hashing failed."); QMessageBox.critical(self, "File Error", message)
+    @Slot()
+    def _hash_directory(self):
+        if any(w and w.isRunning() for w in (self.tree_worker, self.file_worker)): return
+        root = QFileDialog.getExistingDirectory(self, "Select a Directory to Hash")
+        if not root: return
+        algorithm = self.tree_algo_combo.currentData(); default = os.path.join(root, f"{algorithm.upper()}SUMS")
+        manifest, _ = QFileDialog.getSaveFileName(self, "Save Manifest (cancel to only list digests)", default, "Checksum Files (*SUMS *.sha* *.md5);;All Files (*)")
+        self._start_tree_worker(DirectoryHashWorker(root, algorithm, manifest or None))
+    @Slot()
+    def _verify_manifest(self):
+        if any(w and w.isRunning() for w in (self.tree_worker, self.file_worker)): return
+        manifest, _ = QFileDialog.getOpenFileName(self, "Select a Manifest to Verify", "", "Checksum Files (*SUMS *.sha* *.md5 *.txt);;All Files (*)")
+        if manifest: self._start_tree_worker(ManifestVerifyWorker(manifest))
+    def _start_tree_worker(self, worker):
+        self.manifest_table.clear(); self.manifest_table.setVisible(True); self.file_progress.setValue(0); self.file_progress.setVisible(True)
+        self.hash_dir_btn.setEnabled(False); self.verify_manifest_btn.setEnabled(False); self.stop_tree_btn.setEnabled(True)
+        self.tree_worker = worker; worker.rows_ready.connect(self.manifest_table.extend); worker.progress.connect(self.file_progress.setValue)
+        worker.status.connect(self.cracker_status.setText); worker.finished.connect(self._on_tree_finished); worker.start()
+    @Slot()
+    def _stop_tree(self):
+        if self.tree_worker and self.tree_worker.isRunning(): self.tree_worker.stop()
+        self.stop_tree_btn.setEnabled(False)
+    @Slot(str)
+    def _on_tree_finished(self, message):
+        self.hash_dir_btn.setEnabled(True); self.verify_manifest_btn.setEnabled(True); self.stop_tree_btn.setEnabled(False); self.file_progress.setVisible(False)
+        self.cracker_status.setText(message); self.manifest_table.fit_columns([0, 1, 2])
+        if message.startswith("Error"): QMessageBox.critical(self, "Manifest Error", message)
+    @Slot()
+    def _on_file_hash_done(self): self.file_progress.setVisible(False); self.load_file_btn.setText("Hash a File...")
     @Slot()
     def _load_wordlist(self):
         filepath, _ = QFileDialog.getOpenFileName(self, "Select a Wordlist File", "", "Text Files (*.txt);;All Files (*)")
         if filepath: self.wordlist_path = filepath; self.cracker_status.setText(f"Loaded wordlist: {os.path.basename(filepath)}")
     @Slot()
-    def _start_crack(self):
-        hash_to_crack = self.hash_to_crack_input.text().strip().lower()
-        if not self.wordlist_path: QMessageBox.warning(self, "Wordlist Missing", "Please load a wordlist file first."); return
-        if not hash_to_crack: QMessageBox.warning(self, "Input Missing", "Please paste a hash to crack."); return
-        algo_name = self.hash_algo_combo.currentText().lower(); hash_func = getattr(hashlib, algo_name); self.cracker_status.setText("Cracking... this may take a while."); QApplication.processEvents()
-        found = False
+    def _load_hash_list(self):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Select a Hash List", "", "Text Files (*.txt *.csv);;All Files (*)")
+        if not filepath: return
         try:
-            with open(self.wordlist_path, 'r', errors='ignore') as f:
-                for line in f:
-                    word = line.strip(); hashed_word = hash_func(word.encode('utf-8')).hexdigest()
-                    if hashed_word == hash_to_crack:
-                        self.cracker_status.setText(f"Success! Password found: {word}"); QMessageBox.information(self, "Success", f"The password for the hash is:\n\n{word}"); found = True; break
-            if not found: self.cracker_status.setText("Failed. Password not found in the wordlist.")
-        except Exception as e: self.cracker_status.setText(f"Error: Could not process wordlist."); QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f: self.hash_list = f.read()
+        except OSError as e: QMessageBox.critical(self, "File Error", f"Could not read the hash list:\n{e}"); return
+        self.hash_to_crack_input.clear(); self.hash_to_crack_input.setPlaceholderText(f"Hash list: {os.path.basename(filepath)} (paste a single hash to use it instead)")
+        self.cracker_status.setText(f"Loaded hash list: {os.path.basename(filepath)}")
+    @Slot()
+    def _start_crack(self):
+        if self.crack_worker and self.crack_worker.isRunning(): return
+        mode = self.attack_combo.currentText(); mask = self.mask_input.text().strip() if mode == "Mask" else None
+        if mode == "Mask":
+            if not mask: QMessageBox.warning(self, "Mask Missing", "Please enter a mask such as ?l?l?l?l?d?d."); return
+            try: keyspace = cracker.mask_keyspace(mask)
+            except ValueError as e: QMessageBox.warning(self, "Invalid Mask", str(e)); return
+        elif not self.wordlist_path: QMessageBox.warning(self, "Wordlist Missing", "Please load a wordlist file first."); return
+        source = self.hash_to_crack_input.text().strip() or self.hash_list
+        if not source: QMessageBox.warning(self, "Input Missing", "Please paste a hash to crack or load a hash list."); return
+        algo_name = self.hash_algo_combo.currentText().lower(); fmt = self.format_combo.currentData()
+        try: targets = cracker.parse_targets(source, algo_name, fmt)
+        except ValueError as e: QMessageBox.warning(self, "Invalid Hash", str(e)); return
+        if not targets: QMessageBox.warning(self, "Input Missing", "No hashes were found to crack."); return
+        rules = self.rules_combo.currentData() if mode == "Wordlist + Rules" else None
+        self.cracked.clear(); self.cracked_words = []; self.cracked.setVisible(len(targets) > 1); self.crack_progress.setValue(0); self.crack_progress.setVisible(True)
+        detail = f"mask {mask} ({keyspace:,} candidates)" if mask else f"{len(rules)} rules" if rules else "the wordlist"
+        self.crack_btn.setEnabled(False); self.stop_crack_btn.setEnabled(True); self.cracker_status.setText(f"Cracking {len(targets)} {algo_name.upper()} hash(es) with {detail}...")
+        self.crack_worker = CrackWorker(algo_name, targets, fmt, wordlist=None if mask else self.wordlist_path, rules=rules, mask=mask)
+        self.crack_worker.found.connect(self._on_cracked); self.crack_worker.progress.connect(self.crack_progress.setValue)
+        self.crack_worker.status.connect(self.cracker_status.setText); self.crack_worker.finished.connect(self._on_crack_finished); self.crack_worker.start()
+    @Slot()
+    def _stop_crack(self):
+        if self.crack_worker and self.crack_worker.isRunning(): self.crack_worker.stop()
+        self.stop_crack_btn.setEnabled(False)
+    @Slot(str, str)
+    def _on_cracked(self, digest, word): self.cracked.append((digest, word)); self.cracked_words.append(word)
+    @Slot(str)
+    def _on_crack_finished(self, message):
+        self.crack_btn.setEnabled(True); self.stop_crack_btn.setEnabled(False); self.crack_progress.setVisible(False); self.cracker_status.setText(message)
+        if len(self.crack_worker.cracker.targets) == 1 and self.cracked_words: QMessageBox.information(self, "Success", f"The password for the hash is:\n\n{self.cracked_words[0]}")
     def apply_settings(self, settings: dict): pass
 
 class DnsLookupWidget(QWidget):
-    """DNS record lookup — wraps nslookup with record-type selector."""
+    """DNS record lookup — built-in resolver with record-type selector."""
 
     RECORD_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME', 'SOA', 'PTR', 'SRV']
 
@@ -676,6 +1060,9 @@ class DnsLookupWidget(QWidget):
         self.type_combo.addItems(self.RECORD_TYPES)
         self.type_combo.setFixedWidth(80)
         ctrl.addWidget(self.type_combo)
+        self.bypass_cache_chk = QCheckBox("Bypass cache")
+        self.bypass_cache_chk.setToolTip("Always ask the resolver instead of reusing a cached answer")
+        ctrl.addWidget(self.bypass_cache_chk)
         self.lookup_btn = QPushButton("Look Up")
         ctrl.addWidget(self.lookup_btn)
         layout.addLayout(ctrl)
@@ -699,7 +1086,7 @@ class DnsLookupWidget(QWidget):
         record_type = self.type_combo.currentText()
         self.output.setPlainText(f"Querying {record_type} records for {host}…\n")
         self.lookup_btn.setEnabled(False)
-        self._worker = DnsLookupWorker(host, record_type)
+        self._worker = DnsLookupWorker(host, record_type, use_cache=not self.bypass_cache_chk.isChecked())
         self._worker.result_ready.connect(self.output.setPlainText)
         self._worker.finished.connect(lambda: self.lookup_btn.setEnabled(True))
         self._worker.start()
@@ -709,11 +1096,15 @@ class DnsLookupWidget(QWidget):
 
 
 class WhoisWidget(QWidget):
-    """Whois lookup via raw socket — supports domains and IP addresses."""
+    """Whois lookup via raw socket — supports domains and IP addresses, singly or in bulk."""
+
+    BULK_COLUMNS = ["Query", "Registrar / Org", "Created", "Expires", "Days Left",
+                    "Name Servers / Netblock", "ASN", "Whois Server", "Source"]
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._bulk_worker = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -723,18 +1114,52 @@ class WhoisWidget(QWidget):
         self.query_input = QLineEdit()
         self.query_input.setPlaceholderText("e.g.  example.com  or  1.1.1.1")
         ctrl.addWidget(self.query_input, 1)
+        self.cache_check = QCheckBox("Use cache")
+        self.cache_check.setChecked(True)
+        ctrl.addWidget(self.cache_check)
         self.lookup_btn = QPushButton("Look Up")
         ctrl.addWidget(self.lookup_btn)
+        self.bulk_btn = QPushButton("Bulk from File...")
+        ctrl.addWidget(self.bulk_btn)
+        self.report_btn = QPushButton("Expiry Report")
+        ctrl.addWidget(self.report_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        ctrl.addWidget(self.stop_btn)
         layout.addLayout(ctrl)
 
+        self.tabs = QTabWidget()
         self.output = QTextEdit()
         self.output.setReadOnly(True)
         self.output.setFont(QFont("Consolas", 9))
         self.output.setPlaceholderText("Whois registration data will appear here…")
-        layout.addWidget(self.output)
+        self.tabs.addTab(self.output, "Lookup")
+
+        bulk_page = QWidget()
+        bulk_layout = QVBoxLayout(bulk_page)
+        bulk_layout.setContentsMargins(0, 0, 0, 0)
+        self.bulk_status = QLabel("Load a text file with one domain or IP per line.")
+        self.bulk_status.setObjectName("statusLabel")
+        bulk_layout.addWidget(self.bulk_status)
+        self.bulk_table = QTableWidget(0, len(self.BULK_COLUMNS))
+        self.bulk_table.setHorizontalHeaderLabels(self.BULK_COLUMNS)
+        for col in range(len(self.BULK_COLUMNS)):
+            self.bulk_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+        self.bulk_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        self.bulk_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.bulk_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
+        self.bulk_table.verticalHeader().setVisible(False)
+        bulk_layout.addWidget(self.bulk_table)
+        self.tabs.addTab(bulk_page, "Bulk")
+        layout.addWidget(self.tabs)
 
+        self._bulk_text = {}
         self.lookup_btn.clicked.connect(self._run_lookup)
         self.query_input.returnPressed.connect(self._run_lookup)
+        self.bulk_btn.clicked.connect(self._run_bulk)
+        self.report_btn.clicked.connect(self._show_expiry_report)
+        self.stop_btn.clicked.connect(self._stop_bulk)
+        self.bulk_table.cellDoubleClicked.connect(self._show_bulk_result)
 
     @Slot()
     def _run_lookup(self):
@@ -743,24 +1168,150 @@ class WhoisWidget(QWidget):
             return
         if self._worker and self._worker.isRunning():
             return
+        self.tabs.setCurrentIndex(0)
         self.output.setPlainText(f"Querying whois for: {query}\n…")
         self.lookup_btn.setEnabled(False)
-        self._worker = WhoisWorker(query)
+        self._worker = WhoisWorker(query, self.cache_check.isChecked())
         self._worker.result_ready.connect(self.output.setPlainText)
         self._worker.error_occurred.connect(self.output.setPlainText)
         self._worker.finished.connect(lambda: self.lookup_btn.setEnabled(True))
         self._worker.start()
 
+    @Slot()
+    def _run_bulk(self):
+        if self._bulk_worker and self._bulk_worker.isRunning():
+            return
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Select a Domain / IP List", "", "Text Files (*.txt *.csv);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                queries = [line.split('#', 1)[0].split(',')[0].strip() for line in f]
+        except OSError as e:
+            QMessageBox.critical(self, "File Error", f"Could not read the list:\n{e}")
+            return
+        queries = [q for q in queries if q]
+        if not queries:
+            QMessageBox.warning(self, "Bulk Whois", "No domains or addresses were found in that file.")
+            return
+        self.tabs.setCurrentIndex(1)
+        self.bulk_table.setSortingEnabled(False)
+        self.bulk_table.setRowCount(0)
+        self._bulk_text.clear()
+        self.bulk_status.setText(f"Resolving whois servers for {len(queries)} queries…")
+        self.bulk_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self._bulk_worker = BulkWhoisWorker(queries, self.cache_check.isChecked())
+        self._bulk_worker.row_ready.connect(self._add_bulk_row)
+        self._bulk_worker.status.connect(self.bulk_status.setText)
+        self._bulk_worker.finished.connect(self._on_bulk_finished)
+        self._bulk_worker.start()
+
+    @Slot()
+    def _stop_bulk(self):
+        if self._bulk_worker and self._bulk_worker.isRunning():
+            self._bulk_worker.stop()
+        self.stop_btn.setEnabled(False)
+
+    def _append_bulk_row(self, query, fields, server, source, error=None):
+        row = self.bulk_table.rowCount()
+        self.bulk_table.insertRow(row)
+
+        def join(value):
+            return ', '.join(value) if isinstance(value, list) else (value or '')
+
+        expires = fields.get('expires') or ''
+        days_left = QTableWidgetItem()
+        try:
+            days = (datetime.date.fromisoformat(expires) - datetime.date.today()).days
+            days_left.setData(Qt.ItemDataRole.DisplayRole, days)
+            if days < 30:
+                days_left.setForeground(QBrush(QColor("#ef4444" if days < 0 else "#f59e0b")))
+        except ValueError:
+            pass
+        cells = [
+            query,
+            join(fields.get('registrar') or fields.get('org')),
+            join(fields.get('created')),
+            expires,
+            days_left,
+            join(fields.get('name_servers') or fields.get('netblock')),
+            join(fields.get('asn')),
+            server,
+            source,
+        ]
+        for col, value in enumerate(cells):
+            self.bulk_table.setItem(row, col, value if isinstance(value, QTableWidgetItem) else QTableWidgetItem(value))
+        if error:
+            item = QTableWidgetItem(f"Error: {error}")
+            item.setForeground(QBrush(QColor("#f59e0b")))
+            self.bulk_table.setItem(row, 1, item)
+
+    @Slot(dict)
+    def _add_bulk_row(self, data):
+        if not data['error']:
+            self._bulk_text[data['query']] = data['text']
+        self._append_bulk_row(data['query'], data['fields'], data['server'],
+                              "cache" if data['cached'] else "live", data['error'])
+
+    @Slot()
+    def _show_expiry_report(self):
+        if self._bulk_worker and self._bulk_worker.isRunning():
+            return
+        try:
+            rows = whois_client.get_client().expiry_report()
+        except Exception as e:
+            self.bulk_status.setText(f"Could not read the whois index: {e}")
+            return
+        self.tabs.setCurrentIndex(1)
+        self.bulk_table.setSortingEnabled(False)
+        self.bulk_table.setRowCount(0)
+        self._bulk_text.clear()
+        self.bulk_table.setUpdatesEnabled(False)
+        for r in rows:
+            self._append_bulk_row(r['query'], r, r['server'], "index")
+        self.bulk_table.setUpdatesEnabled(True)
+        self.bulk_table.setSortingEnabled(True)
+        self.bulk_table.sortItems(3, Qt.SortOrder.AscendingOrder)
+        self.bulk_status.setText(f"Expiry report: {len(rows)} indexed domain(s), soonest expiry first.")
+
+    @Slot(int, int)
+    def _show_bulk_result(self, row, _col):
+        query = self.bulk_table.item(row, 0).text()
+        text = self._bulk_text.get(query)
+        if text is None:
+            cached = whois_client.get_client().cached_result(query)
+            text = cached[2] if cached else None
+        if text is not None:
+            self.output.setPlainText(text)
+            self.tabs.setCurrentIndex(0)
+
+    @Slot(str)
+    def _on_bulk_finished(self, message):
+        self.bulk_status.setText(message + "  Double-click a row to view the full record.")
+        self.bulk_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.bulk_table.setSortingEnabled(True)
+
     def apply_settings(self, settings: dict):
         pass
 
 
 class HttpHeadersWidget(QWidget):
-    """Fetch and display HTTP response headers for any URL."""
+    """Fetch and display HTTP response headers for any URL, or audit a URL list in bulk."""
+
+    AUDIT_COLUMNS = ["URL", "Status", "Method", "Time (ms)", "Redirects", "Final URL",
+                     "Security Headers", "Missing"]
+    TIMING_COLUMNS = ["Phase", "Min", "p50", "p90", "p95", "p99", "Max", "Mean"]
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._bulk_worker = None
+        self._timing_worker = None
+        self._audit_results = {}
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -772,12 +1323,28 @@ class HttpHeadersWidget(QWidget):
         ctrl.addWidget(self.url_input, 1)
         self.fetch_btn = QPushButton("Fetch Headers")
         ctrl.addWidget(self.fetch_btn)
+        self.timing_btn = QPushButton("Time Request")
+        ctrl.addWidget(self.timing_btn)
+        ctrl.addWidget(QLabel("Samples:"))
+        self.samples_spin = QSpinBox()
+        self.samples_spin.setRange(1, 1000)
+        self.samples_spin.setValue(1)
+        ctrl.addWidget(self.samples_spin)
+        self.bulk_btn = QPushButton("Audit from File...")
+        ctrl.addWidget(self.bulk_btn)
+        self.export_btn = QPushButton("Export CSV...")
+        self.export_btn.setEnabled(False)
+        ctrl.addWidget(self.export_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        ctrl.addWidget(self.stop_btn)
         layout.addLayout(ctrl)
 
         self.summary_label = QLabel("Enter a URL and click Fetch Headers.")
         self.summary_label.setObjectName("statusLabel")
         layout.addWidget(self.summary_label)
 
+        self.tabs = QTabWidget()
         self.table = QTableWidget(0, 2)
         self.table.setHorizontalHeaderLabels(["Header", "Value"])
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
@@ -785,10 +1352,34 @@ class HttpHeadersWidget(QWidget):
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
-        layout.addWidget(self.table)
+        self.tabs.addTab(self.table, "Headers")
+
+        self.audit_table = QTableWidget(0, len(self.AUDIT_COLUMNS))
+        self.audit_table.setHorizontalHeaderLabels(self.AUDIT_COLUMNS)
+        for col in range(len(self.AUDIT_COLUMNS)):
+            self.audit_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+        self.audit_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.audit_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.audit_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
+        self.audit_table.verticalHeader().setVisible(False)
+        self.tabs.addTab(self.audit_table, "Bulk Audit")
+
+        self.timing_table = QTableWidget(0, len(self.TIMING_COLUMNS))
+        self.timing_table.setHorizontalHeaderLabels(self.TIMING_COLUMNS)
+        for col in range(len(self.TIMING_COLUMNS)):
+            self.timing_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
+        self.timing_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
+        self.timing_table.verticalHeader().setVisible(False)
+        self.tabs.addTab(self.timing_table, "Timing")
+        layout.addWidget(self.tabs)
 
         self.fetch_btn.clicked.connect(self._run_fetch)
         self.url_input.returnPressed.connect(self._run_fetch)
+        self.timing_btn.clicked.connect(self._run_timing)
+        self.bulk_btn.clicked.connect(self._run_audit)
+        self.export_btn.clicked.connect(self._export_csv)
+        self.stop_btn.clicked.connect(self._stop_audit)
+        self.audit_table.cellDoubleClicked.connect(self._show_audit_result)
 
     @Slot()
     def _run_fetch(self):
@@ -797,6 +1388,7 @@ class HttpHeadersWidget(QWidget):
             return
         if self._worker and self._worker.isRunning():
             return
+        self.tabs.setCurrentIndex(0)
         self.table.setRowCount(0)
         self.summary_label.setText(f"Fetching headers for {url}…")
         self.fetch_btn.setEnabled(False)
@@ -825,16 +1417,177 @@ class HttpHeadersWidget(QWidget):
     def _on_error(self, msg):
         self.summary_label.setText(f"Error: {msg}")
 
+    @Slot()
+    def _run_audit(self):
+        if self._bulk_worker and self._bulk_worker.isRunning():
+            return
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Select a URL List", "", "Text Files (*.txt *.csv);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                urls = [line.split('#', 1)[0].split(',')[0].strip() for line in f]
+        except OSError as e:
+            QMessageBox.critical(self, "File Error", f"Could not read the list:\n{e}")
+            return
+        urls = [u for u in urls if u]
+        if not urls:
+            QMessageBox.warning(self, "HTTP Audit", "No URLs were found in that file.")
+            return
+        self.tabs.setCurrentIndex(1)
+        self.audit_table.setSortingEnabled(False)
+        self.audit_table.setRowCount(0)
+        self._audit_results.clear()
+        self.summary_label.setText(f"Auditing {len(urls)} URLs…")
+        self.bulk_btn.setEnabled(False)
+        self.export_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self._bulk_worker = BulkHttpAuditWorker(urls)
+        self._bulk_worker.row_ready.connect(self._add_audit_row)
+        self._bulk_worker.status.connect(self.summary_label.setText)
+        self._bulk_worker.finished.connect(self._on_audit_finished)
+        self._bulk_worker.start()
+
+    @Slot()
+    def _stop_audit(self):
+        for worker in (self._bulk_worker, self._timing_worker):
+            if worker and worker.isRunning():
+                worker.stop()
+        self.stop_btn.setEnabled(False)
+
+    @Slot()
+    def _run_timing(self):
+        url = self.url_input.text().strip()
+        if not url or (self._timing_worker and self._timing_worker.isRunning()):
+            return
+        samples = self.samples_spin.value()
+        self.tabs.setCurrentIndex(2)
+        self.timing_table.setRowCount(0)
+        self.summary_label.setText(f"Timing {samples} request(s) to {url}…")
+        self.timing_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self._timing_worker = HttpTimingWorker(url, samples)
+        self._timing_worker.sample_ready.connect(self._on_timing_sample)
+        self._timing_worker.result_ready.connect(self._display_timing)
+        self._timing_worker.error_occurred.connect(self._on_error)
+        self._timing_worker.finished.connect(self._on_timing_finished)
+        self._timing_worker.start()
+
+    @Slot(int, dict)
+    def _on_timing_sample(self, index, sample):
+        self.summary_label.setText(
+            f"Sample {index}/{self.samples_spin.value()}:  {sample['status']} {sample['reason']}   |   "
+            f"TTFB {sample['ttfb_ms']:.1f} ms   |   total {sample['total_ms']:.1f} ms"
+        )
+
+    @Slot(dict)
+    def _display_timing(self, data):
+        # Signal dicts arrive with their keys re-ordered, so lay the rows out in phase order
+        phases = [phase for phase in http_timing.PHASES if phase in data['summary']]
+        self.timing_table.setRowCount(len(phases))
+        for row, phase in enumerate(phases):
+            stats = data['summary'][phase]
+            self.timing_table.setItem(row, 0, QTableWidgetItem(http_timing.PHASE_LABELS[phase]))
+            for col, key in enumerate(("min", "p50", "p90", "p95", "p99", "max", "mean"), start=1):
+                item = QTableWidgetItem(f"{stats[key]:.1f} ms")
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.timing_table.setItem(row, col, item)
+        failed = f", {data['errors']} failed" if data['errors'] else ""
+        self.summary_label.setText(
+            f"  {data['status']} {data['reason']}   |   {data['address']}   |   {data['bytes']} bytes   |   "
+            f"{data['samples']} sample(s){failed}   |   {data['url']}"
+        )
+
+    @Slot()
+    def _on_timing_finished(self):
+        self.timing_btn.setEnabled(True)
+        if not (self._bulk_worker and self._bulk_worker.isRunning()):
+            self.stop_btn.setEnabled(False)
+
+    @Slot(dict)
+    def _add_audit_row(self, data):
+        row = self.audit_table.rowCount()
+        self.audit_table.insertRow(row)
+        self.audit_table.setItem(row, 0, QTableWidgetItem(data['url']))
+        if data['error']:
+            item = QTableWidgetItem(data['error'])
+            item.setForeground(QBrush(QColor("#ef4444")))
+            self.audit_table.setItem(row, 5, item)
+            return
+        self._audit_results[data['url']] = data
+        present = [name for name, value in data['security'].items() if value]
+        missing = [name for name, value in data['security'].items() if not value]
+        status = QTableWidgetItem()
+        status.setData(Qt.ItemDataRole.DisplayRole, data['status'])
+        if data['status'] >= 400:
+            status.setForeground(QBrush(QColor("#ef4444" if data['status'] >= 500 else "#f59e0b")))
+        elapsed = QTableWidgetItem()
+        elapsed.setData(Qt.ItemDataRole.DisplayRole, data['elapsed_ms'])
+        redirects = QTableWidgetItem()
+        redirects.setData(Qt.ItemDataRole.DisplayRole, len(data['redirects']))
+        security = QTableWidgetItem(f"{len(present)}/{len(data['security'])}")
+        if missing:
+            security.setForeground(QBrush(QColor("#f59e0b")))
+        cells = [status, data['method'], elapsed, redirects, data['final_url'], security, ', '.join(missing)]
+        for col, value in enumerate(cells, start=1):
+            self.audit_table.setItem(row, col, value if isinstance(value, QTableWidgetItem) else QTableWidgetItem(value))
+
+    @Slot(int, int)
+    def _show_audit_result(self, row, _col):
+        data = self._audit_results.get(self.audit_table.item(row, 0).text())
+        if data is None:
+            return
+        self._display_results(data)
+        chain = "   →   ".join(f"{status} ({ms} ms)" for _url, status, ms in data['hops'])
+        self.summary_label.setText(f"{self.summary_label.text()}   |   {chain}")
+        self.tabs.setCurrentIndex(0)
+
+    @Slot(str)
+    def _on_audit_finished(self, message):
+        self.summary_label.setText(message + "  Double-click a row to view its headers.")
+        self.bulk_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.export_btn.setEnabled(self.audit_table.rowCount() > 0)
+        self.audit_table.setSortingEnabled(True)
+        self.audit_table.resizeColumnsToContents()
+
+    @Slot()
+    def _export_csv(self):
+        filepath, _ = QFileDialog.getSaveFileName(self, "Export Audit", "http_audit.csv", "CSV Files (*.csv)")
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.AUDIT_COLUMNS + ["Redirect Chain"])
+                for row in range(self.audit_table.rowCount()):
+                    cells = [self.audit_table.item(row, col) for col in range(len(self.AUDIT_COLUMNS))]
+                    values = [item.text() if item else '' for item in cells]
+                    data = self._audit_results.get(values[0])
+                    chain = ' -> '.join(f'{status} {url}' for url, status, _ms in data['hops']) if data else ''
+                    writer.writerow(values + [chain])
+        except OSError as e:
+            QMessageBox.critical(self, "Export Error", f"Could not write the file:\n{e}")
+            return
+        self.summary_label.setText(f"Exported {self.audit_table.rowCount()} rows to {os.path.basename(filepath)}.")
+
     def apply_settings(self, settings: dict):
         pass
 
 
 class SslCheckerWidget(QWidget):
-    """Inspect TLS/SSL certificate details for any host and port."""
+    """Inspect TLS/SSL certificate details for any host and port, or inventory many endpoints."""
+
+    INVENTORY_COLUMNS = ["Host", "Port", "IP", "Common Name", "Issuer", "Expires", "Days Left",
+                         "Protocol", "Cipher", "Key", "Chain", "SANs / Error"]
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._scan_worker = None
+        self._enum_worker = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -842,7 +1595,7 @@ class SslCheckerWidget(QWidget):
         ctrl = QHBoxLayout()
         ctrl.addWidget(QLabel("Host:"))
         self.host_input = QLineEdit()
-        self.host_input.setPlaceholderText("e.g.  example.com")
+        self.host_input.setPlaceholderText("e.g.  example.com   or a range:  10.0.0.0/24")
         ctrl.addWidget(self.host_input, 1)
         ctrl.addWidget(QLabel("Port:"))
         self.port_spin = QSpinBox()
@@ -852,16 +1605,62 @@ class SslCheckerWidget(QWidget):
         ctrl.addWidget(self.port_spin)
         self.inspect_btn = QPushButton("Inspect")
         ctrl.addWidget(self.inspect_btn)
+        self.enum_btn = QPushButton("Enumerate Ciphers")
+        ctrl.addWidget(self.enum_btn)
+        self.enum_cache_check = QCheckBox("Use cache")
+        self.enum_cache_check.setChecked(True)
+        self.enum_cache_check.setToolTip("Reuse the last enumeration unless the certificate has changed")
+        ctrl.addWidget(self.enum_cache_check)
         layout.addLayout(ctrl)
 
+        scan_ctrl = QHBoxLayout()
+        scan_ctrl.addWidget(QLabel("Inventory ports:"))
+        self.ports_input = QLineEdit(", ".join(str(p) for p in tls_inventory.DEFAULT_PORTS))
+        scan_ctrl.addWidget(self.ports_input, 1)
+        self.scan_range_btn = QPushButton("Scan Range")
+        scan_ctrl.addWidget(self.scan_range_btn)
+        self.scan_file_btn = QPushButton("Scan from File...")
+        scan_ctrl.addWidget(self.scan_file_btn)
+        self.report_btn = QPushButton("Expiry Report")
+        scan_ctrl.addWidget(self.report_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        scan_ctrl.addWidget(self.stop_btn)
+        layout.addLayout(scan_ctrl)
+
+        self.tabs = QTabWidget()
         self.output = QTextEdit()
         self.output.setReadOnly(True)
         self.output.setFont(QFont("Consolas", 10))
         self.output.setPlaceholderText("SSL certificate details will appear here…")
-        layout.addWidget(self.output)
+        self.tabs.addTab(self.output, "Inspect")
+
+        inventory_page = QWidget()
+        inventory_layout = QVBoxLayout(inventory_page)
+        inventory_layout.setContentsMargins(0, 0, 0, 0)
+        self.scan_status = QLabel("Scan a range or a host list to build the certificate inventory.")
+        self.scan_status.setObjectName("statusLabel")
+        inventory_layout.addWidget(self.scan_status)
+        self.inventory_table = QTableWidget(0, len(self.INVENTORY_COLUMNS))
+        self.inventory_table.setHorizontalHeaderLabels(self.INVENTORY_COLUMNS)
+        for col in range(len(self.INVENTORY_COLUMNS)):
+            self.inventory_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+        self.inventory_table.horizontalHeader().setStretchLastSection(True)
+        self.inventory_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.inventory_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
+        self.inventory_table.verticalHeader().setVisible(False)
+        inventory_layout.addWidget(self.inventory_table)
+        self.tabs.addTab(inventory_page, "Inventory")
+        layout.addWidget(self.tabs)
 
         self.inspect_btn.clicked.connect(self._run_check)
         self.host_input.returnPressed.connect(self._run_check)
+        self.enum_btn.clicked.connect(self._run_enumeration)
+        self.scan_range_btn.clicked.connect(self._scan_range)
+        self.scan_file_btn.clicked.connect(self._scan_file)
+        self.report_btn.clicked.connect(self._show_expiry_report)
+        self.stop_btn.clicked.connect(self._stop_scan)
+        self.inventory_table.cellDoubleClicked.connect(self._show_inventory_entry)
 
     @Slot()
     def _run_check(self):
@@ -871,6 +1670,7 @@ class SslCheckerWidget(QWidget):
         if self._worker and self._worker.isRunning():
             return
         port = self.port_spin.value()
+        self.tabs.setCurrentIndex(0)
         self.output.setPlainText(f"Connecting to {host}:{port}…")
         self.inspect_btn.setEnabled(False)
         self._worker = SslCheckerWorker(host, port)
@@ -931,6 +1731,234 @@ class SslCheckerWidget(QWidget):
                   '', '=' * 54]
         self.output.setPlainText('\n'.join(lines))
 
+    @Slot()
+    def _run_enumeration(self):
+        host = self.host_input.text().strip()
+        if not host or (self._enum_worker and self._enum_worker.isRunning()):
+            return
+        port = self.port_spin.value()
+        self.tabs.setCurrentIndex(0)
+        self.output.setPlainText(f"Enumerating protocols and cipher suites on {host}:{port}…")
+        self.enum_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self._enum_worker = TlsEnumerationWorker(host, port, self.enum_cache_check.isChecked())
+        self._enum_worker.status.connect(self.output.setPlainText)
+        self._enum_worker.result_ready.connect(self._display_enumeration)
+        self._enum_worker.error_occurred.connect(self.output.setPlainText)
+        self._enum_worker.finished.connect(self._on_enumeration_finished)
+        self._enum_worker.start()
+
+    @Slot(dict)
+    def _display_enumeration(self, data):
+        lines = [
+            '=' * 54,
+            f"  TLS Enumeration  —  {data['host']}:{data['port']}",
+            '=' * 54,
+            '', '  Protocols:',
+        ]
+        for name, _version in tls_enum.PROTOCOLS:
+            accepted = data['protocols'].get(name)
+            state = 'not tested' if accepted is None else 'accepted' if accepted else 'refused'
+            if accepted and name in tls_enum.DEPRECATED_PROTOCOLS:
+                state += '  (deprecated)'
+            lines.append(f"    {name:<12} :  {state}")
+        lines += ['', f"  Cipher Suites ({len(data['ciphers'])} accepted):"]
+        for cipher in data['ciphers']:
+            lines.append(f"    [{cipher['grade'].upper():<8}] {cipher['name']:<34} {cipher['bits'] or '?':>4} bits"
+                         f"  kx={cipher['kex']:<6} {', '.join(cipher['protocols'])}")
+        if data['cached']:
+            scanned = datetime.datetime.fromtimestamp(data['scanned_at']).strftime('%Y-%m-%d %H:%M')
+            source = f"cached result from {scanned} (certificate unchanged)"
+        else:
+            source = f"{data['handshakes']} handshakes, {data['suites_tested']} suites known to this OpenSSL build"
+        lines += ['', f"  Source       :  {source}"]
+        if data.get('incomplete'):
+            lines.append("  Note         :  stopped before completion; results are partial")
+        lines += ["  Note         :  TLS 1.3 suites cannot be restricted from Python; only the",
+                  "                  suite the server selects is listed.",
+                  '', '=' * 54]
+        self.output.setPlainText('\n'.join(lines))
+
+    @Slot()
+    def _on_enumeration_finished(self):
+        self.enum_btn.setEnabled(True)
+        if not (self._scan_worker and self._scan_worker.isRunning()):
+            self.stop_btn.setEnabled(False)
+
+    @Slot()
+    def _scan_range(self):
+        spec = self.host_input.text().strip()
+        if not spec:
+            return
+        try:
+            targets = tls_inventory.parse_targets(spec)
+        except ValueError as e:
+            QMessageBox.warning(self, "TLS Inventory", str(e))
+            return
+        self._start_scan(targets)
+
+    @Slot()
+    def _scan_file(self):
+        if self._scan_worker and self._scan_worker.isRunning():
+            return
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Select a Host List", "", "Text Files (*.txt *.csv);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                targets = tls_inventory.parse_targets(f.read())
+        except OSError as e:
+            QMessageBox.critical(self, "File Error", f"Could not read the list:\n{e}")
+            return
+        except ValueError as e:
+            QMessageBox.warning(self, "TLS Inventory", str(e))
+            return
+        if not targets:
+            QMessageBox.warning(self, "TLS Inventory", "No hosts were found in that file.")
+            return
+        self._start_scan(targets)
+
+    def _start_scan(self, targets):
+        if self._scan_worker and self._scan_worker.isRunning():
+            return
+        try:
+            ports = tls_inventory.parse_ports(self.ports_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "TLS Inventory", f"Invalid port list: {e}")
+            return
+        if not ports:
+            ports = list(tls_inventory.DEFAULT_PORTS)
+        self.tabs.setCurrentIndex(1)
+        self.inventory_table.setSortingEnabled(False)
+        self.inventory_table.setRowCount(0)
+        self._scan_worker = TlsInventoryWorker(targets, ports)
+        self.scan_status.setText(f"Scanning {len(self._scan_worker.endpoints)} endpoints…")
+        self.scan_range_btn.setEnabled(False)
+        self.scan_file_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self._scan_worker.row_ready.connect(self._add_inventory_row)
+        self._scan_worker.status.connect(self.scan_status.setText)
+        self._scan_worker.finished.connect(self._on_scan_finished)
+        self._scan_worker.start()
+
+    @Slot()
+    def _stop_scan(self):
+        for worker in (self._scan_worker, self._enum_worker):
+            if worker and worker.isRunning():
+                worker.stop()
+        self.stop_btn.setEnabled(False)
+
+    def _append_inventory_row(self, data):
+        row = self.inventory_table.rowCount()
+        self.inventory_table.insertRow(row)
+        port = QTableWidgetItem()
+        port.setData(Qt.ItemDataRole.DisplayRole, data['port'])
+        days_left = QTableWidgetItem()
+        expires = data['not_after'] or ''
+        if expires:
+            days = (datetime.datetime.fromisoformat(expires) - datetime.datetime.utcnow()).days
+            days_left.setData(Qt.ItemDataRole.DisplayRole, days)
+            if days < 30:
+                days_left.setForeground(QBrush(QColor("#ef4444" if days < 0 else "#f59e0b")))
+        chain = QTableWidgetItem()
+        if data['chain_length']:
+            chain.setData(Qt.ItemDataRole.DisplayRole, data['chain_length'])
+        cipher = f"{data['cipher']} ({data['bits']})" if data['cipher'] else ''
+        cells = [data['host'], port, data['ip'] or '', data['subject_cn'], data['issuer_cn'], expires[:10],
+                 days_left, data['protocol'] or '', cipher, data['key'], chain,
+                 data['error'] or ', '.join(data['sans'])]
+        for col, value in enumerate(cells):
+            self.inventory_table.setItem(row, col, value if isinstance(value, QTableWidgetItem) else QTableWidgetItem(value))
+        if data['error']:
+            self.inventory_table.item(row, 11).setForeground(QBrush(QColor("#f59e0b")))
+        self.inventory_table.item(row, 0).setData(Qt.ItemDataRole.UserRole, data['sha256'])
+
+    @Slot(dict)
+    def _add_inventory_row(self, data):
+        self._append_inventory_row(data)
+
+    @Slot(str)
+    def _on_scan_finished(self, message):
+        self.scan_status.setText(message + "  Double-click a row for certificate details.")
+        self.scan_range_btn.setEnabled(True)
+        self.scan_file_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.inventory_table.setSortingEnabled(True)
+        self.inventory_table.resizeColumnsToContents()
+
+    @Slot()
+    def _show_expiry_report(self):
+        if self._scan_worker and self._scan_worker.isRunning():
+            return
+        try:
+            rows = tls_inventory.get_inventory().expiry_report()
+        except Exception as e:
+            self.scan_status.setText(f"Could not read the TLS inventory: {e}")
+            return
+        self.tabs.setCurrentIndex(1)
+        self.inventory_table.setSortingEnabled(False)
+        self.inventory_table.setRowCount(0)
+        self.inventory_table.setUpdatesEnabled(False)
+        for r in rows:
+            self._append_inventory_row(r)
+        self.inventory_table.setUpdatesEnabled(True)
+        self.inventory_table.setSortingEnabled(True)
+        self.inventory_table.sortItems(5, Qt.SortOrder.AscendingOrder)
+        self.inventory_table.resizeColumnsToContents()
+        self.scan_status.setText(f"Expiry report: {len(rows)} endpoint(s) with certificates, soonest expiry first.")
+
+    @Slot(int, int)
+    def _show_inventory_entry(self, row, _col):
+        sha256 = self.inventory_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        host = self.inventory_table.item(row, 0).text()
+        port = int(self.inventory_table.item(row, 1).text())
+        inventory = tls_inventory.get_inventory()
+        endpoint = inventory.endpoint(host, port)
+        cert = inventory.certificate(sha256) if sha256 else None
+        if not endpoint or not cert:
+            return
+        subject = dict(json.loads(cert['subject']))
+        issuer = dict(json.loads(cert['issuer']))
+        lines = [
+            '=' * 54,
+            f"  SSL Certificate  —  {host}:{port}  ({endpoint['ip']})",
+            '=' * 54,
+            '', '  Subject:', f"    Common Name  :  {subject.get('commonName', 'N/A')}",
+        ]
+        if org := subject.get('organizationName'):
+            lines.append(f"    Organization :  {org}")
+        lines += ['', '  Issuer:', f"    Common Name  :  {issuer.get('commonName', 'N/A')}"]
+        if iss_org := issuer.get('organizationName'):
+            lines.append(f"    Organization :  {iss_org}")
+        lines += ['', '  Validity:',
+                  f"    Not Before   :  {cert['not_before']} UTC",
+                  f"    Not After    :  {cert['not_after']} UTC"]
+        sans = json.loads(cert['sans'])
+        if sans:
+            lines += ['', '  Subject Alt Names:']
+            lines += [f"    {kind}: {value}" for kind, value in sans[:12]]
+            if len(sans) > 12:
+                lines.append(f"    … and {len(sans) - 12} more")
+        lines += ['', '  Connection:',
+                  f"    Protocol     :  {endpoint['protocol']}",
+                  f"    Cipher       :  {endpoint['cipher']}",
+                  f"    Key Bits     :  {endpoint['bits']}",
+                  f"    Public Key   :  {cert['key_type']} {cert['key_bits'] or ''}",
+                  f"    Signature    :  {cert['signature_algorithm']}",
+                  '', '  Chain:']
+        for depth, fingerprint in enumerate(json.loads(endpoint['chain'] or '[]')):
+            link = inventory.certificate(fingerprint)
+            if link:
+                lines.append(f"    [{depth}] {link['subject_cn']}  (issuer: {link['issuer_cn']}, expires {link['not_after'][:10]})")
+        fp = cert['sha256']
+        lines += ['', '  Fingerprint (SHA-256):',
+                  f"    {':'.join(fp[i:i+2] for i in range(0, len(fp), 2))}",
+                  '', '=' * 54]
+        self.output.setPlainText('\n'.join(lines))
+        self.tabs.setCurrentIndex(0)
+
     def apply_settings(self, settings: dict):
         pass
 
@@ -980,92 +2008,136 @@ class MxLookupWidget(QWidget):
 
 
 class BlacklistCheckWidget(QWidget):
-    """Check an IPv4 address against 10 common DNSBL spam blacklist servers."""
+    """Check an IP address or a whole address range against DNSBL spam blacklists."""
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._zones = list(BlacklistWorker.SERVERS)
+        self._listed = 0
+        self._checked = 0
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
 
         ctrl = QHBoxLayout()
-        ctrl.addWidget(QLabel("IP Address:"))
+        ctrl.addWidget(QLabel("IP / Range:"))
         self.ip_input = QLineEdit()
-        self.ip_input.setPlaceholderText("e.g.  1.2.3.4")
+        self.ip_input.setPlaceholderText("e.g.  1.2.3.4   2001:db8::25   203.0.113.0/28   10.0.0.5-10.0.0.20")
         ctrl.addWidget(self.ip_input, 1)
+        self.zones_btn = QPushButton("Load Zones...")
+        ctrl.addWidget(self.zones_btn)
         self.check_btn = QPushButton("Check Blacklists")
         ctrl.addWidget(self.check_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        ctrl.addWidget(self.stop_btn)
         layout.addLayout(ctrl)
 
-        self.status_label = QLabel("Enter an IPv4 address to check against 10 blacklist servers.")
+        self.status_label = QLabel()
         self.status_label.setObjectName("statusLabel")
         layout.addWidget(self.status_label)
+        self._update_idle_status()
 
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Blacklist Server", "Status", "Response"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
-        self.table.verticalHeader().setVisible(False)
-        layout.addWidget(self.table)
+        self.results = ResultsView(["IP Address", "Blacklist Server", "Status", "Response"], stretch_column=3)
+        self.results.model.set_colors(2, {"LISTED": "#ef4444", "Clean": "#10b981", "Error": "#f59e0b"})
+        layout.addWidget(self.results)
 
         self.check_btn.clicked.connect(self._run_check)
+        self.stop_btn.clicked.connect(self._stop_check)
+        self.zones_btn.clicked.connect(self._load_zones)
         self.ip_input.returnPressed.connect(self._run_check)
 
+    def _update_idle_status(self):
+        self.status_label.setText(
+            f"Enter an IP address or range to check against {len(self._zones)} blacklist zones."
+        )
+
+    @Slot()
+    def _load_zones(self):
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Select a DNSBL Zone List", "", "Text Files (*.txt);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                zones = dnsbl.parse_zone_list(f.read())
+        except OSError as e:
+            QMessageBox.critical(self, "File Error", f"Could not read the zone list:\n{e}")
+            return
+        if not zones:
+            QMessageBox.warning(self, "Zone List", "No zones were found in that file.")
+            return
+        self._zones = zones
+        self.status_label.setText(f"Loaded {len(zones)} blacklist zones from {os.path.basename(filepath)}.")
+
     @Slot()
     def _run_check(self):
-        ip = self.ip_input.text().strip()
-        if not ip or (self._worker and self._worker.isRunning()):
+        spec = self.ip_input.text().strip()
+        if not spec or (self._worker and self._worker.isRunning()):
             return
         try:
-            ipaddress.ip_address(ip)
-        except ValueError:
-            self.status_label.setText("Please enter a valid IPv4 address.")
+            targets = dnsbl.expand_targets(spec)
+        except ValueError as e:
+            self.status_label.setText(f"Please enter a valid IP address, CIDR block or range. {e}")
             return
-        self.table.setRowCount(0)
-        self.status_label.setText(f"Checking {ip}…")
+        self.results.clear()
+        self._listed = self._checked = 0
+        self.status_label.setText(
+            f"Checking {len(targets)} address(es) against {len(self._zones)} zones…"
+        )
         self.check_btn.setEnabled(False)
-        self._worker = BlacklistWorker(ip)
-        self._worker.result_ready.connect(self._display_results)
+        self.stop_btn.setEnabled(True)
+        self._worker = BlacklistWorker(targets, self._zones)
+        self._worker.row_ready.connect(self._add_row)
         self._worker.status.connect(self.status_label.setText)
-        self._worker.finished.connect(lambda: self.check_btn.setEnabled(True))
+        self._worker.finished.connect(self._on_finished)
         self._worker.start()
 
+    @Slot()
+    def _stop_check(self):
+        if self._worker and self._worker.isRunning():
+            self._worker.stop()
+        self.stop_btn.setEnabled(False)
+
     @Slot(dict)
-    def _display_results(self, results):
-        listed = sum(1 for is_listed, _ in results.values() if is_listed is True)
+    def _add_row(self, data):
+        self._checked += 1
+        is_listed = data['listed']
+        if is_listed is True:
+            self._listed += 1
+            status = "LISTED"
+        elif is_listed is False:
+            status = "Clean"
+        else:
+            status = "Error"
+        self.results.append((data['ip'], data['zone'], status, str(data['response'])))
+
+    @Slot()
+    def _on_finished(self):
         self.status_label.setText(
-            f"Done — {listed} listing(s) found across {len(results)} servers."
+            f"Done — {self._listed} listing(s) found across {self._checked} lookups."
         )
-        self.table.setRowCount(len(results))
-        for row, (server, (is_listed, response)) in enumerate(results.items()):
-            self.table.setItem(row, 0, QTableWidgetItem(server))
-            if is_listed is True:
-                s = QTableWidgetItem("LISTED")
-                s.setForeground(QBrush(QColor("#ef4444")))
-            elif is_listed is False:
-                s = QTableWidgetItem("Clean")
-                s.setForeground(QBrush(QColor("#10b981")))
-            else:
-                s = QTableWidgetItem("Error")
-                s.setForeground(QBrush(QColor("#f59e0b")))
-            self.table.setItem(row, 1, s)
-            self.table.setItem(row, 2, QTableWidgetItem(str(response)))
-        self.table.resizeRowsToContents()
+        self.check_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.results.sort(2, Qt.SortOrder.DescendingOrder)
+        self.results.fit_columns(range(3))
 
     def apply_settings(self, settings: dict):
         pass
 
 
 class IpInfoWidget(QWidget):
-    """IP address geolocation, ISP, and ASN information via ip-api.com."""
+    """IP address geolocation, ISP, and ASN information via ip-api.com or a local range dataset."""
+
+    BULK_COLUMNS = ["IP Address", "ASN", "Country", "Organization", "Range"]
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._dataset_worker = None
+        self._bulk_worker = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -1075,27 +2147,74 @@ class IpInfoWidget(QWidget):
         self.ip_input = QLineEdit()
         self.ip_input.setPlaceholderText("Leave blank to look up your own public IP")
         ctrl.addWidget(self.ip_input, 1)
+        self.offline_check = QCheckBox("Offline only")
+        self.offline_check.setToolTip("Answer from the local dataset without contacting ip-api.com")
+        ctrl.addWidget(self.offline_check)
         self.lookup_btn = QPushButton("Look Up")
         ctrl.addWidget(self.lookup_btn)
+        self.dataset_btn = QPushButton("Load Dataset...")
+        self.dataset_btn.setToolTip("Load IP-to-ASN/country ranges (iptoasn.com TSV, CSV range or CIDR exports, .gz)")
+        ctrl.addWidget(self.dataset_btn)
+        self.bulk_btn = QPushButton("Enrich from File...")
+        self.bulk_btn.setToolTip("Annotate every address found in a file: scan results, ARP tables, logs")
+        ctrl.addWidget(self.bulk_btn)
+        self.export_btn = QPushButton("Export CSV...")
+        self.export_btn.setEnabled(False)
+        ctrl.addWidget(self.export_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        ctrl.addWidget(self.stop_btn)
         layout.addLayout(ctrl)
 
+        self.dataset_label = QLabel()
+        self.dataset_label.setObjectName("statusLabel")
+        layout.addWidget(self.dataset_label)
+        self._update_dataset_label()
+
+        self.tabs = QTabWidget()
         self.output = QTextEdit()
         self.output.setReadOnly(True)
         self.output.setFont(QFont("Consolas", 10))
         self.output.setPlaceholderText("IP information will appear here…")
-        layout.addWidget(self.output)
+        self.tabs.addTab(self.output, "Lookup")
+
+        self.bulk_table = QTableWidget(0, len(self.BULK_COLUMNS))
+        self.bulk_table.setHorizontalHeaderLabels(self.BULK_COLUMNS)
+        for col in range(len(self.BULK_COLUMNS)):
+            self.bulk_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+        self.bulk_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.bulk_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.bulk_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
+        self.bulk_table.verticalHeader().setVisible(False)
+        self.tabs.addTab(self.bulk_table, "Bulk")
+        layout.addWidget(self.tabs)
 
         self.lookup_btn.clicked.connect(self._run_lookup)
         self.ip_input.returnPressed.connect(self._run_lookup)
+        self.dataset_btn.clicked.connect(self._load_dataset)
+        self.bulk_btn.clicked.connect(self._run_bulk)
+        self.export_btn.clicked.connect(self._export_csv)
+        self.stop_btn.clicked.connect(self._stop_bulk)
+
+    def _update_dataset_label(self):
+        db = ip_ranges.get_database()
+        if db is None:
+            self.dataset_label.setText("No local IP dataset loaded — lookups use ip-api.com (45 requests/min).")
+        else:
+            built = datetime.datetime.fromtimestamp(db.built).strftime('%Y-%m-%d')
+            self.dataset_label.setText(
+                f"Local IP dataset: {db.v4_count} IPv4 and {db.v6_count} IPv6 ranges (loaded {built})."
+            )
 
     @Slot()
     def _run_lookup(self):
         if self._worker and self._worker.isRunning():
             return
         ip = self.ip_input.text().strip()
+        self.tabs.setCurrentIndex(0)
         self.output.setPlainText("Looking up…")
         self.lookup_btn.setEnabled(False)
-        self._worker = IpInfoWorker(ip)
+        self._worker = IpInfoWorker(ip, online=not self.offline_check.isChecked())
         self._worker.result_ready.connect(self._display_results)
         self._worker.error_occurred.connect(self.output.setPlainText)
         self._worker.finished.connect(lambda: self.lookup_btn.setEnabled(True))
@@ -1107,27 +2226,144 @@ class IpInfoWidget(QWidget):
             '=' * 50,
             f"  IP Information  —  {d.get('query', 'N/A')}",
             '=' * 50,
-            '',
-            f"  IP Address  :  {d.get('query',      'N/A')}",
-            f"  Hostname    :  {d.get('reverse',    'N/A')}",
-            '',
-            f"  Country     :  {d.get('country',    'N/A')}  ({d.get('countryCode','?')})",
-            f"  Region      :  {d.get('regionName', 'N/A')}",
-            f"  City        :  {d.get('city',       'N/A')}",
-            f"  ZIP         :  {d.get('zip',        'N/A')}",
-            f"  Timezone    :  {d.get('timezone',   'N/A')}",
-            f"  Coordinates :  {d.get('lat','?')}, {d.get('lon','?')}",
-            '',
-            f"  ISP         :  {d.get('isp',        'N/A')}",
-            f"  Organization:  {d.get('org',        'N/A')}",
-            f"  AS Number   :  {d.get('as',         'N/A')}",
-            f"  AS Name     :  {d.get('asname',     'N/A')}",
-            '',
-            '=' * 50,
-            '  Data: ip-api.com',
         ]
+        if 'status' in d:
+            lines += [
+                '',
+                f"  IP Address  :  {d.get('query',      'N/A')}",
+                f"  Hostname    :  {d.get('reverse',    'N/A')}",
+                '',
+                f"  Country     :  {d.get('country',    'N/A')}  ({d.get('countryCode','?')})",
+                f"  Region      :  {d.get('regionName', 'N/A')}",
+                f"  City        :  {d.get('city',       'N/A')}",
+                f"  ZIP         :  {d.get('zip',        'N/A')}",
+                f"  Timezone    :  {d.get('timezone',   'N/A')}",
+                f"  Coordinates :  {d.get('lat','?')}, {d.get('lon','?')}",
+                '',
+                f"  ISP         :  {d.get('isp',        'N/A')}",
+                f"  Organization:  {d.get('org',        'N/A')}",
+                f"  AS Number   :  {d.get('as',         'N/A')}",
+                f"  AS Name     :  {d.get('asname',     'N/A')}",
+            ]
+        local = d.get('local')
+        if local:
+            lines += [
+                '',
+                '  Local dataset:',
+                f"    AS Number   :  {'AS' + str(local['asn']) if local['asn'] else 'N/A'}",
+                f"    Country     :  {local['country'] or 'N/A'}",
+                f"    Organization:  {local['name'] or 'N/A'}",
+                f"    Range       :  {local['range'] or 'N/A'}",
+            ]
+        if d.get('online_error'):
+            lines += ['', f"  ip-api.com unavailable: {d['online_error']}"]
+        sources = [src for src, present in (('ip-api.com', 'status' in d), ('local dataset', bool(local))) if present]
+        lines += ['', '=' * 50, f"  Data: {', '.join(sources)}"]
         self.output.setPlainText('\n'.join(lines))
 
+    @Slot()
+    def _load_dataset(self):
+        if self._dataset_worker and self._dataset_worker.isRunning():
+            return
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select IP Range Datasets", "",
+            "Range Datasets (*.tsv *.csv *.txt *.gz);;All Files (*)"
+        )
+        if not paths:
+            return
+        self.dataset_btn.setEnabled(False)
+        self.dataset_label.setText(f"Indexing {len(paths)} dataset file(s)…")
+        self._dataset_worker = IpDatasetWorker(paths)
+        self._dataset_worker.status.connect(self.dataset_label.setText)
+        self._dataset_worker.result_ready.connect(self._on_dataset_loaded)
+        self._dataset_worker.error_occurred.connect(self._on_dataset_loaded)
+        self._dataset_worker.start()
+
+    @Slot(str)
+    def _on_dataset_loaded(self, message):
+        self.dataset_btn.setEnabled(True)
+        self._update_dataset_label()
+        self.output.setPlainText(message)
+
+    @Slot()
+    def _run_bulk(self):
+        if self._bulk_worker and self._bulk_worker.isRunning():
+            return
+        if ip_ranges.get_database() is None:
+            QMessageBox.warning(self, "Bulk Enrichment", "Load an IP range dataset first.")
+            return
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Select a File Containing IP Addresses", "", "Text Files (*.txt *.csv *.log);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                ips = ip_ranges.extract_addresses(f.read())
+        except OSError as e:
+            QMessageBox.critical(self, "File Error", f"Could not read the file:\n{e}")
+            return
+        if not ips:
+            QMessageBox.warning(self, "Bulk Enrichment", "No IP addresses were found in that file.")
+            return
+        self.tabs.setCurrentIndex(1)
+        self.bulk_table.setSortingEnabled(False)
+        self.bulk_table.setRowCount(0)
+        self.dataset_label.setText(f"Enriching {len(ips)} addresses…")
+        self.bulk_btn.setEnabled(False)
+        self.export_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self._bulk_worker = BulkIpEnrichWorker(ips)
+        self._bulk_worker.rows_ready.connect(self._add_bulk_rows)
+        self._bulk_worker.finished.connect(self._on_bulk_finished)
+        self._bulk_worker.start()
+
+    @Slot()
+    def _stop_bulk(self):
+        if self._bulk_worker and self._bulk_worker.isRunning():
+            self._bulk_worker.stop()
+        self.stop_btn.setEnabled(False)
+
+    @Slot(list)
+    def _add_bulk_rows(self, rows):
+        self.bulk_table.setUpdatesEnabled(False)
+        row = self.bulk_table.rowCount()
+        self.bulk_table.setRowCount(row + len(rows))
+        for offset, data in enumerate(rows):
+            asn = QTableWidgetItem()
+            if data['asn']:
+                asn.setData(Qt.ItemDataRole.DisplayRole, data['asn'])
+            cells = [data['ip'], asn, data['country'], data['name'], data['range']]
+            for col, value in enumerate(cells):
+                self.bulk_table.setItem(row + offset, col,
+                                        value if isinstance(value, QTableWidgetItem) else QTableWidgetItem(value))
+        self.bulk_table.setUpdatesEnabled(True)
+
+    @Slot(str)
+    def _on_bulk_finished(self, message):
+        self.dataset_label.setText(message)
+        self.bulk_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.export_btn.setEnabled(self.bulk_table.rowCount() > 0)
+        self.bulk_table.setSortingEnabled(True)
+
+    @Slot()
+    def _export_csv(self):
+        filepath, _ = QFileDialog.getSaveFileName(self, "Export Enrichment", "ip_enrichment.csv", "CSV Files (*.csv)")
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.BULK_COLUMNS)
+                for row in range(self.bulk_table.rowCount()):
+                    items = [self.bulk_table.item(row, col) for col in range(len(self.BULK_COLUMNS))]
+                    writer.writerow([item.text() if item else '' for item in items])
+        except OSError as e:
+            QMessageBox.critical(self, "Export Error", f"Could not write the file:\n{e}")
+            return
+        self.dataset_label.setText(f"Exported {self.bulk_table.rowCount()} rows to {os.path.basename(filepath)}.")
+
     def apply_settings(self, settings: dict):
         pass
 
@@ -1187,34 +2423,52 @@ class SmtpTestWidget(QWidget):
 
 
 class ConnectedDevicesWidget(QWidget):
+    VULN_COLUMNS = ["IP Address", "Found In", "CPE", "CVE ID", "Severity", "Score"]
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.discovery_worker = None
+        self.rdns_worker = None
+        self.cve_worker = None
         self.device_map = {}
+        self.descriptions = {}
+        self.hostname_cache = {}
+        self.oui = None
         
         layout = QVBoxLayout(self)
         control_bar = QHBoxLayout()
         self.scan_btn = QPushButton("Scan for Devices")
+        self.match_btn = QPushButton("Match CVEs")
+        self.match_btn.setToolTip("Identify software from SNMP descriptions and service banners, "
+                                  "then match it against the local CVE mirror")
+        self.match_btn.setEnabled(False)
+        self.banners_check = QCheckBox("Grab banners")
+        self.banners_check.setChecked(True)
+        self.auto_match_check = QCheckBox("Match after scan")
         self.status_label = QLabel("Ready to scan the local network.")
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         
         control_bar.addWidget(self.scan_btn)
+        control_bar.addWidget(self.match_btn)
+        control_bar.addWidget(self.banners_check)
+        control_bar.addWidget(self.auto_match_check)
         control_bar.addWidget(self.status_label)
         control_bar.addStretch()
         layout.addLayout(control_bar)
         layout.addWidget(self.progress_bar)
         
-        self.devices_table = QTableWidget()
-        self.devices_table.setColumnCount(3)
-        self.devices_table.setHorizontalHeaderLabels(["IP Address", "MAC Address", "Hostname"])
-        self.devices_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.devices_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.devices_table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
-        self.devices_table.setSortingEnabled(True)
-        layout.addWidget(self.devices_table)
+        self.tabs = QTabWidget()
+        self.devices = ResultsView(["IP Address", "MAC Address", "Vendor", "Hostname"])
+        self.devices.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tabs.addTab(self.devices, "Devices")
+        self.vulns = ResultsView(self.VULN_COLUMNS, stretch_column=2)
+        self.vulns.model.set_colors(4, {"CRITICAL": "#ef4444", "HIGH": "#f97316", "MEDIUM": "#f59e0b"})
+        self.tabs.addTab(self.vulns, "Vulnerabilities")
+        layout.addWidget(self.tabs)
         
         self.scan_btn.clicked.connect(self._start_discovery)
+        self.match_btn.clicked.connect(self._start_cve_match)
 
     @Slot()
     def _start_discovery(self):
@@ -1231,12 +2485,21 @@ class ConnectedDevicesWidget(QWidget):
             if reply == QMessageBox.StandardButton.No:
                 return
         self.scan_btn.setEnabled(False)
-        self.devices_table.setRowCount(0)
+        self.match_btn.setEnabled(False)
+        self.devices.clear()
         self.device_map.clear()
+        self.descriptions.clear()
+        self.oui = oui_db.get_database()
         self.status_label.setText("Scanning network...")
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
 
+        if self.rdns_worker and self.rdns_worker.isRunning():
+            self.rdns_worker.stop()
+        self.rdns_worker = ReverseDnsWorker()
+        self.rdns_worker.hostname_resolved.connect(self._apply_hostname)
+        self.rdns_worker.start()
+
         self.discovery_worker = DiscoveryWorker()
         self.discovery_worker.host_found.connect(self._add_host_entry)
         self.discovery_worker.scan_finished.connect(self._on_scan_finished)
@@ -1250,36 +2513,63 @@ class ConnectedDevicesWidget(QWidget):
         
         if ip in self.device_map:
             return
+        self.descriptions[ip] = host_data.get('description')
 
-        row_position = self.devices_table.rowCount()
-        self.devices_table.insertRow(row_position)
-        
-        ip_item = QTableWidgetItem(ip)
-        mac_item = QTableWidgetItem(mac)
-        
-        self.devices_table.setItem(row_position, 0, ip_item)
-        self.devices_table.setItem(row_position, 1, mac_item)
-        
-        self.device_map[ip] = row_position
-        
-        QTimer.singleShot(10, lambda: self._resolve_hostname(ip, row_position))
+        cached = self.hostname_cache.get(ip)
+        hostname = "Resolving…" if cached is None else (cached or "N/A")
+        # Source rows are append-only, so the row number stays valid however the view is sorted
+        self.device_map[ip] = self.devices.append((ip, mac, self._vendor(mac), hostname))
+        if cached is None:
+            self.rdns_worker.enqueue(ip)
 
-    def _resolve_hostname(self, ip, row):
-        try:
-            hostname, _, _ = socket.gethostbyaddr(ip)
-            self.devices_table.setItem(row, 2, QTableWidgetItem(hostname))
-        except socket.herror:
-            self.devices_table.setItem(row, 2, QTableWidgetItem("N/A"))
+    def _vendor(self, mac):
+        if self.oui is None:
+            return ""
+        return self.oui.vendor(mac, "Unknown")
+
+    @Slot(str, str)
+    def _apply_hostname(self, ip, hostname):
+        self.hostname_cache[ip] = hostname
+        row = self.device_map.get(ip)
+        if row is None:
+            return
+        self.devices.model.set_value(row, 3, hostname or "N/A")
 
     @Slot(str)
     def _on_scan_finished(self, message):
+        if self.rdns_worker:
+            self.rdns_worker.close()
         self.status_label.setText(message)
         self.scan_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
+        self.match_btn.setEnabled(bool(self.device_map))
         if message.startswith("Error:"):
             QMessageBox.warning(self, "Scan Error", message)
             return
-        self.devices_table.resizeColumnsToContents()
+        self.devices.fit_columns(range(4))
+        if self.auto_match_check.isChecked() and self.device_map:
+            self._start_cve_match()
+
+    @Slot()
+    def _start_cve_match(self):
+        if self.cve_worker and self.cve_worker.isRunning():
+            return
+        hosts = [{'ip': ip, 'description': self.descriptions.get(ip)} for ip in self.device_map]
+        self.vulns.clear()
+        self.tabs.setCurrentWidget(self.vulns)
+        self.match_btn.setEnabled(False)
+        self.cve_worker = InventoryCveWorker(hosts, grab_banners=self.banners_check.isChecked())
+        self.cve_worker.rows_ready.connect(self.vulns.extend)
+        self.cve_worker.status.connect(self.status_label.setText)
+        self.cve_worker.finished.connect(self._on_cve_match_finished)
+        self.cve_worker.start()
+
+    @Slot(str)
+    def _on_cve_match_finished(self, message):
+        self.status_label.setText(message)
+        self.match_btn.setEnabled(bool(self.device_map))
+        self.vulns.sort(5, Qt.SortOrder.DescendingOrder)
+        self.vulns.fit_columns((0, 1, 3, 4, 5))
 
     def apply_settings(self, settings: dict):
         pass
@@ -1358,6 +2648,7 @@ class MacVendorWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._update_worker = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -1369,8 +2660,19 @@ class MacVendorWidget(QWidget):
         ctrl.addWidget(self.mac_input, 1)
         self.lookup_btn = QPushButton("Look Up Vendor")
         ctrl.addWidget(self.lookup_btn)
+        self.update_btn = QPushButton("Update Database")
+        self.update_btn.setToolTip("Download the IEEE MA-L, MA-M and MA-S registries for offline lookups")
+        ctrl.addWidget(self.update_btn)
+        self.import_btn = QPushButton("Import CSV...")
+        self.import_btn.setToolTip("Build the offline database from IEEE registry CSV files")
+        ctrl.addWidget(self.import_btn)
         layout.addLayout(ctrl)
 
+        self.db_label = QLabel()
+        self.db_label.setObjectName("statusLabel")
+        layout.addWidget(self.db_label)
+        self._update_db_label()
+
         self.output = QTextEdit()
         self.output.setReadOnly(True)
         self.output.setFont(QFont("Consolas", 10))
@@ -1379,6 +2681,42 @@ class MacVendorWidget(QWidget):
 
         self.lookup_btn.clicked.connect(self._run_lookup)
         self.mac_input.returnPressed.connect(self._run_lookup)
+        self.update_btn.clicked.connect(lambda: self._run_update())
+        self.import_btn.clicked.connect(self._import_csv)
+
+    def _update_db_label(self):
+        db = oui_db.get_database()
+        if db is None:
+            self.db_label.setText("No offline vendor database installed — lookups use macvendors.com.")
+        else:
+            built = datetime.datetime.fromtimestamp(db.built).strftime('%Y-%m-%d')
+            self.db_label.setText(f"Offline vendor database: {db.count} assignments (updated {built}).")
+
+    def _run_update(self, paths=None):
+        if self._update_worker and self._update_worker.isRunning():
+            return
+        self.db_label.setText("Importing vendor registries…" if paths else "Downloading IEEE registries…")
+        self.update_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        self._update_worker = OuiUpdateWorker(paths)
+        self._update_worker.result_ready.connect(self._on_update_done)
+        self._update_worker.error_occurred.connect(self._on_update_done)
+        self._update_worker.start()
+
+    @Slot()
+    def _import_csv(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select IEEE Registry CSVs (oui.csv, mam.csv, oui36.csv)", "", "CSV Files (*.csv);;All Files (*)"
+        )
+        if paths:
+            self._run_update(paths)
+
+    @Slot(str)
+    def _on_update_done(self, message):
+        self.update_btn.setEnabled(True)
+        self.import_btn.setEnabled(True)
+        self._update_db_label()
+        self.output.setPlainText(message)
 
     @Slot()
     def _run_lookup(self):
@@ -1400,11 +2738,15 @@ class MacVendorWidget(QWidget):
             f"  MAC Vendor Lookup  —  {d['mac']}",
             '=' * 52,
             '',
-            f"  OUI Prefix  :  {d['oui']}",
+            f"  OUI Prefix  :  {d['oui']}  ({d['block']} block)",
             f"  Vendor      :  {d['vendor']}",
+        ]
+        if d['local']:
+            lines.append("  Note        :  locally administered address (often a randomized MAC)")
+        lines += [
             '',
             '=' * 52,
-            '  Data source: macvendors.com',
+            f"  Data source: {d['source']}",
         ]
         self.output.setPlainText('\n'.join(lines))
 
@@ -1413,13 +2755,15 @@ class MacVendorWidget(QWidget):
 
 
 class DnsPropagationWidget(QWidget):
-    """Check DNS resolution across 8 global resolvers to verify propagation."""
+    """Check DNS resolution across many resolvers at once to verify propagation."""
 
     RECORD_TYPES = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME']
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._worker = None
+        self._servers = list(DnsPropagationWorker.SERVERS)
+        self._received = 0
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
@@ -1434,65 +2778,101 @@ class DnsPropagationWidget(QWidget):
         self.type_combo.addItems(self.RECORD_TYPES)
         self.type_combo.setFixedWidth(80)
         ctrl.addWidget(self.type_combo)
+        self.resolvers_btn = QPushButton("Load Resolvers...")
+        ctrl.addWidget(self.resolvers_btn)
         self.check_btn = QPushButton("Check Propagation")
         ctrl.addWidget(self.check_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        ctrl.addWidget(self.stop_btn)
         layout.addLayout(ctrl)
 
-        self.status_label = QLabel("Enter a domain to check DNS propagation across 8 global resolvers.")
+        self.status_label = QLabel()
         self.status_label.setObjectName("statusLabel")
         layout.addWidget(self.status_label)
+        self._update_idle_status()
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Resolver", "Server IP", "Status", "Response"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QAbstractItemView.EditTriggers.NoEditTriggers)
-        self.table.verticalHeader().setVisible(False)
-        layout.addWidget(self.table)
+        self.results = ResultsView(["Resolver", "Server IP", "Status", "Latency (ms)", "Response"],
+                                   placeholders={3: "—"}, stretch_column=4)
+        self.results.model.set_colors(2, {"Resolved": "#10b981", "NXDOMAIN": "#ef4444", "No Response": "#f59e0b"})
+        layout.addWidget(self.results)
 
         self.check_btn.clicked.connect(self._run_check)
+        self.stop_btn.clicked.connect(self._stop_check)
+        self.resolvers_btn.clicked.connect(self._load_resolvers)
         self.domain_input.returnPressed.connect(self._run_check)
 
+    def _update_idle_status(self):
+        self.status_label.setText(
+            f"Enter a domain to check DNS propagation across {len(self._servers)} resolvers."
+        )
+
+    @Slot()
+    def _load_resolvers(self):
+        filepath, _ = QFileDialog.getOpenFileName(
+            self, "Select a Resolver List", "", "Text Files (*.txt *.csv);;All Files (*)"
+        )
+        if not filepath:
+            return
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                servers, rejected = DnsPropagationWorker.parse_resolver_list(f.read())
+        except OSError as e:
+            QMessageBox.critical(self, "File Error", f"Could not read the resolver list:\n{e}")
+            return
+        if not servers:
+            QMessageBox.warning(self, "Resolver List", "No valid resolver IP addresses were found in that file.")
+            return
+        self._servers = servers
+        self.status_label.setText(f"Loaded {len(servers)} resolvers from {os.path.basename(filepath)}.")
+        if rejected:
+            shown = "\n".join(f"Line {n}: {line}" for n, line in rejected[:10])
+            more = f"\n…and {len(rejected) - 10} more" if len(rejected) > 10 else ""
+            QMessageBox.warning(self, "Resolver List",
+                                f"Skipped {len(rejected)} line(s) without exactly one IP address:\n\n{shown}{more}")
+
     @Slot()
     def _run_check(self):
         domain = self.domain_input.text().strip()
         if not domain or (self._worker and self._worker.isRunning()):
             return
-        self.table.setRowCount(0)
-        self.status_label.setText(f"Querying 8 global resolvers for {domain} ({self.type_combo.currentText()})…")
+        self.results.clear()
+        self._received = 0
+        self.status_label.setText(
+            f"Querying {len(self._servers)} resolvers for {domain} ({self.type_combo.currentText()})…"
+        )
         self.check_btn.setEnabled(False)
-        self._worker = DnsPropagationWorker(domain, self.type_combo.currentText())
+        self.stop_btn.setEnabled(True)
+        self._worker = DnsPropagationWorker(domain, self.type_combo.currentText(), self._servers)
         self._worker.row_ready.connect(self._add_row)
         self._worker.finished.connect(self._on_finished)
         self._worker.start()
 
+    @Slot()
+    def _stop_check(self):
+        if self._worker and self._worker.isRunning():
+            self._worker.stop()
+        self.stop_btn.setEnabled(False)
+
     @Slot(dict)
     def _add_row(self, data):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem(data['name']))
-        self.table.setItem(row, 1, QTableWidgetItem(data['ip']))
         status = data['status']
         if status is True:
-            s = QTableWidgetItem("Resolved")
-            s.setForeground(QBrush(QColor("#10b981")))
+            status = "Resolved"
         elif status is False:
-            s = QTableWidgetItem("NXDOMAIN")
-            s.setForeground(QBrush(QColor("#ef4444")))
+            status = "NXDOMAIN"
         else:
-            s = QTableWidgetItem("No Response")
-            s.setForeground(QBrush(QColor("#f59e0b")))
-        self.table.setItem(row, 2, s)
-        self.table.setItem(row, 3, QTableWidgetItem(data['result']))
-        self.table.resizeRowsToContents()
+            status = "No Response"
+        self.results.append((data['name'], data['ip'], status, data.get('latency_ms'), data['result']))
+        self._received += 1
+        self.status_label.setText(f"{self._received}/{len(self._servers)} resolvers checked…")
 
     @Slot(str)
     def _on_finished(self, message):
         self.status_label.setText(message)
         self.check_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.results.fit_columns(range(4))
 
     def apply_settings(self, settings: dict):
         pass
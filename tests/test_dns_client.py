@@ -0,0 +1,219 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from ducky_app.core import dns_client
+from ducky_app.core.dns_client import MxData, SoaData, SrvData
+
+QNAME = 12          # offset of the question name, the target of b'\xc0\x0c' pointers
+POINTER = b'\xc0\x0c'
+
+
+def _name(text):
+    return b''.join(bytes([len(label)]) + label.encode() for label in text.split('.') if label) + b'\x00'
+
+
+def _rr(rtype, rdata, ttl=300, name=POINTER):
+    return name + struct.pack('!HHIH', rtype, 1, ttl, len(rdata)) + rdata
+
+
+def _txt(*strings):
+    return b''.join(bytes([len(s)]) + s.encode() for s in strings)
+
+
+# Answers for example.com, by type; names inside RDATA point back into the question where they can
+ANSWERS = {
+    1: [_rr(1, socket.inet_aton('192.0.2.10')), _rr(1, socket.inet_aton('192.0.2.11'), ttl=60)],
+    28: [_rr(28, socket.inet_pton(socket.AF_INET6, '2001:db8::10'))],
+    2: [_rr(2, b'\x03ns1' + POINTER), _rr(2, _name('ns2.example.net'))],
+    5: [_rr(5, b'\x03www' + POINTER)],
+    15: [_rr(15, struct.pack('!H', 10) + b'\x04mail' + POINTER)],
+    16: [_rr(16, _txt('v=spf1 -all', 'second string'))],
+    33: [_rr(33, struct.pack('!HHH', 5, 20, 5060) + b'\x03sip' + POINTER)],
+    6: [_rr(6, b'\x03ns1' + POINTER + b'\x0ahostmaster' + POINTER + struct.pack('!IIIII', 2024010101, 7200, 900, 1209600, 300))],
+    99: [_rr(99, b'\x01\x02\x03')],
+}
+
+
+class StubServer:
+    """Answers on one UDP and one TCP socket bound to the same loopback port."""
+
+    def __init__(self):
+        for _ in range(20):
+            self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.udp.bind(('127.0.0.1', 0))
+            self.port = self.udp.getsockname()[1]
+            self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                self.tcp.bind(('127.0.0.1', self.port))
+                break
+            except OSError:
+                self.udp.close()
+                self.tcp.close()
+        self.tcp.listen(5)
+        self.queries = []
+        for target in (self._serve_udp, self._serve_tcp):
+            threading.Thread(target=target, daemon=True).start()
+
+    def close(self):
+        self.udp.close()
+        self.tcp.close()
+
+    def _answer(self, query, tcp):
+        self.queries.append((query, tcp))
+        qid, _flags, _qd, _an, _ns, arcount = struct.unpack_from('!HHHHHH', query)
+        end = query.index(b'\x00', QNAME) + 1
+        qname = query[QNAME:end]
+        qtype = struct.unpack_from('!H', query, end)[0]
+        question = query[QNAME:end + 4]
+        flags, answers, additional = 0x8180, [], []
+        # OPT: payload size 4096; the TTL's top byte extends the rcode
+        opt = b'\x00' + struct.pack('!HHIH', dns_client.TYPE_OPT, 4096, 0, 0)
+        if qname == _name('tc.example'):
+            if tcp:
+                answers = [_rr(16, _txt(f'record {i}' + 'x' * 40)) for i in range(40)]
+            else:
+                flags |= 0x0200
+        elif qname == _name('badvers.example'):
+            opt = b'\x00' + struct.pack('!HHIH', dns_client.TYPE_OPT, 4096, 1 << 24, 0)
+        elif qname == _name('missing.example'):
+            flags |= 3
+        elif qname == _name('10.2.0.192.in-addr.arpa'):
+            answers = [_rr(12, _name('host.example.com'))]
+        else:
+            answers = ANSWERS.get(qtype, [])
+        if arcount:
+            additional.append(opt)
+        authority = []
+        if qname == _name('missing.example'):
+            authority = [_rr(6, POINTER + POINTER + struct.pack('!IIIII', 1, 2, 3, 4, 60), ttl=900)]
+        header = struct.pack('!HHHHHH', qid, flags, 1, len(answers), len(authority), len(additional))
+        return header + question + b''.join(answers + authority + additional)
+
+    def _serve_udp(self):
+        while True:
+            try:
+                data, addr = self.udp.recvfrom(65535)
+            except OSError:
+                return
+            self.udp.sendto(self._answer(data, False), addr)
+
+    def _serve_tcp(self):
+        while True:
+            try:
+                conn, _addr = self.tcp.accept()
+            except OSError:
+                return
+            with conn:
+                length = struct.unpack('!H', conn.recv(2))[0]
+                data = b''
+                while len(data) < length:
+                    data += conn.recv(length - len(data))
+                reply = self._answer(data, True)
+                conn.sendall(struct.pack('!H', len(reply)) + reply)
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def _query(stub, name, rtype, **kwargs):
+    return dns_client.query(name, rtype, server='127.0.0.1', port=stub.port, timeout=2.0, **kwargs)
+
+
+@pytest.mark.parametrize('rtype, expected', [
+    ('A', ['192.0.2.10', '192.0.2.11']),
+    ('AAAA', ['2001:db8::10']),
+    ('NS', ['ns1.example.com.', 'ns2.example.net.']),
+    ('CNAME', ['www.example.com.']),
+    ('MX', [MxData(10, 'mail.example.com.')]),
+    ('TXT', [('v=spf1 -all', 'second string')]),
+    ('SRV', [SrvData(5, 20, 5060, 'sip.example.com.')]),
+    ('SOA', [SoaData('ns1.example.com.', 'hostmaster.example.com.', 2024010101, 7200, 900, 1209600, 300)]),
+    (99, [b'\x01\x02\x03']),
+])
+def test_record_types(stub, rtype, expected):
+    resp = _query(stub, 'example.com', rtype)
+    assert resp.rcode_name == 'NOERROR'
+    assert resp.protocol == 'UDP'
+    assert [r.data for r in resp.answers] == expected
+    assert all(r.name == 'example.com.' for r in resp.answers)
+
+
+def test_record_text():
+    assert dns_client.DnsRecord('x.', 15, 1, MxData(10, 'mail.')).to_text() == '10 mail.'
+    assert dns_client.DnsRecord('x.', 16, 1, ('a', 'b')).to_text() == '"a" "b"'
+    assert dns_client.DnsRecord('x.', 99, 1, b'\x01\x02').to_text() == '\\# 2 0102'
+
+
+def test_ptr_uses_reverse_name(stub):
+    resp = _query(stub, '192.0.2.10', 'PTR')
+    assert resp.question == ('10.2.0.192.in-addr.arpa.', 12)
+    assert [r.data for r in resp.records('PTR')] == ['host.example.com.']
+
+
+def test_truncated_udp_retries_over_tcp(stub):
+    resp = _query(stub, 'tc.example', 'TXT')
+    assert resp.protocol == 'TCP'
+    assert len(resp.records('TXT')) == 40
+    assert [tcp for _query, tcp in stub.queries] == [False, True]
+
+
+def test_forced_tcp(stub):
+    resp = _query(stub, 'example.com', 'A', tcp=True)
+    assert resp.protocol == 'TCP'
+    assert [tcp for _query, tcp in stub.queries] == [True]
+
+
+def test_edns_opt_record(stub):
+    resp = _query(stub, 'example.com', 'A')
+    query, _tcp = stub.queries[0]
+    assert struct.unpack_from('!H', query, 10)[0] == 1              # ARCOUNT
+    assert query.endswith(b'\x00' + struct.pack('!HHIH', dns_client.TYPE_OPT, dns_client.EDNS_PAYLOAD_SIZE, 0, 0))
+    assert resp.edns_payload == 4096
+    assert not resp.additional                                       # OPT is not reported as a record
+
+
+def test_edns_disabled():
+    query = dns_client.build_query('example.com', 'A', qid=1, edns_payload=None)
+    assert struct.unpack_from('!H', query, 10)[0] == 0
+    assert query == struct.pack('!HHHHHH', 1, 0x0100, 1, 0, 0, 0) + _name('example.com') + struct.pack('!HH', 1, 1)
+
+
+def test_extended_rcode(stub):
+    assert _query(stub, 'badvers.example', 'A').rcode_name == 'BADVERS'
+
+
+def test_negative_answer_ttl(stub):
+    resp = _query(stub, 'missing.example', 'A')
+    assert resp.rcode_name == 'NXDOMAIN'
+    assert resp.negative_ttl() == 60
+
+
+def test_compression_pointers():
+    question = _name('example.com') + struct.pack('!HH', 5, 1)
+    # Owner name is a pointer; the CNAME target is a label followed by a pointer to a suffix
+    answer = POINTER + struct.pack('!HHIH', 5, 1, 30, 6) + b'\x03www\xc0\x14'
+    msg = struct.pack('!HHHHHH', 7, 0x8180, 1, 1, 0, 0) + question + answer
+    resp = dns_client.parse_message(msg)
+    assert resp.answers[0].name == 'example.com.'
+    assert resp.answers[0].data == 'www.com.'
+
+
+def test_compression_loop_is_rejected():
+    msg = struct.pack('!HHHHHH', 7, 0x8180, 1, 0, 0, 0) + b'\xc0\x0c' + struct.pack('!HH', 1, 1)
+    with pytest.raises(dns_client.DnsError):
+        dns_client.parse_message(msg)
+
+
+def test_malformed_message():
+    with pytest.raises(dns_client.DnsError):
+        dns_client.parse_message(b'\x00\x01\x81\x80')
+    truncated = struct.pack('!HHHHHH', 7, 0x8180, 0, 1, 0, 0) + POINTER + struct.pack('!HHIH', 1, 1, 30, 4) + b'\x01'
+    with pytest.raises(dns_client.DnsError):
+        dns_client.parse_message(truncated)
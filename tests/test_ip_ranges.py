@@ -0,0 +1,28 @@
+from ducky_app.core import ip_ranges
+
+
+def test_nested_range_lookup(tmp_path):
+    source = tmp_path / 'ranges.tsv'
+    source.write_text('10.0.0.0\t10.255.255.255\t1\tUS\tBIG\n'
+                      '10.1.0.0\t10.1.255.255\t2\tDE\tSMALL\n')
+    index = tmp_path / 'ranges.idx'
+    ip_ranges.compile_index([str(source)], str(index))
+    db = ip_ranges.IpRangeDatabase(str(index))
+    try:
+        assert db.lookup('10.1.2.3')['name'] == 'SMALL'
+        outside = db.lookup('10.2.0.1')
+        assert outside['name'] == 'BIG'
+        assert outside['range'] == '10.0.0.0 - 10.255.255.255'
+        assert db.lookup('10.0.0.1')['name'] == 'BIG'
+        assert db.lookup('11.0.0.1') is None
+    finally:
+        db.close()
+
+
+def test_extract_addresses_with_ports():
+    text = ('Connection from 10.0.0.5:51234 to 192.168.1.1:443 via [2001:db8::2]:8443\n'
+            'resolver 8.8.8.8, peer 2001:db8::1, mapped ::ffff:10.1.2.3, mac aa:bb:cc:dd:ee:ff at 12:30:45\n'
+            'dup 10.0.0.5 and 10.0.0.5:80.')
+    assert ip_ranges.extract_addresses(text) == [
+        '10.0.0.5', '192.168.1.1', '2001:db8::2', '8.8.8.8', '2001:db8::1', '::ffff:a01:203',
+    ]